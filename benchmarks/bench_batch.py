@@ -0,0 +1,89 @@
+"""Сравнение пакетного расчета с циклом по CalculationBaseSalary.
+
+Запуск: PYTHONPATH=src python benchmarks/bench_batch.py --rows 10000
+"""
+import argparse
+import asyncio
+import logging
+import random
+import time
+
+from salary_dgs.batch import BATCH_COMPONENTS, EmployeeBatch, calculate_batch, to_decimal
+from salary_dgs.constant import MONTHS_IN_YEAR
+from salary_dgs.models import GetDataSalary
+from salary_dgs.production_calendar import available_years
+from salary_dgs.services import CalculationBaseSalary
+
+CHILDREN = ["0", "1", "1,2", "2,3", "1,2,3", "1,2,3,4"]
+ALIMONY = ["0", "16", "25", "33", "25,25", "16,33", "25,33"]
+
+
+def make_columns(rows: int, seed: int = 1) -> dict:
+    """Случайный, но допустимый набор входных данных"""
+    rnd = random.Random(seed)
+    columns = {key: [] for key in (
+        "base_salary", "month", "sum_days", "night_shifts",
+        "evening_shifts", "temperature_work", "children", "alimony", "year",
+    )}
+    years = available_years()
+    for _ in range(rows):
+        sum_days = rnd.randint(0, 31)
+        night_shifts = rnd.randint(0, sum_days)
+        columns["base_salary"].append(str(rnd.randint(20000, 300000)))
+        columns["month"].append(rnd.choice(MONTHS_IN_YEAR))
+        columns["sum_days"].append(str(sum_days))
+        columns["night_shifts"].append(str(night_shifts))
+        columns["evening_shifts"].append(str(rnd.randint(0, sum_days - night_shifts)))
+        columns["temperature_work"].append(str(rnd.randint(0, sum_days)))
+        columns["children"].append(rnd.choice(CHILDREN))
+        columns["alimony"].append(rnd.choice(ALIMONY))
+        columns["year"].append(str(rnd.choice(years)))
+    return columns
+
+
+async def calculate_rows(columns: dict, rows: int) -> list[dict]:
+    """Покомпонентный расчет первых rows строк через CalculationBaseSalary"""
+    results = []
+    for row in range(rows):
+        calc = CalculationBaseSalary(GetDataSalary(**{f"_{key}": values[row] for key, values in columns.items()}))
+        results.append(
+            {component: await getattr(calc, f"calculation_{component}")() for component in BATCH_COMPONENTS}
+        )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--loop-rows", type=int, default=2000, help="строк для цикла по CalculationBaseSalary")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    columns = make_columns(args.rows)
+
+    started = time.perf_counter()
+    employees = EmployeeBatch.from_columns(columns)
+    build_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    batch = calculate_batch(employees)
+    batch_seconds = time.perf_counter() - started
+
+    loop_rows = min(args.loop_rows, args.rows)
+    started = time.perf_counter()
+    expected = asyncio.run(calculate_rows(columns, loop_rows))
+    loop_seconds = time.perf_counter() - started
+
+    mismatches = 0
+    for component in BATCH_COMPONENTS:
+        actual = to_decimal(batch[component][:loop_rows])
+        mismatches += sum(a != e[component] for a, e in zip(actual, expected))
+
+    print(f"EmployeeBatch из строк: {args.rows / build_seconds:,.0f} строк/с, {employees.nbytes / args.rows:.0f} байт на сотрудника")
+    print(f"пакетный расчет: {args.rows / batch_seconds:,.0f} строк/с ({args.rows} строк)")
+    print(f"цикл CalculationBaseSalary: {loop_rows / loop_seconds:,.0f} строк/с ({loop_rows} строк)")
+    print(f"ускорение: x{(args.rows / batch_seconds) / (loop_rows / loop_seconds):,.1f}")
+    print(f"расхождений до копейки: {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Сравнение синхронного расчета с асинхронной оберткой CalculationBaseSalary.
+
+Запуск: PYTHONPATH=src python benchmarks/bench_core.py --repeat 20000
+"""
+import argparse
+import asyncio
+import logging
+import time
+
+from salary_dgs import calculations
+from salary_dgs.cache_decorator import result_cache
+from salary_dgs.models import GetDataSalary
+from salary_dgs.services import CalculationBaseSalary
+
+SALARY = GetDataSalary(
+    _base_salary="85000",
+    _month="март",
+    _sum_days="22",
+    _night_shifts="7",
+    _evening_shifts="6",
+    _temperature_work="3",
+    _children="1,2",
+    _alimony="25",
+)
+
+METHODS = (
+    "calculation_base_salary",
+    "calculation_night_shifts",
+    "calculation_bonus",
+    "calculation_underground",
+    "calculation_working_in_temperature",
+    "calculation_district_allowance",
+    "calculation_north_allowance",
+    "calculation_total_accruals",
+    "calculation_deduction_for_children",
+    "calculation_withholding_tax",
+    "calculation_alimony",
+    "calculation_answer",
+    "calculation_base_month",
+    "month_quarter_payment_calculation",
+)
+
+
+def run_sync(repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        calculations.calculate(**calculations.salary_inputs(SALARY))
+    return time.perf_counter() - started
+
+
+async def run_async(repeat: int, cached: bool = False) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        if not cached:
+            result_cache.clear()
+        calc = CalculationBaseSalary(SALARY)
+        for method in METHODS:
+            await getattr(calc, method)()
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=20000)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    sync_seconds = run_sync(args.repeat)
+    async_seconds = asyncio.run(run_async(args.repeat))
+    cached_seconds = asyncio.run(run_async(args.repeat, cached=True))
+
+    print(f"синхронный расчет: {sync_seconds / args.repeat * 1e6:.1f} мкс на расчет")
+    print(f"асинхронная обертка (14 await): {async_seconds / args.repeat * 1e6:.1f} мкс на расчет")
+    print(f"асинхронная обертка из общего кеша: {cached_seconds / args.repeat * 1e6:.1f} мкс на расчет")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Запись и запросы истории расчетов (bot/history.py) на базе с миллионами строк.
+
+Запуск: PYTHONPATH=src:. python benchmarks/bench_history.py --rows 1000000 --users 50000
+"""
+import argparse
+import asyncio
+import logging
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from bench_batch import make_columns
+from bot.history import HistoryStore, _INSERT, _row
+from salary_dgs.batch import EmployeeBatch
+from salary_dgs.constant import MONTHS_IN_YEAR
+from salary_dgs.rates import RATES
+from salary_dgs.services import CalculationBaseSalary
+
+
+def percentile(timings: list[float], share: float) -> float:
+    return sorted(timings)[min(int(len(timings) * share), len(timings) - 1)]
+
+
+async def timed_queries(query, arguments: list) -> list[float]:
+    timings = []
+    for args in arguments:
+        started = time.perf_counter()
+        await query(*args)
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+async def run(args):
+    # Набор реальных расчетов, повторяемый с разными пользователями и временем
+    records = EmployeeBatch.from_columns(make_columns(args.samples)).to_records()
+    samples = [(record, await CalculationBaseSalary(record).calculation_breakdown()) for record in records]
+    rnd = random.Random(1)
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = HistoryStore(os.path.join(directory, "history.db"))
+        await store.start()
+
+        # Заполнение базы напрямую пачками по 100000 строк (как фоновая запись, но без очереди)
+        started = time.perf_counter()
+        for start in range(0, args.rows, 100000):
+            rows = [
+                _row(rnd.randrange(args.users), 1700000000 + index, RATES.version, *rnd.choice(samples))
+                for index in range(start, min(start + 100000, args.rows))
+            ]
+            with store._writer:
+                store._writer.executemany(_INSERT, rows)
+        fill = time.perf_counter() - started
+        print(f"Заполнение: {args.rows} строк за {fill:.1f} с ({args.rows / fill:,.0f} строк/с)")
+
+        # Запись через очередь: record() не ждет диска, close() дописывает остаток
+        started = time.perf_counter()
+        for _ in range(args.records):
+            store.record(rnd.randrange(args.users), *rnd.choice(samples))
+        enqueue = time.perf_counter() - started
+        await asyncio.sleep(0)
+        while not store._queue.empty():
+            await asyncio.sleep(0.01)
+        written = time.perf_counter() - started
+        print(
+            f"record(): {args.records} расчетов, {enqueue / args.records * 1e6:.2f} мкс на вызов, "
+            f"записано за {written:.2f} с, пропущено {store.dropped}"
+        )
+
+        users = [(rnd.randrange(args.users), 5) for _ in range(args.queries)]
+        timings = await timed_queries(store.last, users)
+        print(
+            f"last(user, 5): медиана {statistics.median(timings):.3f} мс, "
+            f"p99 {percentile(timings, 0.99):.3f} мс"
+        )
+        years = sorted({record.year for record, _ in samples})
+        periods = [(rnd.choice(years), rnd.choice(MONTHS_IN_YEAR)) for _ in range(min(args.queries, 50))]
+        timings = await timed_queries(store.month_totals, periods)
+        print(
+            f"month_totals(год, месяц): медиана {statistics.median(timings):.1f} мс, "
+            f"p99 {percentile(timings, 0.99):.1f} мс"
+        )
+        await store.close()
+        size = os.path.getsize(os.path.join(directory, "history.db"))
+        print(f"Размер базы: {size / 2 ** 20:.0f} МиБ ({size / (args.rows + args.records):.0f} Б на расчет)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--users", type=int, default=50000)
+    parser.add_argument("--samples", type=int, default=1000, help="число разных расчетов")
+    parser.add_argument("--records", type=int, default=50000, help="расчетов через очередь record()")
+    parser.add_argument("--queries", type=int, default=1000)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Масштабирование пакетного расчета на пуле процессов от 1 до N ядер.
+
+Запуск: PYTHONPATH=src python benchmarks/bench_parallel.py --rows 500000 --workers 1 2 4 8
+"""
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from bench_batch import make_columns
+from salary_dgs.batch import BATCH_COMPONENTS, EmployeeBatch, calculate_batch
+from salary_dgs.parallel import calculate_parallel, default_workers
+
+
+def best_time(function, rounds: int) -> float:
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=500000)
+    parser.add_argument("--workers", type=int, nargs="+", help="варианты числа процессов (по умолчанию 1..ядер)")
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    # Повторение небольшого набора строк: важен объем, а не разнообразие
+    sample = EmployeeBatch.from_columns(make_columns(min(args.rows, 50000)))
+    repeats = -(-args.rows // len(sample))
+    batch = EmployeeBatch(
+        *(np.tile(getattr(sample, name), repeats)[:args.rows] for name in EmployeeBatch.__slots__[:9]),
+        sample.children_table,
+        sample.alimony_table,
+    )
+    expected = calculate_batch(batch)
+    single = best_time(lambda: calculate_batch(batch), args.rounds)
+    print(f"ядер доступно: {default_workers()}, строк: {len(batch):,}")
+    print(f"calculate_batch в одном процессе: {len(batch) / single:,.0f} строк/с")
+
+    for workers in args.workers or range(1, default_workers() + 1):
+        # Пул создается заранее: запуск процессов не входит в замер
+        with ProcessPoolExecutor(workers) as pool:
+            result = calculate_parallel(batch, workers, executor=pool)
+            mismatches = sum(int((result[key] != expected[key]).sum()) for key in BATCH_COMPONENTS)
+            seconds = best_time(lambda: calculate_parallel(batch, workers, executor=pool), args.rounds)
+        print(
+            f"процессов {workers}: {len(batch) / seconds:,.0f} строк/с, "
+            f"ускорение x{single / seconds:.2f}, расхождений {mismatches}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Сравнение шагов расчета на снимке ставок RATES с разбором строк на каждом вызове.
+
+Запуск: PYTHONPATH=src python benchmarks/bench_rates.py --repeat 100000
+"""
+import argparse
+import time
+from decimal import Decimal, ROUND_HALF_UP
+
+from salary_dgs import calculations
+from salary_dgs.constant import MONTHS_IN_YEAR, FACTORS
+from salary_dgs.rates import year_rates
+
+BASE_SALARY = Decimal("85000")
+NIGHT_SHIFTS = Decimal("7.00")
+EVENING_SHIFTS = Decimal("6.00")
+TEMPERATURE_WORK = Decimal("3.00")
+YEAR = 2025
+
+# Строковая таблица норм часов, как она хранилась в constant.py до производственного календаря
+MONTHS_IN_YEAR_HOURS = {month: str(rates.hours_norm) for month, rates in zip(MONTHS_IN_YEAR, year_rates(YEAR))}
+
+
+def parsed_per_call_night_shifts(base_salary, month, night_shifts, evening_shifts, year):
+    """Доплата за ночное время с разбором FACTORS и норм на каждом вызове (прежний способ)"""
+    monthly_hours_norm = Decimal(MONTHS_IN_YEAR_HOURS[month])
+    night_hours_per_day = Decimal(FACTORS["Ночные 1 смена"])
+    evening_hours_per_day = Decimal(FACTORS["Ночные 3 смена"])
+    night_pay_percent = Decimal(FACTORS["Процент оплаты ночных"])
+    hourly_rate = base_salary / monthly_hours_norm
+    night_payment = (hourly_rate * (night_shifts * night_hours_per_day)).quantize(
+        Decimal("0.01"), rounding=ROUND_HALF_UP
+    )
+    evening_payment = hourly_rate * (evening_shifts * evening_hours_per_day)
+    total_payment = (night_payment + evening_payment) * night_pay_percent / 100
+    return total_payment.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+
+
+def parsed_per_call_temperature(base_salary, month, temperature_work, year):
+    """Доплата за температуру с разбором FACTORS и норм на каждом вызове (прежний способ)"""
+    monthly_rate_hours = Decimal(MONTHS_IN_YEAR_HOURS[month])
+    surcharge_for_temperature = Decimal(FACTORS["Доплата за температуру"])
+    pay_per_hour = base_salary / monthly_rate_hours
+    without_interest = (temperature_work * Decimal('5') * pay_per_hour).quantize(
+        Decimal("0.01"), rounding=ROUND_HALF_UP
+    )
+    return (without_interest * surcharge_for_temperature / 100).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+
+
+def timed(function, repeat: int, *args) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        function(*args)
+    return (time.perf_counter() - started) / repeat * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=100000)
+    args = parser.parse_args()
+
+    night_args = (BASE_SALARY, "март", NIGHT_SHIFTS, EVENING_SHIFTS, YEAR)
+    temperature_args = (BASE_SALARY, "март", TEMPERATURE_WORK, YEAR)
+    rows = (
+        ("ночные смены", parsed_per_call_night_shifts, calculations.calculation_night_shifts, night_args),
+        ("температура", parsed_per_call_temperature, calculations.calculation_working_in_temperature,
+         temperature_args),
+    )
+    for title, parsed, snapshot, step_args in rows:
+        before = timed(parsed, args.repeat, *step_args)
+        after = timed(snapshot, args.repeat, *step_args)
+        print(f"{title}: разбор на вызове {before:.2f} мкс, снимок RATES {after:.2f} мкс (x{before / after:.2f})")
+
+
+if __name__ == "__main__":
+    main()
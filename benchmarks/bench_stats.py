@@ -0,0 +1,65 @@
+"""Точность и скорость статистики пользователей (bot/stats.py).
+
+Запуск: PYTHONPATH=src:. python benchmarks/bench_stats.py --users 1000000
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from bot.stats import UniqueCounter, UserStats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=1000000)
+    parser.add_argument("--repeats", type=int, default=3, help="обращений на пользователя")
+    args = parser.parse_args()
+
+    # Точность по числу пользователей (id - как у Telegram, разреженные)
+    rnd = random.Random(1)
+    for users in (100, 2048, 10000, 100000, args.users):
+        counter = UniqueCounter()
+        for user_id in rnd.sample(range(10 ** 10), users):
+            counter.add(user_id)
+        mode = "точно" if counter.exact else "HLL"
+        print(f"{users:>9} пользователей: {len(counter):>9} ({mode}, ошибка {len(counter) / users - 1:+.2%})")
+
+    with tempfile.TemporaryDirectory() as directory:
+        stats = UserStats(os.path.join(directory, "stats.json"))
+        ids = rnd.sample(range(10 ** 10), args.users)
+        day = datetime(2026, 3, 1)
+        started = time.perf_counter()
+        events = 0
+        # Пользователи приходят в течение 60 дней по несколько раз
+        for index, user_id in enumerate(ids):
+            now = day + timedelta(days=index * 60 // len(ids))
+            for _ in range(args.repeats):
+                stats.seen(user_id, now)
+            stats.calculation(now)
+            events += args.repeats + 1
+        elapsed = time.perf_counter() - started
+        print(f"Учет: {elapsed / events * 1e6:.2f} мкс на событие")
+
+        repeat = 10000
+        started = time.perf_counter()
+        for _ in range(repeat):
+            stats.summary()
+        print(f"summary(): {(time.perf_counter() - started) / repeat * 1e6:.1f} мкс")
+
+        started = time.perf_counter()
+        asyncio.run(stats.flush())
+        size = os.path.getsize(stats.path)
+        print(f"Сохранение: {(time.perf_counter() - started) * 1000:.1f} мс, файл {size / 1024:.0f} КиБ")
+
+        loaded = UserStats(stats.path)
+        loaded.load()
+        print(f"После загрузки: пользователей {len(loaded.users)} (было {len(stats.users)})")
+        print(stats.summary())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""Хранилища FSM на сценарии бота: MemoryStorage против BinaryStateStorage и WriteBackStorage.
+
+WriteBackStorage проверяется с SqliteBackend (файл) и с RedisBackend поверх
+LocalRedis - локальной подмены Redis-сервера с задержкой на команду.
+
+Запуск: PYTHONPATH=src:.:benchmarks python benchmarks/bench_storage.py --users 200 --redis-latency 0.2
+"""
+import argparse
+import asyncio
+import logging
+import os
+import tempfile
+import time
+
+from aiogram import Dispatcher
+from aiogram.fsm.storage.base import StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+
+from fake_bot import SALARY_FLOW, UserScript, make_bot, run_flow
+from bot.storage import BinaryStateStorage, RedisBackend, SqliteBackend, WriteBackStorage, setup_write_back
+import main_bot
+
+
+class LocalRedis:
+    """Подмена асинхронного клиента Redis: get, mset, delete над словарем, задержка на каждую команду"""
+
+    def __init__(self, latency: float = 0.0):
+        self.values = {}
+        self.latency = latency
+        self.commands = 0
+
+    async def _command(self):
+        self.commands += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+    async def get(self, name: str) -> bytes | None:
+        await self._command()
+        return self.values.get(name)
+
+    async def mset(self, mapping: dict) -> bool:
+        await self._command()
+        self.values.update(mapping)
+        return True
+
+    async def delete(self, *names: str) -> int:
+        await self._command()
+        return sum(self.values.pop(name, None) is not None for name in names)
+
+    async def aclose(self):
+        pass
+
+
+class CountingStorage(WriteBackStorage):
+    """WriteBackStorage со счетчиком изменений, которые без объединения были бы отдельными записями"""
+
+    changes = 0
+
+    async def _set(self, name: str, value: bytes | None):
+        self.changes += 1
+        await super()._set(name, value)
+
+
+def make_dispatcher() -> Dispatcher:
+    # Роутер бота подключается к одному диспетчеру, хранилища подменяются в его FSM
+    dispatcher = Dispatcher()
+    setup_write_back(dispatcher)
+    dispatcher.include_router(main_bot.router)
+    return dispatcher
+
+
+async def run_flows(dispatcher: Dispatcher, storage, users: int) -> tuple[float, int]:
+    dispatcher.fsm.storage = storage
+    bot = make_bot()
+    scripts = [UserScript(1000 + user) for user in range(users)]
+    started = time.perf_counter()
+    # Пользователи проходят сценарий одновременно, как при реальной нагрузке
+    await asyncio.gather(*(run_flow(dispatcher, bot, script, SALARY_FLOW[:-1]) for script in scripts))
+    await asyncio.gather(*(run_flow(dispatcher, bot, script, SALARY_FLOW[-1:]) for script in scripts))
+    elapsed = time.perf_counter() - started
+    return elapsed, users * len(SALARY_FLOW)
+
+
+def report(name: str, elapsed: float, updates: int, extra: str = ""):
+    print(f"{name:<28} {elapsed * 1e6 / updates:9.1f} мкс/обновление {extra}")
+
+
+async def restart_check(dispatcher: Dispatcher, path: str, users: int) -> bool:
+    """Состояние диалога, прерванного перед последним шагом, читается после перезапуска"""
+    storage = WriteBackStorage(SqliteBackend(path))
+    dispatcher.fsm.storage = storage
+    bot = make_bot()
+    scripts = [UserScript(5000 + user) for user in range(users)]
+    await asyncio.gather(*(run_flow(dispatcher, bot, script, SALARY_FLOW[:-2]) for script in scripts))
+    before = [await storage.get_state(StorageKey(bot.id, script.chat.id, script.user.id)) for script in scripts]
+    await storage.close()
+
+    reopened = WriteBackStorage(SqliteBackend(path))
+    after = [await reopened.get_state(StorageKey(bot.id, script.chat.id, script.user.id)) for script in scripts]
+    data = await reopened.get_data(StorageKey(bot.id, scripts[0].chat.id, scripts[0].user.id))
+    await reopened.close()
+    return before == after and None not in after and bool(data)
+
+
+async def run(args):
+    dispatcher = make_dispatcher()
+    elapsed, updates = await run_flows(dispatcher, MemoryStorage(), args.users)
+    report("MemoryStorage", elapsed, updates)
+    elapsed, updates = await run_flows(dispatcher, BinaryStateStorage(), args.users)
+    report("BinaryStateStorage", elapsed, updates)
+
+    with tempfile.TemporaryDirectory() as directory:
+        storage = CountingStorage(SqliteBackend(os.path.join(directory, "fsm.db")))
+        elapsed, updates = await run_flows(dispatcher, storage, args.users)
+        await storage.close()
+        report(
+            "WriteBack + SQLite", elapsed, updates,
+            f"(изменений {storage.changes}, транзакций {storage.flushes})",
+        )
+        restored = await restart_check(dispatcher, os.path.join(directory, "restart.db"), 20)
+        print(f"Перезапуск: состояние сохранено - {restored}")
+
+    for latency in (0.0, args.redis_latency):
+        client = LocalRedis(latency / 1000)
+        storage = CountingStorage(RedisBackend(client))
+        elapsed, updates = await run_flows(dispatcher, storage, args.users)
+        await storage.close()
+        report(
+            f"WriteBack + Redis {latency} мс", elapsed, updates,
+            f"(изменений {storage.changes}, команд {client.commands})",
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--redis-latency", type=float, default=0.2, help="задержка команды LocalRedis, мс")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Офлайн-бот для прогона сценариев main_bot через Dispatcher.feed_update.
+
+Сессия не ходит в сеть: на методы, возвращающие сообщение, отвечает
+сообщением в тот же чат, на остальные - True.
+"""
+import itertools
+import os
+from datetime import datetime
+
+from aiogram import Bot
+from aiogram.client.session.base import BaseSession
+from aiogram.types import CallbackQuery, Chat, Message, Update, User
+
+# main_bot читает токен и администратора из окружения при импорте
+os.environ.setdefault("BOT_TOKEN", "42:offline")
+os.environ.setdefault("ADMIN_ID", "1")
+
+_message_ids = itertools.count(1)
+
+
+class FakeSession(BaseSession):
+    """Сессия без сети, считает отправленные запросы"""
+
+    def __init__(self):
+        super().__init__()
+        self.requests = 0
+
+    async def make_request(self, bot, method, timeout=None):
+        self.requests += 1
+        returning = getattr(method, "__returning__", bool)
+        if returning is bool:
+            return True
+        chat_id = getattr(method, "chat_id", None) or 1
+        return Message(
+            message_id=next(_message_ids),
+            date=datetime.now(),
+            chat=Chat(id=chat_id, type="private"),
+            text=getattr(method, "text", None),
+        )
+
+    async def stream_content(self, url, headers=None, timeout=30, chunk_size=65536, raise_for_status=True):
+        yield b""
+
+    async def close(self):
+        pass
+
+
+def make_bot() -> Bot:
+    return Bot(token=os.environ["BOT_TOKEN"], session=FakeSession())
+
+
+class UserScript:
+    """Фабрика входящих обновлений от одного пользователя"""
+
+    _update_ids = itertools.count(1)
+
+    def __init__(self, user_id: int):
+        self.user = User(id=user_id, is_bot=False, first_name="Тест", username=f"user{user_id}")
+        self.chat = Chat(id=user_id, type="private")
+
+    def _message(self, text: str) -> Message:
+        return Message(
+            message_id=next(_message_ids), date=datetime.now(), chat=self.chat, from_user=self.user, text=text
+        )
+
+    def text(self, text: str) -> Update:
+        return Update(update_id=next(self._update_ids), message=self._message(text))
+
+    def callback(self, data: str) -> Update:
+        return Update(
+            update_id=next(self._update_ids),
+            callback_query=CallbackQuery(
+                id=str(next(self._update_ids)),
+                from_user=self.user,
+                chat_instance=str(self.user.id),
+                data=data,
+                message=self._message("кнопки"),
+            ),
+        )
+
+
+# Полный ввод данных и подробный расчет
+SALARY_FLOW = (
+    ("text", "/start"),
+    ("callback", "start"),
+    ("text", "85000"),
+    ("callback", "month_march"),
+    ("text", "22"),
+    ("text", "7"),
+    ("text", "6"),
+    ("text", "3"),
+    ("text", "1,2"),
+    ("text", "25"),
+    ("callback", "show_full_result"),
+)
+
+
+async def run_flow(dispatcher, bot, script: UserScript, flow=SALARY_FLOW):
+    """Прогон сценария через диспетчер, как при получении обновлений от Telegram"""
+    for kind, payload in flow:
+        update = script.text(payload) if kind == "text" else script.callback(payload)
+        await dispatcher.feed_update(bot, update)
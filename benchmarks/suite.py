@@ -0,0 +1,332 @@
+"""Набор бенчмарков: шаги расчета, сеттеры с валидацией, данные сессии, полный расчет, пакет и сценарий бота.
+
+Работает без сети, результат - JSON для сравнения между релизами.
+Запуск: PYTHONPATH=src:. python benchmarks/suite.py --output bench.json
+Сравнение: PYTHONPATH=src:. python benchmarks/suite.py --compare bench.json
+"""
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+from aiogram import Dispatcher
+from aiogram.fsm.storage.memory import MemoryStorage
+
+from bench_batch import make_columns
+from fake_bot import UserScript, make_bot, run_flow
+from salary_dgs import calculations, kopecks
+from salary_dgs.batch import EmployeeBatch, calculate_batch
+from salary_dgs.bulk_validation import validate_rows
+from salary_dgs.cache_decorator import result_cache
+from salary_dgs.models import BaseSalary, GetDataSalary, SalaryRecord
+from salary_dgs.rates import RATES
+from salary_dgs.services import CalculationBaseSalary
+from salary_dgs.state_codec import decode_state, encode_state
+
+SALARY = GetDataSalary(
+    _base_salary="85000",
+    _month="март",
+    _sum_days="22",
+    _night_shifts="7",
+    _evening_shifts="6",
+    _temperature_work="3",
+    _children="1,2",
+    _alimony="25",
+    _year="2025",
+)
+
+# Значения для сеттеров: допустимое и ошибочное
+SETTER_VALUES = {
+    "base_salary": ("85000", "85к"),
+    "month": ("Март", "мартобрь"),
+    "sum_days": ("22", "40"),
+    "night_shifts": ("7", "30"),
+    "evening_shifts": ("6", "30"),
+    "temperature_work": ("3", "30"),
+    "children": ("1,2,3", "1,3"),
+    "alimony": ("25,16", "20"),
+    "year": ("2025", "1999"),
+}
+
+
+def measure(function, repeat: int, rounds: int) -> list[float]:
+    """Время одного вызова в микросекундах по раундам"""
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for _ in range(repeat):
+            function()
+        timings.append((time.perf_counter() - started) / repeat * 1e6)
+    return timings
+
+
+def measure_async(function, repeat: int, rounds: int) -> list[float]:
+    """Время одного вызова корутины в микросекундах по раундам (один цикл событий)"""
+    async def run():
+        timings = []
+        for _ in range(rounds):
+            started = time.perf_counter()
+            for _ in range(repeat):
+                await function()
+            timings.append((time.perf_counter() - started) / repeat * 1e6)
+        return timings
+
+    return asyncio.run(run())
+
+
+def result(group: str, name: str, timings: list[float], repeat: int, items: int = 1) -> dict:
+    best = min(timings)
+    return {
+        "group": group,
+        "name": name,
+        "repeat": repeat,
+        "rounds": len(timings),
+        "items": items,
+        "best_us": round(best, 3),
+        "median_us": round(sorted(timings)[len(timings) // 2], 3),
+        "items_per_sec": round(items / best * 1e6, 1),
+    }
+
+
+def bench_steps(repeat: int, rounds: int):
+    """Каждый шаг графа расчета с готовыми входами"""
+    values = calculations.salary_inputs(SALARY)
+    values.update(calculations.evaluate(values))
+    for node in calculations.GRAPH:
+        args = [values[name] for name in node.inputs]
+        yield result("step", node.name, measure(lambda: node.function(*args), repeat, rounds), repeat)
+
+
+def bench_service_methods(repeat: int, rounds: int):
+    """Асинхронные методы CalculationBaseSalary без общего кеша и из кеша"""
+    methods = [name for name in dir(CalculationBaseSalary) if name.startswith("calculation_")]
+    methods.append("month_quarter_payment_calculation")
+    for name in methods:
+        async def cold():
+            result_cache.clear()
+            await getattr(CalculationBaseSalary(SALARY), name)()
+
+        async def cached():
+            await getattr(CalculationBaseSalary(SALARY), name)()
+
+        yield result("service", f"{name}[cold]", measure_async(cold, repeat, rounds), repeat)
+        yield result("service", f"{name}[cached]", measure_async(cached, repeat, rounds), repeat)
+
+
+def bench_setters(repeat: int, rounds: int):
+    """Сеттеры BaseSalary с валидаторами: допустимое значение и ошибка"""
+    salary = BaseSalary()
+    # Проверки смен сравнивают с уже введенными значениями
+    salary.sum_days = "22"
+    salary.night_shifts = "7"
+    salary.evening_shifts = "6"
+    for field, (valid, invalid) in SETTER_VALUES.items():
+        def set_valid():
+            setattr(salary, field, valid)
+
+        def set_invalid():
+            try:
+                setattr(salary, field, invalid)
+            except ValueError:
+                pass
+
+        yield result("setter", f"{field}[valid]", measure(set_valid, repeat, rounds), repeat)
+        yield result("setter", f"{field}[invalid]", measure(set_invalid, repeat, rounds), repeat)
+
+
+def typed_salary(user: int) -> BaseSalary:
+    """Заполнение BaseSalary через сеттеры, как при вводе в боте"""
+    salary = BaseSalary()
+    for field, (valid, _) in SETTER_VALUES.items():
+        # Копия строки, как текст нового сообщения
+        setattr(salary, field, str(int(valid) + user) if field == "base_salary" else "".join(valid))
+    return salary
+
+
+def bench_records(repeat: int, rounds: int, users: int):
+    """Входные данные: создание, ключ кеша и память на users сессий"""
+    state = SALARY.to_dict()
+    record = SALARY.to_record()
+    yield result("record", "GetDataSalary.from_base_salary",
+                 measure(lambda: GetDataSalary.from_base_salary(SALARY), repeat, rounds), repeat)
+    yield result("record", "BaseSalary.from_dict", measure(lambda: BaseSalary.from_dict(state), repeat, rounds), repeat)
+    yield result("record", "SalaryRecord.from_dict",
+                 measure(lambda: SalaryRecord.from_dict(state), repeat, rounds), repeat)
+    yield result("record", "BaseSalary.cache_key+hash",
+                 measure(lambda: hash(SALARY.cache_key()), repeat, rounds), repeat)
+    yield result("record", "SalaryRecord.cache_key+hash",
+                 measure(lambda: hash(record.cache_key()), repeat, rounds), repeat)
+
+    # Ввод как в боте: новые строки на каждого пользователя
+    typed = [typed_salary(user) for user in range(users)]
+    for name, build in (
+            ("BaseSalary", lambda user: typed_salary(user)),
+            ("SalaryRecord", lambda user: typed[user].to_record()),
+    ):
+        started = time.perf_counter()
+        tracemalloc.start()
+        objects = [build(user) for user in range(users)]
+        size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        elapsed = (time.perf_counter() - started) * 1e6
+        del objects
+        # Время создания включает накладные расходы tracemalloc
+        item = result("record", f"{name}[{users} sessions]", [elapsed], 1, users)
+        item["bytes_per_item"] = round(size / users, 1)
+        yield item
+
+
+def bench_state(repeat: int, rounds: int):
+    """Данные сессии FSM: двоичная запись state_codec и JSON словаря to_dict"""
+    for name, data in (("salary", {"salary": SALARY.to_dict()}), ("record", {"record": SALARY.to_record()})):
+        payload = encode_state(data)
+        item = result("state", f"encode_state[{name}]", measure(lambda: encode_state(data), repeat, rounds), repeat)
+        item["bytes_per_item"] = len(payload)
+        yield item
+        yield result("state", f"decode_state[{name}]", measure(lambda: decode_state(payload), repeat, rounds), repeat)
+
+    text = json.dumps({"salary": SALARY.to_dict()}, ensure_ascii=False)
+    item = result("state", "json.dumps[salary]",
+                  measure(lambda: json.dumps({"salary": SALARY.to_dict()}, ensure_ascii=False), repeat, rounds), repeat)
+    item["bytes_per_item"] = len(text.encode())
+    yield item
+    yield result("state", "json.loads[salary]", measure(lambda: json.loads(text), repeat, rounds), repeat)
+
+
+def bench_payroll(repeat: int, rounds: int, employees: int):
+    """Полный расчет: одна запись двумя способами и ведомость на employees сотрудников"""
+    yield result("payroll", "calculate_breakdown[decimal]",
+                 measure(lambda: calculations.calculate_breakdown(SALARY), repeat, rounds), repeat)
+    yield result("payroll", "calculate_breakdown[kopecks]",
+                 measure(lambda: kopecks.calculate_breakdown(SALARY), repeat, rounds), repeat)
+
+    columns = make_columns(employees)
+    salaries = [
+        GetDataSalary(**{f"_{key}": values[row] for key, values in columns.items()}) for row in range(employees)
+    ]
+
+    async def payroll():
+        result_cache.clear()
+        for salary in salaries:
+            await CalculationBaseSalary(salary).calculation_breakdown()
+
+    yield result("payroll", f"service_payroll[{employees}]", measure_async(payroll, 1, rounds), 1, employees)
+
+
+def bench_batch(rounds: int, rows: int):
+    """Пакетный расчет на rows сотрудников"""
+    columns = make_columns(rows)
+    yield result("batch", f"calculate_batch[{rows}]", measure(lambda: calculate_batch(columns), 1, rounds), 1, rows)
+    item = result("batch", f"EmployeeBatch.from_columns[{rows}]",
+                  measure(lambda: EmployeeBatch.from_columns(columns), 1, rounds), 1, rows)
+    employees = EmployeeBatch.from_columns(columns)
+    item["bytes_per_item"] = round(employees.nbytes / rows, 1)
+    yield item
+    yield result("batch", f"calculate_batch[EmployeeBatch {rows}]",
+                 measure(lambda: calculate_batch(employees), 1, rounds), 1, rows)
+
+
+def bench_validation(rounds: int, rows: int):
+    """Пакетная проверка строк с полным сбором ошибок"""
+    columns = make_columns(rows)
+    data = [{field: values[row] for field, values in columns.items()} for row in range(rows)]
+    yield result("validate", f"validate_rows[{rows}]", measure(lambda: validate_rows(data), 1, rounds), 1, rows)
+
+
+def bench_bot_flow(rounds: int, users: int):
+    """Сценарий бота от /start до подробного расчета через Dispatcher.feed_update"""
+    import main_bot
+
+    dispatcher = Dispatcher(storage=MemoryStorage())
+    dispatcher.include_router(main_bot.router)
+    bot = make_bot()
+    scripts = [UserScript(user_id) for user_id in range(1000, 1000 + users)]
+
+    async def flows():
+        result_cache.clear()
+        for script in scripts:
+            await run_flow(dispatcher, bot, script)
+
+    yield result("bot", f"salary_flow[{users} users]", measure_async(flows, 1, rounds), 1, users)
+
+
+def metadata() -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": commit,
+        "rate_table_version": RATES.version,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+    }
+
+
+def compare(results: list[dict], baseline_path: str):
+    """Отношение времени к сохраненному прогону (больше 1 - медленнее)"""
+    with open(baseline_path, encoding="utf-8") as file:
+        baseline = {(item["group"], item["name"]): item for item in json.load(file)["results"]}
+    for item in results:
+        old = baseline.get((item["group"], item["name"]))
+        if old is None:
+            continue
+        ratio = item["best_us"] / old["best_us"]
+        print(f"{item['group']:8} {item['name']:55} {old['best_us']:>12.2f} -> {item['best_us']:>12.2f} мкс  x{ratio:.2f}",
+              file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=2000, help="вызовов в раунде для микробенчмарков")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--employees", type=int, default=1000, help="сотрудников в ведомости через сервис")
+    parser.add_argument("--rows", type=int, default=10000, help="сотрудников в пакетном расчете")
+    parser.add_argument("--users", type=int, default=50, help="пользователей в сценарии бота")
+    parser.add_argument("--sessions", type=int, default=10000, help="сессий для замера памяти входных данных")
+    parser.add_argument("--group", action="append", help="только указанные группы (можно несколько)")
+    parser.add_argument("--output", help="файл для JSON (по умолчанию stdout)")
+    parser.add_argument("--compare", help="JSON прошлого прогона для сравнения")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    groups = {
+        "step": lambda: bench_steps(args.repeat, args.rounds),
+        "service": lambda: bench_service_methods(args.repeat, args.rounds),
+        "setter": lambda: bench_setters(args.repeat, args.rounds),
+        "record": lambda: bench_records(args.repeat, args.rounds, args.sessions),
+        "state": lambda: bench_state(args.repeat, args.rounds),
+        "payroll": lambda: bench_payroll(args.repeat, args.rounds, args.employees),
+        "batch": lambda: bench_batch(args.rounds, args.rows),
+        "validate": lambda: bench_validation(args.rounds, args.rows),
+        "bot": lambda: bench_bot_flow(args.rounds, args.users),
+    }
+    results = []
+    for name, run in groups.items():
+        if args.group and name not in args.group:
+            continue
+        for item in run():
+            results.append(item)
+            print(f"{item['group']:8} {item['name']:55} {item['best_us']:>12.2f} мкс", file=sys.stderr)
+
+    report = {"meta": metadata(), "results": results}
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+    else:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+from decimal import Decimal
+from typing import NamedTuple
+
+from salary_dgs.kopecks import COMPONENTS, to_amount, to_kopecks
+from salary_dgs.models import SalaryBreakdown, SalaryRecord
+from salary_dgs.rates import RATES
+from salary_dgs.state_codec import decode_state, encode_state
+
+logger = logging.getLogger(__name__)
+
+# Входные данные хранятся записью state_codec, составляющие расчета - копейками
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS history (
+    id INTEGER PRIMARY KEY,
+    user_id INTEGER NOT NULL,
+    created INTEGER NOT NULL,
+    year INTEGER NOT NULL,
+    month INTEGER NOT NULL,
+    rates_version TEXT NOT NULL,
+    record BLOB NOT NULL,
+    {", ".join(f"{component} INTEGER NOT NULL" for component in COMPONENTS)}
+);
+-- Последние расчеты пользователя
+CREATE INDEX IF NOT EXISTS history_user ON history (user_id, id);
+-- Расчеты за месяц по всем пользователям (итоги месяца считаются только по индексу)
+CREATE INDEX IF NOT EXISTS history_period ON history (year, month, user_id, answer);
+"""
+
+_COLUMNS = ("user_id", "created", "year", "month", "rates_version", "record", *COMPONENTS)
+_INSERT = f"INSERT INTO history ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})"
+_SELECT = f"SELECT user_id, created, rates_version, record, {', '.join(COMPONENTS)} FROM history"
+
+
+class HistoryEntry(NamedTuple):
+    user_id: int
+    created: int  # Время расчета (unix)
+    rates_version: str
+    record: SalaryRecord
+    breakdown: dict  # Составляющая -> Decimal
+
+
+def _entry(row: tuple) -> HistoryEntry:
+    user_id, created, rates_version, record, *amounts = row
+    return HistoryEntry(
+            user_id, created, rates_version, decode_state(record)["record"],
+            {component: to_amount(amount) for component, amount in zip(COMPONENTS, amounts)},
+    )
+
+
+def _row(user_id: int, created: int, rates_version: str, record: SalaryRecord, breakdown: SalaryBreakdown) -> tuple:
+    return (
+            user_id, created, record.year, RATES.month_index[record.month] + 1, rates_version,
+            encode_state({"record": record}),
+            *(to_kopecks(getattr(breakdown, component)) for component in COMPONENTS),
+    )
+
+
+class HistoryStore:
+    """История расчетов в файле SQLite.
+
+    record() только ставит расчет в очередь и не ждет диска: фоновая задача
+    пишет накопившиеся записи одной транзакцией в отдельном потоке.
+    Чтение идет через индексы по пользователю и по месяцу.
+    """
+
+    def __init__(self, path: str = "history.db", batch_size: int = 1000, queue_size: int = 100_000):
+        self.path = path
+        self.batch_size = batch_size
+        self._queue = asyncio.Queue(queue_size)
+        self._writer = None  # Соединение фоновой записи
+        self._reader = None  # Соединение для запросов (WAL: чтение не ждет записи)
+        self._reader_lock = threading.Lock()
+        self._task = None
+        self.written = 0
+        self.dropped = 0
+
+    @property
+    def started(self) -> bool:
+        return self._task is not None
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    async def start(self):
+        def open_connections():
+            self._writer = self._connect()
+            self._writer.executescript(SCHEMA)
+            self._reader = self._connect()
+
+        await asyncio.to_thread(open_connections)
+        self._task = asyncio.create_task(self._write_loop())
+
+    def record(self, user_id: int, record: SalaryRecord, breakdown: SalaryBreakdown):
+        """Расчет в очередь записи (без ожидания; при переполнении очереди расчет не сохраняется)"""
+        if self._task is None:
+            return
+        try:
+            self._queue.put_nowait((user_id, int(time.time()), RATES.version, record, breakdown))
+        except asyncio.QueueFull:
+            self.dropped += 1
+            logger.warning("Очередь истории расчетов переполнена, запись пропущена")
+
+    def _insert(self, items: list):
+        with self._writer:
+            self._writer.executemany(_INSERT, [_row(*item) for item in items])
+
+    def _insert_each(self, items: list) -> int:
+        """Запись по одной после ошибки пачки: пропускаются только записи с ошибкой"""
+        written = 0
+        for item in items:
+            try:
+                self._insert([item])
+            except Exception:
+                logger.exception("Не удалось записать расчет пользователя %s в историю", item[0])
+            else:
+                written += 1
+        return written
+
+    async def _write_loop(self):
+        while True:
+            item = await self._queue.get()
+            if item is None:
+                return
+            # Все, что накопилось, пока шла прошлая запись, уходит одной транзакцией
+            items = [item]
+            stop = False
+            while len(items) < self.batch_size and not self._queue.empty():
+                item = self._queue.get_nowait()
+                if item is None:
+                    stop = True
+                    break
+                items.append(item)
+            try:
+                await asyncio.to_thread(self._insert, items)
+                self.written += len(items)
+            except Exception:
+                # Пачка откатывается целиком: записи повторяются по одной, чтобы потерять только ошибочные
+                logger.warning("Не удалось записать пачку истории расчетов (%s записей), запись по одной", len(items))
+                try:
+                    self.written += await asyncio.to_thread(self._insert_each, items)
+                except Exception:
+                    # Ошибка не останавливает запись следующих расчетов
+                    logger.exception("Не удалось записать историю расчетов (%s записей)", len(items))
+            if stop:
+                return
+
+    async def close(self):
+        """Запись оставшейся очереди и закрытие базы"""
+        if self._task is None:
+            return
+        await self._queue.put(None)
+        await self._task
+        self._task = None
+        await asyncio.to_thread(self._writer.close)
+        await asyncio.to_thread(self._reader.close)
+
+    async def _query(self, sql: str, parameters: tuple) -> list:
+        def run():
+            with self._reader_lock:
+                return self._reader.execute(sql, parameters).fetchall()
+
+        return await asyncio.to_thread(run)
+
+    async def last(self, user_id: int, limit: int = 5) -> list[HistoryEntry]:
+        """Последние расчеты пользователя, новые первыми"""
+        rows = await self._query(f"{_SELECT} WHERE user_id = ? ORDER BY id DESC LIMIT ?", (user_id, limit))
+        return [_entry(row) for row in rows]
+
+    async def by_month(self, year: int, month: str, limit: int = 100) -> list[HistoryEntry]:
+        """Расчеты всех пользователей за месяц"""
+        rows = await self._query(
+                f"{_SELECT} WHERE year = ? AND month = ? LIMIT ?", (year, RATES.month_index[month] + 1, limit),
+        )
+        return [_entry(row) for row in rows]
+
+    async def month_totals(self, year: int, month: str) -> tuple[int, int, Decimal]:
+        """Число расчетов, пользователей и сумма к выплате за месяц"""
+        ((count, users, answer),) = await self._query(
+                "SELECT COUNT(*), COUNT(DISTINCT user_id), COALESCE(SUM(answer), 0) FROM history "
+                "WHERE year = ? AND month = ?",
+                (year, RATES.month_index[month] + 1),
+        )
+        return count, users, to_amount(answer)
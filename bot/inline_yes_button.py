@@ -14,6 +14,9 @@ show_full_result_kb = InlineKeyboardMarkup(
                                 text="Показать полный расчёт", callback_data="show_full_result"
                         ),
                 ],
+                [
+                        InlineKeyboardButton(text="Сравнить варианты смен", callback_data="sweep"),
+                ],
                 [
                         InlineKeyboardButton(text="Назад", callback_data="go_back"),
                         InlineKeyboardButton(text="Завершить", callback_data="finish"),
@@ -0,0 +1,27 @@
+from time import perf_counter
+
+from aiogram import BaseMiddleware
+
+from salary_dgs import metrics
+
+
+class HandlerMetricsMiddleware(BaseMiddleware):
+    """Время работы обработчиков роутера (подключается только при включенных метриках)"""
+
+    async def __call__(self, handler, event, data):
+        name = data["handler"].callback.__name__
+        started = perf_counter()
+        failed = True
+        try:
+            result = await handler(event, data)
+            failed = False
+            return result
+        finally:
+            metrics.registry.observe_handler(name, perf_counter() - started, failed)
+
+
+def setup_metrics_middleware(router):
+    """Замер всех обработчиков сообщений и нажатий кнопок роутера"""
+    middleware = HandlerMetricsMiddleware()
+    router.message.middleware(middleware)
+    router.callback_query.middleware(middleware)
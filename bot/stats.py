@@ -0,0 +1,265 @@
+import asyncio
+import base64
+import hashlib
+import json
+import logging
+import math
+import os
+from datetime import datetime
+
+from aiogram import BaseMiddleware
+
+logger = logging.getLogger(__name__)
+
+# HyperLogLog: 2^14 регистров по байту (16 КиБ), стандартная ошибка ~0.8%
+HLL_BITS = 14
+HLL_REGISTERS = 1 << HLL_BITS
+_HLL_ALPHA = 0.7213 / (1 + 1.079 / HLL_REGISTERS)
+_HASH_BITS = 64 - HLL_BITS
+# До этого числа пользователей счет точный (множество id), дальше - HyperLogLog
+EXACT_LIMIT = 2048
+
+# Сколько завершенных периодов хранится (старые удаляются)
+KEEP_DAYS = 31
+KEEP_MONTHS = 24
+
+
+def _hash(user_id: int) -> int:
+    digest = hashlib.blake2b(user_id.to_bytes(8, "little", signed=True), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+class UniqueCounter:
+    """Число уникальных пользователей в фиксированной памяти.
+
+    Пока пользователей не больше exact_limit, хранятся их id и счет точный;
+    затем id переносятся в регистры HyperLogLog. Оценка поддерживается
+    при каждом изменении регистра, поэтому len() не перебирает регистры.
+    """
+
+    __slots__ = ("exact_limit", "ids", "registers", "_inverse_sum", "_zeros")
+
+    def __init__(self, exact_limit: int = EXACT_LIMIT):
+        self.exact_limit = exact_limit
+        self.ids = set()
+        self.registers = None  # bytearray регистров после перехода на HyperLogLog
+        self._inverse_sum = float(HLL_REGISTERS)  # Сумма 2^-регистр
+        self._zeros = HLL_REGISTERS  # Число нулевых регистров
+
+    @property
+    def exact(self) -> bool:
+        return self.registers is None
+
+    def _add_hashed(self, hashed: int):
+        index = hashed & (HLL_REGISTERS - 1)
+        rank = _HASH_BITS - (hashed >> HLL_BITS).bit_length() + 1
+        old = self.registers[index]
+        if rank > old:
+            self.registers[index] = rank
+            self._inverse_sum += 2.0 ** -rank - 2.0 ** -old
+            self._zeros -= old == 0
+
+    def _to_registers(self):
+        self.registers = bytearray(HLL_REGISTERS)
+        for user_id in self.ids:
+            self._add_hashed(_hash(user_id))
+        self.ids = set()
+
+    def add(self, user_id: int, hashed: int = None):
+        """Учет пользователя (hashed - готовый _hash(user_id), если он уже посчитан)"""
+        if self.registers is None:
+            self.ids.add(user_id)
+            if len(self.ids) > self.exact_limit:
+                self._to_registers()
+        else:
+            self._add_hashed(_hash(user_id) if hashed is None else hashed)
+
+    def __len__(self) -> int:
+        if self.registers is None:
+            return len(self.ids)
+        estimate = _HLL_ALPHA * HLL_REGISTERS * HLL_REGISTERS / self._inverse_sum
+        if estimate <= 2.5 * HLL_REGISTERS and self._zeros:
+            # Малые значения: линейный счет по пустым регистрам
+            estimate = HLL_REGISTERS * math.log(HLL_REGISTERS / self._zeros)
+        return round(estimate)
+
+    def to_dict(self) -> dict:
+        if self.registers is None:
+            return {"ids": sorted(self.ids)}
+        return {"registers": base64.b64encode(bytes(self.registers)).decode()}
+
+    @classmethod
+    def from_dict(cls, data: dict, exact_limit: int = EXACT_LIMIT) -> "UniqueCounter":
+        counter = cls(exact_limit)
+        if "registers" in data:
+            counter.registers = bytearray(base64.b64decode(data["registers"]))
+            counter._inverse_sum = sum(2.0 ** -value for value in counter.registers)
+            counter._zeros = counter.registers.count(0)
+        else:
+            for user_id in data["ids"]:
+                counter.add(user_id)
+        return counter
+
+
+def _keep_last(periods: dict, limit: int):
+    while len(periods) > limit:
+        del periods[next(iter(periods))]
+
+
+class UserStats:
+    """Статистика бота: все пользователи, активные за день и за месяц, расчеты по месяцам.
+
+    Память не зависит от числа пользователей (см. UniqueCounter), итоги прошедших
+    дней и месяцев хранятся числами за последние KEEP_DAYS дней и KEEP_MONTHS месяцев.
+    Состояние сбрасывается в файл path раз в flush_interval секунд и при закрытии.
+    """
+
+    def __init__(self, path: str = "stats.json", flush_interval: float = 60, exact_limit: int = EXACT_LIMIT):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.exact_limit = exact_limit
+        now = datetime.now()
+        self.users = UniqueCounter(exact_limit)
+        self.day_key = now.strftime("%Y-%m-%d")
+        self.day = UniqueCounter(exact_limit)
+        self.month_key = now.strftime("%Y-%m")
+        self.month = UniqueCounter(exact_limit)
+        self.daily = {}  # День -> активные пользователи (завершенные дни)
+        self.monthly = {}  # Месяц -> активные пользователи (завершенные месяцы)
+        self.calculations = {}  # Месяц -> число выполненных расчетов
+        self._date = now.date()
+        self._dirty = False
+        self._task = None
+
+    def _roll(self, now: datetime):
+        """Закрытие прошедших дня и месяца"""
+        if now.date() == self._date:
+            return
+        self._date = now.date()
+        day_key = now.strftime("%Y-%m-%d")
+        if day_key != self.day_key:
+            self.daily[self.day_key] = len(self.day)
+            _keep_last(self.daily, KEEP_DAYS)
+            self.day_key, self.day = day_key, UniqueCounter(self.exact_limit)
+        month_key = now.strftime("%Y-%m")
+        if month_key != self.month_key:
+            self.monthly[self.month_key] = len(self.month)
+            _keep_last(self.monthly, KEEP_MONTHS)
+            self.month_key, self.month = month_key, UniqueCounter(self.exact_limit)
+
+    def seen(self, user_id: int, now: datetime = None):
+        """Обращение пользователя к боту"""
+        self._roll(now or datetime.now())
+        hashed = _hash(user_id)
+        self.users.add(user_id, hashed)
+        self.day.add(user_id, hashed)
+        self.month.add(user_id, hashed)
+        self._dirty = True
+
+    def calculation(self, now: datetime = None):
+        """Выполненный расчет зарплаты"""
+        self._roll(now or datetime.now())
+        self.calculations[self.month_key] = self.calculations.get(self.month_key, 0) + 1
+        _keep_last(self.calculations, KEEP_MONTHS)
+        self._dirty = True
+
+    def summary(self) -> str:
+        """Текст для /stats (без перебора пользователей)"""
+        self._roll(datetime.now())
+
+        def count(counter: UniqueCounter) -> str:
+            return str(len(counter)) if counter.exact else f"≈{len(counter)}"
+
+        lines = [
+            f"👥 Пользователей воспользовалось ботом: {count(self.users)}",
+            f"📅 Активных сегодня: {count(self.day)}, в этом месяце: {count(self.month)}",
+            f"🧮 Расчетов в этом месяце: {self.calculations.get(self.month_key, 0)}",
+        ]
+        if self.monthly:
+            month_key, users = next(reversed(self.monthly.items()))
+            lines.append(
+                f"Прошлый месяц ({month_key}): активных {users}, расчетов {self.calculations.get(month_key, 0)}"
+            )
+        return "\n".join(lines)
+
+    def to_dict(self) -> dict:
+        return {
+            "users": self.users.to_dict(),
+            "day_key": self.day_key,
+            "day": self.day.to_dict(),
+            "month_key": self.month_key,
+            "month": self.month.to_dict(),
+            "daily": self.daily,
+            "monthly": self.monthly,
+            "calculations": self.calculations,
+        }
+
+    def load(self):
+        """Чтение сохраненной статистики (если файла нет - начинается с нуля)"""
+        try:
+            with open(self.path, encoding="utf-8") as file:
+                data = json.load(file)
+        except FileNotFoundError:
+            return
+        self.users = UniqueCounter.from_dict(data["users"], self.exact_limit)
+        self.day_key = data["day_key"]
+        self.day = UniqueCounter.from_dict(data["day"], self.exact_limit)
+        self.month_key = data["month_key"]
+        self.month = UniqueCounter.from_dict(data["month"], self.exact_limit)
+        self.daily = data["daily"]
+        self.monthly = data["monthly"]
+        self.calculations = data["calculations"]
+        self._date = datetime.strptime(self.day_key, "%Y-%m-%d").date()
+        self._roll(datetime.now())
+
+    def _write(self, data: dict):
+        # Запись во временный файл и замена: при сбое остается прошлая версия
+        temporary = f"{self.path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            json.dump(data, file)
+        os.replace(temporary, self.path)
+
+    async def flush(self):
+        """Сохранение, если были изменения (снимок берется в цикле событий, запись - в потоке)"""
+        if not self._dirty:
+            return
+        self._dirty = False
+        try:
+            await asyncio.to_thread(self._write, self.to_dict())
+        except OSError:
+            self._dirty = True
+            logger.exception("Не удалось сохранить статистику в %s", self.path)
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    async def start(self):
+        await asyncio.to_thread(self.load)
+        self._task = asyncio.create_task(self._flush_loop())
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        await self.flush()
+
+
+class StatsMiddleware(BaseMiddleware):
+    """Учет пользователя при каждом сообщении и нажатии кнопки"""
+
+    def __init__(self, stats: UserStats):
+        self.stats = stats
+
+    async def __call__(self, handler, event, data):
+        if event.from_user is not None:
+            self.stats.seen(event.from_user.id)
+        return await handler(event, data)
+
+
+def setup_stats_middleware(router, stats: UserStats):
+    """Учет всех сообщений и нажатий кнопок роутера, в том числе без подходящего обработчика"""
+    middleware = StatsMiddleware(stats)
+    router.message.outer_middleware(middleware)
+    router.callback_query.outer_middleware(middleware)
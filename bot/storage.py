@@ -0,0 +1,222 @@
+import asyncio
+import logging
+import sqlite3
+import threading
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from typing import Any, Mapping
+
+from aiogram import BaseMiddleware
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import BaseStorage, StorageKey
+
+from salary_dgs.state_codec import decode_state, encode_state
+
+logger = logging.getLogger(__name__)
+
+
+def storage_key(key: StorageKey) -> str:
+    """Строковый ключ записи по ключу aiogram"""
+    return f"{key.bot_id}:{key.chat_id}:{key.user_id}:{key.thread_id}:{key.business_connection_id}:{key.destiny}"
+
+
+class BinaryStateStorage(BaseStorage):
+    """Хранилище FSM: состояние - строкой, данные - двоичной записью state_codec.
+
+    records - любое отображение str -> bytes (словарь в памяти, shelve, клиент внешнего хранилища);
+    в нем лежат только байты, поэтому размер и скорость записи определяются кодеком.
+    """
+
+    def __init__(self, records: MutableMapping[str, bytes] = None):
+        self.records = {} if records is None else records
+
+    async def _get(self, name: str) -> bytes | None:
+        return self.records.get(name)
+
+    async def _set(self, name: str, value: bytes | None):
+        """Запись значения (None - удаление)"""
+        if value is None:
+            self.records.pop(name, None)
+        else:
+            self.records[name] = value
+
+    async def set_state(self, key: StorageKey, state: str | State | None = None) -> None:
+        value = None if state is None else (state.state if isinstance(state, State) else state).encode()
+        await self._set(f"state:{storage_key(key)}", value)
+
+    async def get_state(self, key: StorageKey) -> str | None:
+        state = await self._get(f"state:{storage_key(key)}")
+        return None if state is None else state.decode()
+
+    async def set_data(self, key: StorageKey, data: Mapping[str, Any]) -> None:
+        await self._set(f"data:{storage_key(key)}", encode_state(dict(data)) if data else None)
+
+    async def get_data(self, key: StorageKey) -> dict[str, Any]:
+        payload = await self._get(f"data:{storage_key(key)}")
+        return {} if payload is None else decode_state(payload)
+
+    async def close(self) -> None:
+        close = getattr(self.records, "close", None)
+        if close is not None:
+            close()
+
+
+class SqliteBackend:
+    """Записи хранилища в файле SQLite (WAL): пачка изменений - одна транзакция"""
+
+    def __init__(self, path: str = "fsm.db"):
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute("CREATE TABLE IF NOT EXISTS fsm (key TEXT PRIMARY KEY, value BLOB NOT NULL) WITHOUT ROWID")
+        self._lock = threading.Lock()  # Соединение одно, запросы идут из потоков asyncio.to_thread
+
+    def _get(self, name: str) -> bytes | None:
+        with self._lock:
+            row = self.connection.execute("SELECT value FROM fsm WHERE key = ?", (name,)).fetchone()
+        return None if row is None else row[0]
+
+    def _write(self, changes: dict[str, bytes | None]):
+        with self._lock, self.connection:
+            self.connection.executemany(
+                    "INSERT OR REPLACE INTO fsm (key, value) VALUES (?, ?)",
+                    [(name, value) for name, value in changes.items() if value is not None],
+            )
+            self.connection.executemany(
+                    "DELETE FROM fsm WHERE key = ?", [(name,) for name, value in changes.items() if value is None]
+            )
+
+    async def get(self, name: str) -> bytes | None:
+        return await asyncio.to_thread(self._get, name)
+
+    async def write(self, changes: dict[str, bytes | None]):
+        await asyncio.to_thread(self._write, changes)
+
+    async def close(self):
+        await asyncio.to_thread(self.connection.close)
+
+
+class RedisBackend:
+    """Записи хранилища в Redis-совместимом сервере.
+
+    client - асинхронный клиент с методами get, mset и delete (redis.asyncio.Redis
+    или совместимый); пачка изменений - один MSET и один DEL.
+    """
+
+    def __init__(self, client, prefix: str = "fsm:"):
+        self.client = client
+        self.prefix = prefix
+
+    async def get(self, name: str) -> bytes | None:
+        return await self.client.get(self.prefix + name)
+
+    async def write(self, changes: dict[str, bytes | None]):
+        values = {self.prefix + name: value for name, value in changes.items() if value is not None}
+        removed = [self.prefix + name for name, value in changes.items() if value is None]
+        if values:
+            await self.client.mset(values)
+        if removed:
+            await self.client.delete(*removed)
+
+    async def close(self):
+        close = getattr(self.client, "aclose", None) or getattr(self.client, "close", None)
+        if close is not None:
+            await close()
+
+
+class WriteBackStorage(BinaryStateStorage):
+    """Хранилище FSM с отложенной записью в backend (SqliteBackend, RedisBackend).
+
+    Обработчик за одно обновление несколько раз читает и пишет состояние и данные;
+    изменения копятся в памяти и уходят в backend одной пачкой в flush()
+    (вызывает FlushStorageMiddleware после каждого обновления). Чтение идет из
+    памяти: сначала несохраненные изменения, затем кэш последних cache_size записей,
+    и только при промахе - из backend. Перед обновлением FlushStorageMiddleware
+    сбрасывает кэш ключа (invalidate), поэтому обновление читает запись из backend
+    один раз и видит изменения других процессов с тем же backend.
+    """
+
+    def __init__(self, backend, cache_size: int = 10000):
+        super().__init__(OrderedDict())  # Кэш: имя -> значение (None - записи нет)
+        self.backend = backend
+        self.cache_size = cache_size
+        self._dirty = {}  # Несохраненные изменения: имя -> значение (None - удаление)
+        self.flushes = 0
+
+    def _cache(self, name: str, value: bytes | None):
+        self.records[name] = value
+        self.records.move_to_end(name)
+        if len(self.records) > self.cache_size:
+            self.records.popitem(last=False)
+
+    async def _get(self, name: str) -> bytes | None:
+        if name in self._dirty:
+            return self._dirty[name]
+        if name in self.records:
+            self.records.move_to_end(name)
+            return self.records[name]
+        value = await self.backend.get(name)
+        # Пока шло чтение, запись могла быть изменена в этом процессе
+        if name in self._dirty:
+            return self._dirty[name]
+        if name in self.records:
+            return self.records[name]
+        self._cache(name, value)
+        return value
+
+    async def _set(self, name: str, value: bytes | None):
+        self._dirty[name] = value
+        self._cache(name, value)
+
+    def invalidate(self, key: StorageKey):
+        """Сброс кэша состояния и данных ключа (несохраненные изменения остаются)"""
+        name = storage_key(key)
+        self.records.pop(f"state:{name}", None)
+        self.records.pop(f"data:{name}", None)
+
+    async def flush(self):
+        """Запись накопленных изменений одной пачкой"""
+        if not self._dirty:
+            return
+        changes, self._dirty = self._dirty, {}
+        try:
+            await self.backend.write(changes)
+        except Exception:
+            # Изменения, сделанные во время записи, новее неудачной пачки
+            self._dirty = {**changes, **self._dirty}
+            raise
+        self.flushes += 1
+
+    async def close(self) -> None:
+        await self.flush()
+        await self.backend.close()
+
+
+class FlushStorageMiddleware(BaseMiddleware):
+    """Свежее чтение FSM перед обработкой обновления и запись изменений после (одна запись на обновление).
+
+    Хранилище и ключ берутся из данных FSMContextMiddleware диспетчера. Ошибка записи
+    не прерывает ответ пользователю: изменения остаются в памяти и уходят со следующей пачкой.
+    """
+
+    async def __call__(self, handler, event, data):
+        storage = data.get("fsm_storage")
+        context = data.get("state")
+        if isinstance(storage, WriteBackStorage) and context is not None:
+            # Запись могла измениться в другом процессе после прошлого обновления:
+            # состояние, прочитанное FSMContextMiddleware из кэша, читается заново
+            storage.invalidate(context.key)
+            data["raw_state"] = await context.get_state()
+        try:
+            return await handler(event, data)
+        finally:
+            if isinstance(storage, WriteBackStorage):
+                try:
+                    await storage.flush()
+                except Exception:
+                    logger.exception("Не удалось записать состояние FSM")
+
+
+def setup_write_back(dispatcher):
+    """Сброс изменений WriteBackStorage диспетчера после каждого обновления"""
+    dispatcher.update.outer_middleware(FlushStorageMiddleware())
@@ -1,22 +1,35 @@
 import asyncio
+import logging
 import os
+from datetime import datetime
+from decimal import Decimal
 from dotenv import load_dotenv
 from dataclasses import asdict
 from aiogram import Router, F, Bot, Dispatcher
 from aiogram.fsm.storage.memory import MemoryStorage
 from aiogram.types import Message, CallbackQuery, InlineKeyboardMarkup, InlineKeyboardButton
-from aiogram.filters import Command, StateFilter
+from aiogram.filters import Command, CommandObject, StateFilter
 from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import State
 
 from bot.inline_yes_button import show_full_result_kb, back_button_kb, main_menu_kb, show_months_of_years
+from bot.history import HistoryStore
+from bot.middlewares import setup_metrics_middleware
+from bot.stats import UserStats, setup_stats_middleware
+from bot.storage import BinaryStateStorage, SqliteBackend, WriteBackStorage, setup_write_back
 from bot.states import SalaryInput
+from salary_dgs import calculations, metrics, solver
 from salary_dgs.constant import EN_TO_RU_MONTHS
 from \
-    salary_dgs.models import BaseSalary, GetDataSalary
-from salary_dgs.services import CalculationBaseSalary, logger
-
-# from salary_dgs import logger
+    salary_dgs.models import BaseSalary, SalaryRecord
+from salary_dgs.logging_setup import setup_logging, stop_logging
+from salary_dgs.production_calendar import available_years, default_year
+from salary_dgs.rates import RATES
+from salary_dgs.services import CalculationBaseSalary
+from salary_dgs.sweep import sweep
+
+# Свой логгер обработчиков: тихий режим (LOG_MODE=quiet) отключает только сообщения расчета
+logger = logging.getLogger("main_bot")
 router = Router()
 
 load_dotenv()
@@ -36,19 +49,32 @@ step_sequence = [
     SalaryInput.show_full_result,
 ]
 
-used_users = set()
+# Пользователи и расчеты (сохраняются в файл, загружаются в main)
+stats = UserStats(os.getenv("STATS_FILE", "stats.json"), int(os.getenv("STATS_FLUSH_SECONDS", "60")))
+# История расчетов (открывается в main, без запуска запись не ведется)
+history = HistoryStore(os.getenv("HISTORY_DB", "history.db"))
 
 
 def restore_salary(data: dict) -> BaseSalary:
     salary_data = data.get("salary")
     if isinstance(salary_data, BaseSalary):
         return salary_data
+    if salary_data is None and isinstance(data.get("record"), SalaryRecord):
+        # После расчета в состоянии остается только запись (возврат назад к вводу)
+        return BaseSalary.from_dict(data["record"].to_dict())
     return BaseSalary.from_dict(salary_data)
 
 
+def restore_record(data: dict) -> SalaryRecord:
+    """Готовая запись расчета из состояния (без повторного разбора ввода)"""
+    record = data.get("record")
+    if isinstance(record, SalaryRecord):
+        return record
+    return restore_salary(data).to_record()
+
+
 @router.message(Command("start"))
 async def start_handler(message: Message):
-    used_users.add(message.from_user.id)
     await message.answer(
         "👋 *Привет!*\n"
         "🚀 Я посчитаю *Вашу зарплату!* Выберите действие:",
@@ -59,15 +85,16 @@ async def start_handler(message: Message):
 @router.message(Command("stats"))
 async def stats_handler(message: Message):
     if message.from_user.id == ADMIN_ID:
-        await message.answer(
-            f"👥 Пользователей воспользовалось ботом: {len(used_users)}"
-        )
+        text = stats.summary()
+        if metrics.is_enabled():
+            text += "\n\n" + metrics.summary()
+        await message.answer(text)
     else:
         await message.answer("⛔️ Недостаточно прав.")
 
 
 @router.message(Command("help"))
-async def stats_handler(message: Message):
+async def help_handler(message: Message):
     await message.answer(
         f"*1. ПРЕМИЯ:*\n"
         "От базового оклада - *40%*\n\n"
@@ -102,6 +129,96 @@ async def stats_handler(message: Message):
     )
 
 
+HISTORY_USAGE = (
+    "🗂 История расчетов:\n"
+    "`/history [количество]` - последние расчеты (по умолчанию 5, не больше 20)\n"
+    "`/history месяц год` - итоги месяца по всем пользователям (для администратора)"
+)
+
+
+@router.message(Command("history"))
+async def history_handler(message: Message, command: CommandObject):
+    if not history.started:
+        await message.answer("История расчетов недоступна.")
+        return
+    args = (command.args or "").lower().split()
+
+    if len(args) == 2 and args[0] in RATES.month_index and args[1].isdigit():
+        if message.from_user.id != ADMIN_ID:
+            await message.answer("⛔️ Недостаточно прав.")
+            return
+        count, users, answer = await history.month_totals(int(args[1]), args[0])
+        await message.answer(
+            f"📅 {args[0].capitalize()} {args[1]}: расчетов {count}, пользователей {users}\n"
+            f"Сумма к выплате: *{answer} ₽*", parse_mode="Markdown"
+        )
+        return
+    if len(args) > 1 or args and not args[0].isdigit():
+        await message.answer(HISTORY_USAGE, parse_mode="Markdown")
+        return
+
+    entries = await history.last(message.from_user.id, min(int(args[0]) if args else 5, 20))
+    if not entries:
+        await message.answer("История расчетов пуста.")
+        return
+    lines = ["🗂 *Последние расчеты:*"]
+    for entry in entries:
+        created = datetime.fromtimestamp(entry.created).strftime("%d.%m.%Y %H:%M")
+        lines.append(
+            f"{created} · {entry.record.month} {entry.record.year} · оклад {entry.record.base_salary} ₽ · "
+            f"к выплате *{entry.breakdown['answer']} ₽*"
+        )
+    await message.answer("\n".join(lines), parse_mode="Markdown")
+
+
+TARGET_USAGE = (
+    "🎯 Сколько смен нужно для желаемой суммы к выплате:\n"
+    "`/target сумма оклад месяц [ночные] [вечерние] [температура] [дети] [алименты]`\n\n"
+    "Пример: `/target 150000 85000 март 7 6 3 1,2 0`\n\n"
+    "Расчет по производственному календарю {year} года."
+)
+
+
+@router.message(Command("target"))
+async def target_handler(message: Message, command: CommandObject):
+    args = (command.args or "").split()
+    if len(args) < 3:
+        await message.answer(TARGET_USAGE.format(year=default_year()), parse_mode="Markdown")
+        return
+
+    target, base_salary, month, *rest = args
+    night_shifts, evening_shifts, temperature_work, children, alimony = (rest + ["0"] * 5)[:5]
+    salary = BaseSalary()
+    try:
+        if not target.isdigit():
+            raise ValueError(f"Некорректное значение ({target}), ожидается число.")
+        salary.base_salary = base_salary
+        salary.month = month
+        salary.sum_days = str(solver.MAX_DAYS)
+        salary.night_shifts = night_shifts
+        salary.evening_shifts = evening_shifts
+        salary.temperature_work = temperature_work
+        salary.children = children
+        salary.alimony = alimony
+    except ValueError as e:
+        await message.answer(f"Ошибка: {e}")
+        return
+
+    inputs = calculations.salary_inputs(salary)
+    days = solver.solve_sum_days(Decimal(target), inputs)
+    norm_days = RATES.month_rates(int(salary.year), salary.month).days_norm
+    base_needed = solver.solve_base_salary(Decimal(target), dict(inputs, sum_days=norm_days))
+
+    lines = [f"🎯 Сумма к выплате: *{target} ₽* ({salary.month} {salary.year})"]
+    if days is None:
+        lines.append(f"Не достигается даже за {solver.MAX_DAYS} смен.")
+    else:
+        lines.append(f"⏱️ Нужно отработать смен: *{days}*")
+    if base_needed is not None:
+        lines.append(f"💰 При норме выходов ({norm_days}) нужен оклад от *{base_needed} ₽*")
+    await message.answer("\n".join(lines), parse_mode="Markdown")
+
+
 @router.callback_query(F.data == "stop")
 async def stop_callback(callback: CallbackQuery, state: FSMContext):
     await state.clear()
@@ -113,12 +230,14 @@ async def stop_callback(callback: CallbackQuery, state: FSMContext):
 @router.callback_query(F.data == "start")
 async def start_callback(callback: CallbackQuery, state: FSMContext):
     # await state.clear()
-    await state.set_data({"salary": BaseSalary()})
+    # Год расчета фиксируется в начале ввода (его можно сменить на шаге месяца),
+    # поэтому незавершенный расчет не меняется после смены года
+    await state.set_data({"salary": BaseSalary(_year=str(default_year()))})
     await state.set_state(SalaryInput.base_salary)
     await callback.message.answer("💰 Укажите Ваш оклад:")
 
-    logger.info(f"Команда /start, пользователь")
-    logger.info(f"Введен оклад пользователем")
+    logger.info("Команда /start, пользователь")
+    logger.info("Введен оклад пользователем")
     await callback.answer()
 
 
@@ -131,16 +250,30 @@ async def input_base_salary(message: Message, state: FSMContext):
         salary.base_salary = message.text
         await state.update_data(salary=salary.to_dict())
         await state.set_state(SalaryInput.month)
-        await message.answer("📅 Выберите расчетный месяц:", reply_markup=combined_keyboard)
+        await message.answer("📅 Выберите расчетный год и месяц:", reply_markup=month_keyboard(salary.year))
 
-        logger.info(f"Введен месяц {message.text} пользователем {message.from_user.id}")
+        logger.info("Введен месяц %s пользователем %s", message.text, message.from_user.id)
     except ValueError as e:
         await message.answer(f"Ошибка: {e}")
         logger.error(
-            f"Ошибка ввода месяца {message.text} пользователем {message.from_user.username}"
+            "Ошибка ввода месяца %s пользователем %s", message.text, message.from_user.username
         )
 
 
+@router.callback_query(StateFilter(SalaryInput.month), F.data.startswith("year_"))
+async def select_year(callback: CallbackQuery, state: FSMContext):
+    salary = restore_salary(await state.get_data())
+    try:
+        salary.year = callback.data.replace("year_", "")
+    except ValueError as e:
+        await callback.answer(f"Ошибка: {e}")
+        return
+    await state.update_data(salary=salary.to_dict())
+    await callback.message.edit_reply_markup(reply_markup=month_keyboard(salary.year))
+    await callback.answer(f"Выбран год: {salary.year}")
+    logger.info("Выбран год %s пользователем %s", salary.year, callback.from_user.id)
+
+
 @router.callback_query(StateFilter(SalaryInput.month), F.data.startswith("month_"))
 async def select_month(callback: CallbackQuery, state: FSMContext):
     en_month = callback.data.replace("month_", "").lower()
@@ -161,7 +294,7 @@ async def select_month(callback: CallbackQuery, state: FSMContext):
     salary.month = ru_month
     await state.update_data(salary=salary.to_dict())
 
-    await callback.answer(f"Выбран месяц: {ru_month.capitalize()}")
+    await callback.answer(f"Выбран месяц: {ru_month.capitalize()} {salary.year}")
 
     # Переход к следующему шагу
     await state.set_state(SalaryInput.sum_days)
@@ -172,11 +305,15 @@ async def select_month(callback: CallbackQuery, state: FSMContext):
         "⏱️ Введите общее количество отработанных или планируемых смен:",
         reply_markup=get_back_finish_kb(),
     )
-        logger.info(f"Введено общее количество смен {callback.message.text} пользователем {callback.message.from_user.username}")
+        logger.info(
+            "Введено общее количество смен %s пользователем %s",
+            callback.message.text, callback.message.from_user.username,
+        )
     except ValueError as e:
         await callback.message.answer(f"Ошибка: {e}")
         logger.error(
-                f"Ошибка ввода ночных смен {callback.message.text} пользователем {callback.message.from_user.username}"
+                "Ошибка ввода ночных смен %s пользователем %s",
+                callback.message.text, callback.message.from_user.username,
         )
 
 
@@ -194,12 +331,12 @@ async def input_sum_days(message: Message, state: FSMContext):
             reply_markup=get_back_finish_kb(),
         )
         logger.info(
-            f"Введено количество ночных смен {message.text} пользователем {message.from_user.username}"
+            "Введено количество ночных смен %s пользователем %s", message.text, message.from_user.username
         )
     except ValueError as e:
         await message.answer(f"Ошибка: {e}")
         logger.error(
-            f"Ошибка ввода ночных смен {message.text} пользователем {message.from_user.username}"
+            "Ошибка ввода ночных смен %s пользователем %s", message.text, message.from_user.username
         )
 
 
@@ -217,12 +354,12 @@ async def input_night_shifts(message: Message, state: FSMContext):
             reply_markup=get_back_finish_kb(),
         )
         logger.info(
-            f"Введено количество вечерних смен {message.text} пользователем {message.from_user.username}"
+            "Введено количество вечерних смен %s пользователем %s", message.text, message.from_user.username
         )
     except ValueError as e:
         await message.answer(f"Ошибка: {e}")
         logger.error(
-            f"Ошибка ввода вечерних смен {message.text} пользователем {message.from_user.username}"
+            "Ошибка ввода вечерних смен %s пользователем %s", message.text, message.from_user.username
         )
 
 
@@ -241,14 +378,14 @@ async def input_evening_shifts(message: Message, state: FSMContext):
             reply_markup=get_back_finish_kb(),
         )
         logger.info(
-            f"Введено количество смен работы в температуре {message.text} "
-            f"пользователем {message.from_user.username}"
+            "Введено количество смен работы в температуре %s пользователем %s",
+            message.text, message.from_user.username,
         )
     except ValueError as e:
         await message.answer(f"Ошибка: {e}")
         logger.error(
-            f"Ошибка ввода количества смен работы в температуре {message.text} "
-            f"пользователем {message.from_user.username} - {e}"
+            "Ошибка ввода количества смен работы в температуре %s пользователем %s - %s",
+            message.text, message.from_user.username, e,
         )
 
 
@@ -269,14 +406,14 @@ async def input_temperature_work(message: Message, state: FSMContext):
             reply_markup=get_back_finish_kb(), parse_mode="Markdown"
         )
         logger.info(
-            f"Введено количество детей на налоговый вычет {message.text} "
-            f"пользователем {message.from_user.username}"
+            "Введено количество детей на налоговый вычет %s пользователем %s",
+            message.text, message.from_user.username,
         )
     except ValueError as e:
         await message.answer(f"Ошибка: {e}")
         logger.error(
-            f"Ошибка ввода количество детей {message.text} "
-            f"пользователем {message.from_user.username} - {e}"
+            "Ошибка ввода количество детей %s пользователем %s - %s",
+            message.text, message.from_user.username, e,
         )
 
 
@@ -302,8 +439,8 @@ async def input_children(message: Message, state: FSMContext):
     except ValueError as e:
         await message.answer(f"Ошибка: {e}")
         logger.error(
-            f"Ошибка ввода алиментов {message.text} "
-            f"пользователем {message.from_user.username} - {e}"
+            "Ошибка ввода алиментов %s пользователем %s - %s",
+            message.text, message.from_user.username, e,
         )
 
 
@@ -315,22 +452,19 @@ async def input_alimony(message: Message, state: FSMContext):
 
     try:
         salary.alimony = message.text
-        await state.update_data(salary=salary)
-
-        # Преобразуем в GetDataSalary
-        get_salary = GetDataSalary.from_base_salary(salary)
+        # После ввода в состоянии хранится только неизменяемая запись: она же ключ кеша
+        record = salary.to_record()
+        await state.set_data({"record": record})
 
         # Начислено
-        calc = CalculationBaseSalary(get_salary)
-
-        result_answer = await calc.calculation_answer()
-        result_base_month = await calc.calculation_base_month()
-        result_month_quarter = await calc.month_quarter_payment_calculation()
+        result = await CalculationBaseSalary(record).calculation_breakdown()
+        history.record(message.from_user.id, record, result)
+        stats.calculation()
 
         await message.answer(
-            f"✅ Итоговая сумма к выплате: *{result_answer} ₽*\n"
-            f"👆 Дополнительно Вам будет выплачено: *{result_base_month} ₽*\n"
-            f"в {result_month_quarter}.", parse_mode="Markdown"
+            f"✅ Итоговая сумма к выплате: *{result.answer} ₽*\n"
+            f"👆 Дополнительно Вам будет выплачено: *{result.base_month} ₽*\n"
+            f"в {result.month_quarter_payment}.", parse_mode="Markdown"
         )
         await message.answer(
             f"Вам предоставить полные данные по расчету?\n",
@@ -350,54 +484,56 @@ async def input_alimony(message: Message, state: FSMContext):
 async def show_full_result_callback(callback: CallbackQuery, state: FSMContext):
     await callback.message.edit_reply_markup(reply_markup=None)  # 🔥 Удаляем кнопки
 
-    data = await state.get_data()
-    salary = restore_salary(await state.get_data())
+    record = restore_record(await state.get_data())
 
-    get_salary = GetDataSalary.from_base_salary(salary)
-
-    calc = CalculationBaseSalary(get_salary)
-
-    result_base_salary = await calc.calculation_base_salary()
-    result_night_shifts = await calc.calculation_night_shifts()
-    result_bonus = await calc.calculation_bonus()
-    result_underground = await calc.calculation_underground()
-    result_in_temperature = await calc.calculation_working_in_temperature()
-    result_district_allowance = await calc.calculation_district_allowance()
-    result_north_allowance = await calc.calculation_north_allowance()
-    result_total_accruals = await calc.calculation_total_accruals()
-    result_deduction_for_children = await calc.calculation_deduction_for_children()
-    result_withholding_tax = await calc.calculation_withholding_tax()
-    result_alimony = await calc.calculation_alimony()
-    result_answer = await calc.calculation_answer()
-    result_base_month = await calc.calculation_base_month()
-    result_month_quarter = await calc.month_quarter_payment_calculation()
+    result = await CalculationBaseSalary(record).calculation_breakdown()
 
     await callback.message.answer("Подробный расчёт...")
     await callback.message.answer(
         f"НАЧИСЛЕНО:\n"
-        f"Оклад за фактическое отработанное время: *{result_base_salary} ₽*\n"
-        f"Доплата за работу в ночное время: *{result_night_shifts} ₽*\n"
-        f"Премия ежемесячная: *{result_bonus} ₽*\n"
-        f"Надбавка за вредные условия труда: *{result_underground} ₽*\n"
-        f"Доплата за работу в температуре свыше +26С: *{result_in_temperature} ₽*\n"
-        f"Районный коэффициент: *{result_district_allowance} ₽*\n"
-        f"Северная надбавка: *{result_north_allowance} ₽*\n"
-        f"Налоговый вычет на детей: *{result_deduction_for_children} ₽*\n\n"
-        f"✅ ИТОГО НАЧИСЛЕНИЯ: *{result_total_accruals} ₽*\n", parse_mode="Markdown"
+        f"Оклад за фактическое отработанное время: *{result.base_salary} ₽*\n"
+        f"Доплата за работу в ночное время: *{result.night_shifts} ₽*\n"
+        f"Премия ежемесячная: *{result.bonus} ₽*\n"
+        f"Надбавка за вредные условия труда: *{result.underground} ₽*\n"
+        f"Доплата за работу в температуре свыше +26С: *{result.working_in_temperature} ₽*\n"
+        f"Районный коэффициент: *{result.district_allowance} ₽*\n"
+        f"Северная надбавка: *{result.north_allowance} ₽*\n"
+        f"Налоговый вычет на детей: *{result.deduction_for_children} ₽*\n\n"
+        f"✅ ИТОГО НАЧИСЛЕНИЯ: *{result.total_accruals} ₽*\n", parse_mode="Markdown"
     )
     await callback.message.answer(
         f"УДЕРЖАНО:\n"
-        f"Налог с начислений (НДФЛ): *{result_withholding_tax} ₽*\n"
-        f"Алименты: *{result_alimony} ₽*\n"
-        f"✅ ИТОГО К ВЫПЛАТЕ: *{result_answer} ₽*\n"
-        f"👆 Дополнительно Вам будет выплачено: *{result_base_month} ₽*\n"
-        f"в *{result_month_quarter}.*", parse_mode="Markdown"
+        f"Налог с начислений (НДФЛ): *{result.withholding_tax} ₽*\n"
+        f"Алименты: *{result.alimony} ₽*\n"
+        f"✅ ИТОГО К ВЫПЛАТЕ: *{result.answer} ₽*\n"
+        f"👆 Дополнительно Вам будет выплачено: *{result.base_month} ₽*\n"
+        f"в *{result.month_quarter_payment}.*", parse_mode="Markdown"
     )
 
     await callback.answer()
     await state.clear()
 
 
+@router.callback_query(StateFilter(SalaryInput.show_full_result), F.data == "sweep")
+async def sweep_callback(callback: CallbackQuery, state: FSMContext):
+    record = restore_record(await state.get_data())
+    sum_days = record.sum_days
+    night_shifts = record.night_shifts
+
+    # Соседние варианты: общее количество смен и ночные смены вокруг введенных
+    result = sweep(
+        record,
+        sum_days=range(max(sum_days - 2, 0), min(sum_days + 2, 31) + 1),
+        night_shifts=range(max(night_shifts - 2, 0), night_shifts + 3),
+    )
+    await callback.message.answer(
+        "📊 Сумма к выплате, тыс. ₽ (строки - всего смен, столбцы - ночные смены):\n"
+        f"```\n{result.table(scale=Decimal(1000))}\n```",
+        parse_mode="Markdown",
+    )
+    await callback.answer()
+
+
 @router.callback_query(F.data == "go_back")
 async def go_back_callback(callback: CallbackQuery, state: FSMContext):
     await callback.message.edit_reply_markup(reply_markup=None)
@@ -434,7 +570,8 @@ async def prompt_for_state(message: Message, state: FSMContext, target_state: St
     if target_state == SalaryInput.base_salary:
         await message.answer("Укажите ваш оклад:")
     elif target_state == SalaryInput.month:
-        await message.answer("Введите расчетный месяц:", reply_markup=show_months_of_years)
+        salary = restore_salary(await state.get_data())
+        await message.answer("Введите расчетный год и месяц:", reply_markup=month_keyboard(salary.year))
     elif target_state == SalaryInput.sum_days:
         await message.answer(
             "Введите общее количество отработанных или планируемых смен:",
@@ -486,16 +623,51 @@ def get_back_finish_kb() -> InlineKeyboardMarkup:
     )
 
 
-combined_keyboard = InlineKeyboardMarkup(
-    inline_keyboard=show_months_of_years.inline_keyboard + get_back_finish_kb().inline_keyboard
-)
+def month_keyboard(year: str) -> InlineKeyboardMarkup:
+    """Годы производственного календаря (выбранный отмечен), месяцы и кнопки назад/завершить"""
+    years = [
+        InlineKeyboardButton(text=f"✅ {value}" if str(value) == year else str(value), callback_data=f"year_{value}")
+        for value in available_years()
+    ]
+    return InlineKeyboardMarkup(
+        inline_keyboard=[years] + show_months_of_years.inline_keyboard + get_back_finish_kb().inline_keyboard
+    )
 
 
 async def main():
+    setup_logging()
+    # Метрики включаются переменной METRICS_PORT, без нее замеров нет
+    metrics_server = await metrics.setup_from_env()
+    if metrics_server is not None:
+        setup_metrics_middleware(router)
     bot = Bot(token=TOKEN)
-    dp = Dispatcher(storage=MemoryStorage())
+    # FSM_STORAGE=binary - данные сессии хранятся компактной двоичной записью (bot.storage),
+    # sqlite - то же в файле FSM_DB (переживает перезапуск), изменения пишутся одной пачкой на обновление
+    fsm_storage = os.getenv("FSM_STORAGE")
+    if fsm_storage == "sqlite":
+        storage = WriteBackStorage(SqliteBackend(os.getenv("FSM_DB", "fsm.db")))
+    elif fsm_storage == "binary":
+        storage = BinaryStateStorage()
+    else:
+        storage = MemoryStorage()
+    dp = Dispatcher(storage=storage)
+    if isinstance(storage, WriteBackStorage):
+        setup_write_back(dp)
     dp.include_router(router)
-    await dp.start_polling(bot)
+    setup_stats_middleware(router, stats)
+    await stats.start()
+    await history.start()
+    try:
+        await dp.start_polling(bot)
+    finally:
+        if metrics_server is not None:
+            metrics_server.close()
+            await metrics_server.wait_closed()
+        await history.close()
+        await stats.close()
+        await storage.close()
+        # Последним: записи при закрытии тоже дописываются из очереди
+        stop_logging()
 
 
 if __name__ == "__main__":
@@ -1,6 +1,12 @@
+from salary_dgs.csv_batch import OUTPUT_FORMATS, stream_csv
+from salary_dgs.logging_setup import setup_logging
 from salary_dgs.models import GetDataSalary
+from salary_dgs.parallel import default_workers
+from salary_dgs.production_calendar import available_years, default_year
 from salary_dgs.services import CalculationBaseSalary
+import argparse
 import asyncio
+import sys
 
 
 async def main():
@@ -24,6 +30,21 @@ async def main():
         except ValueError as error:
             print(f"Ошибка: {error}")
 
+    # Год по производственному календарю, пустой ввод - год по умолчанию
+    while True:
+        try:
+            year = input(
+                    f"Введите год ({', '.join(map(str, available_years()))}), "
+                    f"по умолчанию {default_year()}: "
+            ).strip()
+            if year:
+                emp.year = year
+            print(await emp.get_year())
+            print("Данные года приняты")
+            break
+        except ValueError as error:
+            print(f"Ошибка: {error}")
+
     while emp.sum_days is None:
         try:
             emp.sum_days = input("Введите количество дней: ").strip()
@@ -94,27 +115,65 @@ async def main():
     salary = await emp.get_base_salary()
     night_shifts = await emp.get_night_shifts()
 
-    answer_base_salary = CalculationBaseSalary(salary_data=emp)
-
-    print(f"Голый оклад: {await answer_base_salary.calculation_base_salary()}")
-    print(f"Оплата за ночные смены: {await answer_base_salary.calculation_night_shifts()}")
-    print(f"Доплата за вредность: {await answer_base_salary.calculation_underground()}")
-    print(f"Премия: {await answer_base_salary.calculation_bonus()}")
-    print(f"Оклад с начислениями: {await answer_base_salary.calculation_base()}")
-    print(f"Районный коэффициент: {await answer_base_salary.calculation_district_allowance()}")
-    print(f"Северная надбавка: {await answer_base_salary.calculation_north_allowance()}")
-    print(f"Оплата в температуре: {await answer_base_salary.calculation_working_in_temperature()}")
-    print(f"Общие начисления: {await answer_base_salary.calculation_total_accruals()}")
-    print(f"Налоговый вычет: {await answer_base_salary.calculation_deduction_for_children()}")
-    print(f"Подоходный налог: {await answer_base_salary.calculation_withholding_tax()}")
-    print(f"Выплата по алиментам: {await answer_base_salary.calculation_alimony()}")
-    print(f"Ваша итоговая зарплата: {await answer_base_salary.calculation_answer()}")
-    # print(f"Ваша доплата за переработку: {answer_base_salary.calculation_base_month()}")
+    result = await CalculationBaseSalary(salary_data=emp).calculation_breakdown()
+
+    print(f"Расчет за {emp.month} {emp.year} года")
+    print(f"Голый оклад: {result.base_salary}")
+    print(f"Оплата за ночные смены: {result.night_shifts}")
+    print(f"Доплата за вредность: {result.underground}")
+    print(f"Премия: {result.bonus}")
+    print(f"Оклад с начислениями: {result.base}")
+    print(f"Районный коэффициент: {result.district_allowance}")
+    print(f"Северная надбавка: {result.north_allowance}")
+    print(f"Оплата в температуре: {result.working_in_temperature}")
+    print(f"Общие начисления: {result.total_accruals}")
+    print(f"Налоговый вычет: {result.deduction_for_children}")
+    print(f"Подоходный налог: {result.withholding_tax}")
+    print(f"Выплата по алиментам: {result.alimony}")
+    print(f"Ваша итоговая зарплата: {result.answer}")
     print(
-        f"Доп.сумму за переработку: {await answer_base_salary.calculation_base_month()}\n"
+        f"Доп.сумму за переработку: {result.base_month}\n"
         f"вы получите в конце квартала, месяц: "
-        f"{(await answer_base_salary.month_quarter_payment_calculation()).capitalize()}"
+        f"{result.month_quarter_payment.capitalize()}"
         )
 
+
+def open_file(path: str, mode: str, default):
+    """Файл по пути или stdin/stdout для "-" """
+    if path == "-":
+        return default
+    return open(path, mode, encoding="utf-8", newline="")
+
+
+def run_batch(args):
+    """Расчет CSV без диалога: результат и отклоненные строки пишутся по мере чтения"""
+    rejects = open_file(args.rejects, "w", sys.stderr) if args.rejects else None
+    with open_file(args.batch, "r", sys.stdin) as source, open_file(args.output, "w", sys.stdout) as output:
+        report = stream_csv(
+                source, output, args.format, rejects, args.chunk_size, args.delimiter,
+                workers=args.workers or default_workers(),
+        )
+    if rejects is not None and rejects is not sys.stderr:
+        rejects.close()
+    print(report.summary(), file=sys.stderr)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Расчет зарплаты: диалог или пакетный расчет CSV")
+    parser.add_argument("--batch", metavar="CSV", help="CSV с полями BaseSalary в заголовке (\"-\" - stdin)")
+    parser.add_argument("--output", default="-", help="файл результата (по умолчанию stdout)")
+    parser.add_argument("--format", choices=OUTPUT_FORMATS, default="csv", help="формат результата")
+    parser.add_argument("--rejects", metavar="CSV", help="файл для строк с ошибками (row, field, value, message)")
+    parser.add_argument("--chunk-size", type=int, default=10000, help="строк в одном пакетном расчете")
+    parser.add_argument("--delimiter", default=",", help="разделитель входного CSV")
+    parser.add_argument("--workers", type=int, default=1, help="процессов для расчета (0 - по числу ядер)")
+    return parser.parse_args()
+
+
 if __name__ == "__main__":
-    asyncio.run(main())
+    args = parse_args()
+    if args.batch:
+        run_batch(args)
+    else:
+        setup_logging()
+        asyncio.run(main())
@@ -0,0 +1,412 @@
+import csv
+from decimal import Decimal, ROUND_HALF_UP
+from functools import lru_cache
+
+import numpy as np
+
+from salary_dgs import calculations, kopecks, production_calendar
+from salary_dgs.constant import MAX_BASE_SALARY
+from salary_dgs.models import BaseSalary, SalaryRecord, parse_numbers
+from salary_dgs.rates import RATES
+
+# Поля входного пакета (совпадают со свойствами BaseSalary)
+BATCH_FIELDS = (
+    "base_salary",
+    "month",
+    "sum_days",
+    "night_shifts",
+    "evening_shifts",
+    "temperature_work",
+    "children",
+    "alimony",
+    "year",  # Необязательное поле: без него берется год по умолчанию календаря
+)
+
+# Составляющие расчета (совпадают с методами calculation_* в CalculationBaseSalary)
+BATCH_COMPONENTS = kopecks.COMPONENTS
+
+_MONTHS = RATES.months
+_MONTH_INDEX = RATES.month_index
+
+
+def _round_half_up(numerator, denominator):
+    """Целочисленное деление с округлением ROUND_HALF_UP (знаменатель положительный)"""
+    return np.where(
+        numerator >= 0,
+        (2 * numerator + denominator) // (2 * denominator),
+        -((denominator - 2 * numerator) // (2 * denominator)),
+    )
+
+
+def _lookup(values, parse):
+    """Разбор строковой колонки через таблицу уникальных значений"""
+    unique, inverse = np.unique(np.asarray(values, dtype=str), return_inverse=True)
+    parsed = [parse(value) for value in unique]
+    return parsed, inverse
+
+
+def month_indexes(months) -> np.ndarray:
+    """Номера месяцев (0 - январь) для колонки названий месяцев"""
+    try:
+        parsed, inverse = _lookup(months, _MONTH_INDEX.__getitem__)
+    except KeyError as e:
+        raise ValueError(f"Некорректное значение ({e.args[0]}), ожидается месяц года.")
+    return np.array(parsed, dtype=np.intp)[inverse]
+
+
+def _encode_numbers(values) -> tuple[tuple, np.ndarray]:
+    """Словарное кодирование списков чисел: таблица различных кортежей и номер в ней по строкам"""
+    table = {}
+    codes = np.fromiter(
+        (
+            table.setdefault(value if isinstance(value, tuple) else parse_numbers(str(value)), len(table))
+            for value in values
+        ),
+        dtype=np.uint16,
+        count=len(values),
+    )
+    return tuple(table), codes
+
+
+def _base_salaries(values) -> np.ndarray:
+    """Колонка окладов в int64: за пределами 0..MAX_BASE_SALARY суммы в копейках переполнили бы int64"""
+    try:
+        base_salary = np.asarray(values).astype(np.int64)
+    except OverflowError:
+        base_salary = None
+    if base_salary is None or len(base_salary) and (base_salary.min() < 0 or base_salary.max() > MAX_BASE_SALARY):
+        raise ValueError(f"Оклад должен быть от 0 до {MAX_BASE_SALARY}.")
+    return base_salary
+
+
+def _small_counts(values, field: str) -> np.ndarray:
+    """Колонка дней или смен в uint8"""
+    array = np.asarray(values).astype(np.int64)
+    if array.size and (array.min() < 0 or array.max() > 255):
+        raise ValueError(f"Некорректное значение поля {field}, ожидается число от 0 до 255.")
+    return array.astype(np.uint8)
+
+
+# Типы колонок EmployeeBatch в порядке __slots__
+_COLUMN_DTYPES = (np.int64, np.uint8, np.uint8, np.uint8, np.uint8, np.uint8, np.uint16, np.uint16, np.uint16)
+
+
+class EmployeeBatch:
+    """Входные данные пакета сотрудников в типизированных массивах numpy.
+
+    Оклад - int64 (целые рубли, как после проверки ввода), месяц - номер uint8,
+    дни и смены - uint8, год - uint16. Дети и алименты хранятся номером uint16
+    в таблице различных кортежей пакета. Около 19 байт на сотрудника.
+    Оклад не больше MAX_BASE_SALARY (иначе ValueError): с этой границей промежуточные
+    суммы calculate_batch в копейках не выходят за int64.
+    Срезы возвращают представления массивов без копирования.
+    """
+
+    __slots__ = (
+        "base_salary", "month", "sum_days", "night_shifts", "evening_shifts", "temperature_work",
+        "children", "alimony", "year", "children_table", "alimony_table",
+    )
+
+    def __init__(self, base_salary, month, sum_days, night_shifts, evening_shifts, temperature_work,
+                 children, alimony, year, children_table: tuple, alimony_table: tuple):
+        self.base_salary = base_salary
+        self.month = month  # Номер месяца (0 - январь)
+        self.sum_days = sum_days
+        self.night_shifts = night_shifts
+        self.evening_shifts = evening_shifts
+        self.temperature_work = temperature_work
+        self.children = children  # Номер кортежа номеров детей в children_table
+        self.alimony = alimony  # Номер кортежа процентов алиментов в alimony_table
+        self.year = year
+        self.children_table = children_table
+        self.alimony_table = alimony_table
+
+    @classmethod
+    def from_columns(cls, columns) -> "EmployeeBatch":
+        """Пакет из словаря колонок BATCH_FIELDS (строки в формате BaseSalary или числа)"""
+        children_table, children = _encode_numbers(columns["children"])
+        alimony_table, alimony = _encode_numbers(columns["alimony"])
+        base_salary = _base_salaries(columns["base_salary"])
+        return cls(
+            base_salary,
+            month_indexes(columns["month"]).astype(np.uint8),
+            _small_counts(columns["sum_days"], "sum_days"),
+            _small_counts(columns["night_shifts"], "night_shifts"),
+            _small_counts(columns["evening_shifts"], "evening_shifts"),
+            _small_counts(columns["temperature_work"], "temperature_work"),
+            children,
+            alimony,
+            year_values(columns, len(base_salary)).astype(np.uint16),
+            children_table,
+            alimony_table,
+        )
+
+    @classmethod
+    def from_rows(cls, rows) -> "EmployeeBatch":
+        """Пакет из строк-словарей с полями BATCH_FIELDS (например, csv.DictReader).
+
+        Пустой или отсутствующий год - год по умолчанию календаря.
+        """
+        columns = {field: [] for field in BATCH_FIELDS}
+        default_year = production_calendar.default_year()
+        for row in rows:
+            for field in BATCH_FIELDS[:-1]:
+                columns[field].append(row[field].strip())
+            columns["year"].append((row.get("year") or "").strip() or default_year)
+        return cls.from_columns(columns)
+
+    @classmethod
+    def from_csv(cls, file, delimiter: str = ",") -> "EmployeeBatch":
+        """Пакет из CSV с заголовком из имен полей BATCH_FIELDS"""
+        return cls.from_rows(csv.DictReader(file, delimiter=delimiter))
+
+    @classmethod
+    def from_salaries(cls, salaries) -> "EmployeeBatch":
+        """Пакет из проверенных BaseSalary (значения уже разобраны при вводе)"""
+        salaries = list(salaries)
+        columns = {field: [salary.value(field) for salary in salaries] for field in BATCH_FIELDS}
+        return cls.from_columns(columns)
+
+    def __len__(self) -> int:
+        return len(self.base_salary)
+
+    def __getitem__(self, index):
+        """Срез - пакет с представлениями массивов, номер строки - SalaryRecord"""
+        if isinstance(index, slice):
+            return EmployeeBatch(
+                *(getattr(self, name)[index] for name in self.__slots__[:9]),
+                self.children_table,
+                self.alimony_table,
+            )
+        return SalaryRecord(
+            base_salary=int(self.base_salary[index]),
+            month=_MONTHS[self.month[index]],
+            sum_days=int(self.sum_days[index]),
+            night_shifts=int(self.night_shifts[index]),
+            evening_shifts=int(self.evening_shifts[index]),
+            temperature_work=int(self.temperature_work[index]),
+            children=self.children_table[self.children[index]],
+            alimony=self.alimony_table[self.alimony[index]],
+            year=int(self.year[index]),
+        )
+
+    def chunks(self, size: int):
+        """Последовательные части пакета не длиннее size строк"""
+        for start in range(0, len(self), size):
+            yield self[start:start + size]
+
+    @property
+    def nbytes(self) -> int:
+        """Память массивов пакета в байтах (без таблиц детей и алиментов)"""
+        return sum(getattr(self, name).nbytes for name in self.__slots__[:9])
+
+    def to_columns(self) -> dict:
+        """Словарь строковых колонок BATCH_FIELDS в формате BaseSalary"""
+        children = [",".join(map(str, value)) for value in self.children_table]
+        alimony = [",".join(map(str, value)) for value in self.alimony_table]
+        return {
+            "base_salary": self.base_salary.astype(str).tolist(),
+            "month": [_MONTHS[index] for index in self.month],
+            "sum_days": self.sum_days.astype(str).tolist(),
+            "night_shifts": self.night_shifts.astype(str).tolist(),
+            "evening_shifts": self.evening_shifts.astype(str).tolist(),
+            "temperature_work": self.temperature_work.astype(str).tolist(),
+            "children": [children[code] for code in self.children],
+            "alimony": [alimony[code] for code in self.alimony],
+            "year": self.year.astype(str).tolist(),
+        }
+
+    def to_salaries(self) -> list[BaseSalary]:
+        """Список BaseSalary по строкам пакета"""
+        columns = self.to_columns()
+        return [
+            BaseSalary(**{f"_{field}": values[row] for field, values in columns.items()}) for row in range(len(self))
+        ]
+
+    def to_records(self) -> list[SalaryRecord]:
+        return [self[row] for row in range(len(self))]
+
+    def to_buffers(self) -> tuple[tuple[bytes, ...], tuple, tuple]:
+        """Колонки байтами и таблицы детей и алиментов - для передачи в другой процесс"""
+        columns = tuple(
+            np.ascontiguousarray(getattr(self, name), dtype).tobytes()
+            for name, dtype in zip(self.__slots__, _COLUMN_DTYPES)
+        )
+        return columns, self.children_table, self.alimony_table
+
+    @classmethod
+    def from_buffers(cls, columns: tuple[bytes, ...], children_table: tuple, alimony_table: tuple) -> "EmployeeBatch":
+        """Пакет из результата to_buffers (массивы только для чтения, без копирования байтов)"""
+        return cls(
+            *(np.frombuffer(data, dtype) for data, dtype in zip(columns, _COLUMN_DTYPES)),
+            children_table,
+            alimony_table,
+        )
+
+
+def as_batch(columns) -> EmployeeBatch:
+    """EmployeeBatch без изменений, словарь колонок - через EmployeeBatch.from_columns"""
+    return columns if isinstance(columns, EmployeeBatch) else EmployeeBatch.from_columns(columns)
+
+
+@lru_cache(maxsize=None)
+def _year_norms(year: int) -> tuple[np.ndarray, np.ndarray]:
+    """Норма выходов и норма часов * 10 по номеру месяца года"""
+    days, hours = kopecks.month_norms(year)
+    return np.array(days, dtype=np.int64), np.array(hours, dtype=np.int64)
+
+
+def year_values(columns, rows: int) -> np.ndarray:
+    """Год расчета по строкам (без колонки year - год по умолчанию календаря)"""
+    if columns.get("year") is None:
+        return np.full(rows, production_calendar.default_year(), dtype=np.int64)
+    return np.asarray(columns["year"]).astype(np.int64)
+
+
+def _norms(years: np.ndarray, month_index: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Нормы выходов и часов * 10 по строкам: таблица [год, месяц] из календарей лет пакета"""
+    unique, year_index = np.unique(years, return_inverse=True)
+    if not len(unique):
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    tables = [_year_norms(int(year)) for year in unique]
+    norm_days = np.stack([days for days, _ in tables])[year_index, month_index]
+    norm_hours = np.stack([hours for _, hours in tables])[year_index, month_index]
+    return norm_days, norm_hours
+
+
+def calculate_base_month(columns, month_index=None) -> np.ndarray:
+    """Доплата за переработку (оклад по рабочим дням минус оклад) в копейках.
+
+    Считает только оклад по рабочим дням, без остальных составляющих calculate_batch.
+    columns - EmployeeBatch или словарь колонок (достаточно base_salary, month, sum_days и year).
+    """
+    if isinstance(columns, EmployeeBatch):
+        base = columns.base_salary
+        sum_days = columns.sum_days.astype(np.int64)
+        month_index = columns.month.astype(np.intp)
+        years = columns.year.astype(np.int64)
+    else:
+        base = _base_salaries(columns["base_salary"])
+        sum_days = np.asarray(columns["sum_days"]).astype(np.int64)
+        if month_index is None:
+            month_index = month_indexes(columns["month"])
+        years = year_values(columns, len(base))
+    norm_days, _ = _norms(years, month_index)
+    return _round_half_up(base * sum_days * 100, norm_days) - base * 100
+
+
+def calculate_batch(batch, prior_income=None) -> dict:
+    """Расчет всех составляющих зарплаты для пакета сотрудников.
+
+    Принимает EmployeeBatch (или словарь колонок BATCH_FIELDS в формате BaseSalary)
+    и возвращает словарь массивов int64 в копейках по BATCH_COMPONENTS.
+    prior_income - начисления с начала года до месяца расчета в копейках (по умолчанию 0).
+    Округление совпадает с ROUND_HALF_UP покомпонентного расчета до копейки
+    для окладов до MAX_BASE_SALARY (граница проверяется при создании пакета).
+    """
+    batch = as_batch(batch)
+    base = batch.base_salary.astype(np.int64)
+    sum_days = batch.sum_days.astype(np.int64)
+    night_days = batch.night_shifts.astype(np.int64)
+    evening_days = batch.evening_shifts.astype(np.int64)
+    temperature_days = batch.temperature_work.astype(np.int64)
+
+    month_index = batch.month.astype(np.intp)
+    years = batch.year.astype(np.int64)
+    norm_days, norm_hours = _norms(years, month_index)
+
+    # Оклад по рабочим дням
+    base_salary = _round_half_up(base * sum_days * 100, norm_days)
+
+    # Доплата за ночное время: оплата ночных часов округляется отдельно,
+    # вечерние часы входят в сумму без округления
+    night_numerator = base * night_days * kopecks.NIGHT_HOURS_X10 * 100
+    night_payment = _round_half_up(night_numerator, norm_hours)
+    total_night = night_payment * norm_hours + base * evening_days * kopecks.EVENING_HOURS_X10 * 100
+    night_shifts = _round_half_up(total_night * kopecks.NIGHT_PAY_PERCENT, 100 * norm_hours)
+    night_ties = kopecks.is_tie(night_numerator, norm_hours) | kopecks.is_tie(
+        total_night * kopecks.NIGHT_PAY_PERCENT, 100 * norm_hours
+    )
+
+    # Доплата за температуру
+    temperature_numerator = base * temperature_days * kopecks.TEMPERATURE_HOURS_X10 * 100
+    without_interest = _round_half_up(temperature_numerator, norm_hours)
+    temperature_ties = kopecks.is_tie(temperature_numerator, norm_hours)
+
+    working_in_temperature = _round_half_up(
+        without_interest * kopecks.TEMPERATURE_PERCENT, 100
+    )
+
+    # Строки с точной серединой пересчитываются через Decimal, так как
+    # почасовая ставка в Decimal округлена до 28 знаков
+    for row in np.flatnonzero(night_ties):
+        night_shifts[row] = kopecks.to_kopecks(calculations.calculation_night_shifts(
+            Decimal(int(base[row])), _MONTHS[month_index[row]],
+            Decimal(int(night_days[row])), Decimal(int(evening_days[row])), int(years[row]),
+        ))
+    for row in np.flatnonzero(temperature_ties):
+        working_in_temperature[row] = kopecks.to_kopecks(calculations.calculation_working_in_temperature(
+            Decimal(int(base[row])), _MONTHS[month_index[row]], Decimal(int(temperature_days[row])),
+            int(years[row]),
+        ))
+
+    underground = _round_half_up(base_salary * kopecks.UNDERGROUND_PERCENT, 100)
+    bonus = _round_half_up(
+        (base_salary + underground + night_shifts) * kopecks.BONUS_PERCENT, 100
+    )
+    base_amount = base_salary + bonus + underground + night_shifts + working_in_temperature
+    district_allowance = _round_half_up(base_amount * kopecks.DISTRICT_PERCENT, 100)
+    north_allowance = _round_half_up(base_amount * kopecks.NORTH_PERCENT, 100)
+    total_accruals = (
+        bonus + underground + base_salary + night_shifts
+        + district_allowance + north_allowance + working_in_temperature
+    )
+
+    # Вычет на детей зависит от номеров детей и дохода с начала года
+    deductions = np.array([kopecks.children_deduction(children) for children in batch.children_table], dtype=np.int64)
+    deduction_for_children = deductions[batch.children]
+    if prior_income is not None:
+        income = np.asarray(prior_income, dtype=np.int64) + total_accruals
+    else:
+        income = total_accruals
+    deduction_for_children[income > kopecks.DEDUCTION_INCOME_LIMIT] = 0
+    withholding_tax = (
+        _round_half_up(total_accruals * kopecks.TAX_PERCENT, 100) - deduction_for_children
+    )
+
+    # Алименты от суммы за вычетом НДФЛ (без детей не удерживаются, как в calculation_alimony)
+    alimony_values = [kopecks.alimony_twelfths(alimony) for alimony in batch.alimony_table]
+    has_children = np.array([bool(children) for children in batch.children_table], dtype=bool)[batch.children]
+    twelfths = np.array([value[0] for value in alimony_values], dtype=np.int64)[batch.alimony] * has_children
+    inexact = np.array([value[1] for value in alimony_values], dtype=bool)[batch.alimony] & has_children
+    net_salary = total_accruals - withholding_tax
+    alimony = _round_half_up(net_salary * twelfths, 12)
+    for row in np.flatnonzero(inexact & kopecks.is_tie(net_salary * twelfths, 12)):
+        net_amount = Decimal(int(net_salary[row])).scaleb(-2)
+        alimony[row] = kopecks.to_kopecks(
+            (net_amount * calculations.alimony_rate(batch.alimony_table[batch.alimony[row]])).quantize(
+                calculations.CENTS, rounding=ROUND_HALF_UP
+            )
+        )
+
+    return {
+        "base_salary": base_salary,
+        "night_shifts": night_shifts,
+        "underground": underground,
+        "bonus": bonus,
+        "working_in_temperature": working_in_temperature,
+        "base": base_amount,
+        "district_allowance": district_allowance,
+        "north_allowance": north_allowance,
+        "total_accruals": total_accruals,
+        "deduction_for_children": deduction_for_children,
+        "withholding_tax": withholding_tax,
+        "alimony": alimony,
+        "answer": net_salary - alimony,
+        "base_month": base_salary - base * 100,
+    }
+
+
+def to_decimal(kopecks) -> list[Decimal]:
+    """Перевод массива копеек в список Decimal с двумя знаками"""
+    return [Decimal(int(value)).scaleb(-2) for value in kopecks]
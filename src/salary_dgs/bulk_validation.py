@@ -0,0 +1,131 @@
+from typing import Iterable, Iterator, Mapping, NamedTuple
+
+from salary_dgs.batch import BATCH_FIELDS
+from salary_dgs.constant import MONTHS_IN_YEAR
+from salary_dgs.production_calendar import default_year
+from salary_dgs.validate_dekarators import (
+    check_alimony,
+    check_base_salary,
+    check_children,
+    check_evening_shifts,
+    check_month,
+    check_night_shifts,
+    check_sum_days,
+    check_temperature_work,
+    check_year,
+)
+
+
+class FieldError(NamedTuple):
+    """Ошибка поля строки (сообщение то же, что при вводе в боте)"""
+    row: int
+    field: str
+    value: str
+    message: str
+
+
+class RowResult(NamedTuple):
+    row: int
+    values: dict  # Поля BATCH_FIELDS в виде, в котором их хранит BaseSalary (если ошибок нет)
+    errors: list[FieldError]
+
+
+def validate_row(row: Mapping[str, str], index: int = 0) -> RowResult:
+    """Проверка всех полей строки со сбором всех ошибок.
+
+    Перекрестные правила (смены и температура не больше общего количества дней)
+    проверяются, только если поля, с которыми идет сравнение, сами корректны.
+    Пустой или отсутствующий год - год по умолчанию календаря.
+    """
+    values = {}
+    errors = []
+
+    def check(field: str, function, *args):
+        text = (row.get(field) or "").strip()
+        try:
+            return function(text, *args)
+        except ValueError as e:
+            errors.append(FieldError(index, field, text, str(e)))
+            return None
+
+    values["base_salary"] = check("base_salary", check_base_salary)
+    month = check("month", check_month, MONTHS_IN_YEAR)
+    values["month"] = None if month is None else month.lower()
+    sum_days = check("sum_days", check_sum_days)
+    values["sum_days"] = sum_days
+    sum_days = None if sum_days is None else int(sum_days)
+    night_shifts = check("night_shifts", check_night_shifts, sum_days)
+    values["night_shifts"] = night_shifts
+    night_shifts = None if night_shifts is None else int(night_shifts)
+    values["evening_shifts"] = check("evening_shifts", check_evening_shifts, sum_days, night_shifts)
+    values["temperature_work"] = check("temperature_work", check_temperature_work, sum_days)
+    values["children"] = check("children", check_children)
+    values["alimony"] = check("alimony", check_alimony)
+    if (row.get("year") or "").strip():
+        values["year"] = check("year", check_year)
+    else:
+        values["year"] = str(default_year())
+    return RowResult(index, values, errors)
+
+
+def iter_validated(rows: Iterable[Mapping[str, str]], start: int = 0) -> Iterator[RowResult]:
+    """Потоковая проверка строк: по одному результату на строку, без накопления"""
+    for index, row in enumerate(rows, start):
+        yield validate_row(row, index)
+
+
+class ValidationReport:
+    """Сводка проверки: счетчики по полям и первые max_errors ошибок (память не растет с размером входа)"""
+
+    __slots__ = ("rows", "invalid_rows", "field_errors", "errors", "max_errors")
+
+    def __init__(self, max_errors: int = 100):
+        self.rows = 0
+        self.invalid_rows = 0
+        self.field_errors = dict.fromkeys(BATCH_FIELDS, 0)  # Поле -> число ошибок
+        self.errors = []  # Первые ошибки по порядку строк
+        self.max_errors = max_errors
+
+    def add(self, result: RowResult):
+        self.rows += 1
+        if not result.errors:
+            return
+        self.invalid_rows += 1
+        for error in result.errors:
+            self.field_errors[error.field] += 1
+        self.errors.extend(result.errors[:self.max_errors - len(self.errors)])
+
+    def add_failed(self, errors: list[FieldError]):
+        """Строки, прошедшие проверку, но не посчитанные (ошибка расчета пакета)"""
+        self.invalid_rows += len({error.row for error in errors})
+        self.errors.extend(errors[:self.max_errors - len(self.errors)])
+
+    @property
+    def valid_rows(self) -> int:
+        return self.rows - self.invalid_rows
+
+    def summary(self) -> str:
+        """Текстовый отчет: итог, ошибки по полям и первые ошибки"""
+        lines = [f"Проверено строк: {self.rows}, без ошибок: {self.valid_rows}, с ошибками: {self.invalid_rows}"]
+        lines += [f"{field}: {count}" for field, count in self.field_errors.items() if count]
+        lines += [
+            f"строка {error.row}, {error.field} ({error.value}): {error.message}".replace("\n", " ")
+            for error in self.errors
+        ]
+        return "\n".join(lines)
+
+
+def validate_rows(rows: Iterable[Mapping[str, str]], max_errors: int = 100, start: int = 0) -> ValidationReport:
+    """Проверка всех строк за один проход со сводкой ошибок"""
+    report = ValidationReport(max_errors)
+    for result in iter_validated(rows, start):
+        report.add(result)
+    return report
+
+
+def valid_rows(rows: Iterable[Mapping[str, str]], report: ValidationReport, start: int = 0) -> Iterator[dict]:
+    """Значения строк без ошибок; ошибки остальных строк попадают в report"""
+    for result in iter_validated(rows, start):
+        report.add(result)
+        if not result.errors:
+            yield result.values
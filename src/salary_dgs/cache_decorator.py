@@ -1,10 +1,83 @@
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from salary_dgs.rates import RATES
+
+
+class ResultCache:
+    """Общий для процесса кеш результатов расчета с вытеснением LRU и сроком жизни TTL"""
+
+    def __init__(self, maxsize: int = 4096, ttl: float = 3600.0, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return default
+            expires, value = item
+            if expires < self.clock():
+                del self._data[key]
+                self.evictions += 1
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (self.clock() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        """Счетчики попаданий, промахов и вытеснений"""
+        return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+        }
+
+
+result_cache = ResultCache()
+
+_MISSING = object()
+
+
 def cache_result(method):
-    """Универсальный декоратор кеша для методов расчета"""
-    async def wrapper(self, *args, **kwargs):
-        key = method.__name__
-        if key in self._cache:
-            return self._cache[key]
-        result = await method(self, *args, **kwargs)
-        self._cache[key] = result
+    """Универсальный декоратор кеша для методов расчета.
+
+    Ключ - версия таблицы ставок, способ расчета (backend_name), имя метода
+    и нормализованные входные данные (BaseSalary.cache_key), поэтому результат
+    общий для всех экземпляров CalculationBaseSalary с одинаковым вводом и способом.
+    """
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        key = (RATES.version, self.backend_name, method.__name__, self.salary_data.cache_key())
+        result = result_cache.get(key, _MISSING)
+        if result is _MISSING:
+            result = method(self, *args, **kwargs)
+            result_cache.set(key, result)
         return result
+
     return wrapper
@@ -0,0 +1,385 @@
+from decimal import Decimal, ROUND_HALF_UP
+from functools import lru_cache
+from time import perf_counter
+from typing import Callable, NamedTuple
+
+from salary_dgs.models import SalaryBreakdown, SalaryRecord
+from salary_dgs.rates import RATES
+
+QUARTER_TO_PAYMENT = {
+        "январь": "апреле текущего года",
+        "февраль": "апреле текущего года",
+        "март": "апреле текущего года",
+        "апрель": "июле текущего года",
+        "май": "июле текущего года",
+        "июнь": "июле текущего года",
+        "июль": "октябре текущего года",
+        "август": "октябре текущего года",
+        "сентябрь": "октябре текущего года",
+        "октябрь": "январе следующего года",
+        "ноябрь": "январе следующего года",
+        "декабрь": "январе следующего года"
+}
+
+ALIMONY_RATES = {
+        16: Decimal('1') / Decimal('6'),  # 1/6 ≈ 16.67%
+        25: Decimal('1') / Decimal('4'),  # 25%
+        33: Decimal('1') / Decimal('3'),  # ≈33.33%
+        50: Decimal('1') / Decimal('2')  # 50%
+}
+
+CENTS = Decimal("0.01")
+
+
+def salary_inputs(salary_data) -> dict:
+    """Значения для расчета из записи с уже разобранным вводом (как в геттерах GetDataSalary)"""
+    record = salary_data if isinstance(salary_data, SalaryRecord) else salary_data.to_record()
+    return {
+            "base_salary": Decimal(record.base_salary),
+            "month": record.month,
+            "sum_days": Decimal(record.sum_days).quantize(CENTS),
+            "night_shifts": Decimal(record.night_shifts).quantize(CENTS),
+            "evening_shifts": Decimal(record.evening_shifts).quantize(CENTS),
+            "temperature_work": Decimal(record.temperature_work).quantize(CENTS),
+            "children": record.children,
+            "alimony": record.alimony,
+            "prior_income": Decimal("0.00"),
+            "year": record.year,
+    }
+
+
+def calculation_base_salary(base_salary: Decimal, month: str, sum_days: Decimal, year: int = None) -> Decimal:
+    """Расчет оклада по рабочим дням"""
+    normal_days_in_month = RATES.month_rates(year, month).days_norm  # Норма выходов в месяце расчета
+    return (base_salary * sum_days / normal_days_in_month).quantize(CENTS, rounding=ROUND_HALF_UP)
+
+
+def calculation_night_shifts(
+        base_salary: Decimal, month: str, night_shifts: Decimal, evening_shifts: Decimal, year: int = None
+) -> Decimal:
+    """Расчет доплаты за работу в ночное время"""
+    hourly_rate = base_salary / RATES.month_rates(year, month).hours_norm
+
+    night_payment = (
+        hourly_rate * (night_shifts * RATES.night_hours_per_shift) if night_shifts else Decimal("0.00")
+    ).quantize(CENTS, rounding=ROUND_HALF_UP)
+    evening_payment = (
+        hourly_rate * (evening_shifts * RATES.evening_hours_per_shift) if evening_shifts else Decimal("0.00")
+    )
+
+    total_payment = (night_payment + evening_payment) * RATES.night_pay_percent / 100
+    return total_payment.quantize(CENTS, rounding=ROUND_HALF_UP)
+
+
+def calculation_underground(base_salary_amount: Decimal) -> Decimal:
+    """Расчет надбавки за работу в подземных условиях"""
+    return (base_salary_amount * RATES.underground_percent / 100).quantize(CENTS, rounding=ROUND_HALF_UP)
+
+
+def calculation_bonus(base_salary_amount: Decimal, underground: Decimal, night_shifts_amount: Decimal) -> Decimal:
+    """Расчет премии"""
+    total_amount = base_salary_amount + underground + night_shifts_amount
+    return (total_amount * RATES.bonus_percent / 100).quantize(CENTS, rounding=ROUND_HALF_UP)
+
+
+def calculation_working_in_temperature(
+        base_salary: Decimal, month: str, temperature_work: Decimal, year: int = None
+) -> Decimal:
+    """Расчет надбавки за работу в условиях повышенной температуры"""
+    converted_days_in_hours = temperature_work * RATES.temperature_hours_per_shift  # Конвертация дней в часы
+    pay_per_hour = base_salary / RATES.month_rates(year, month).hours_norm
+    without_interest = (converted_days_in_hours * pay_per_hour).quantize(CENTS, rounding=ROUND_HALF_UP)
+
+    return (without_interest * RATES.temperature_percent / 100).quantize(CENTS, rounding=ROUND_HALF_UP)
+
+
+def calculation_base(
+        base_salary_amount: Decimal,
+        bonus: Decimal,
+        underground: Decimal,
+        night_shifts_amount: Decimal,
+        working_in_temperature: Decimal,
+) -> Decimal:
+    """Расчет базовой суммы"""
+    return (
+        base_salary_amount + bonus + underground + night_shifts_amount + working_in_temperature
+    ).quantize(CENTS, rounding=ROUND_HALF_UP)
+
+
+def calculation_district_allowance(base: Decimal) -> Decimal:
+    """Расчет районной надбавки"""
+    return (base * RATES.district_percent / 100).quantize(CENTS, rounding=ROUND_HALF_UP)
+
+
+def calculation_north_allowance(base: Decimal) -> Decimal:
+    """Расчет северной надбавки"""
+    return (base * RATES.north_percent / 100).quantize(CENTS, rounding=ROUND_HALF_UP)
+
+
+def calculation_total_accruals(
+        bonus: Decimal,
+        underground: Decimal,
+        base_salary_amount: Decimal,
+        night_shifts_amount: Decimal,
+        district_allowance: Decimal,
+        north_allowance: Decimal,
+        working_in_temperature: Decimal,
+) -> Decimal:
+    """Расчет общей суммы начислений"""
+    return (
+        bonus + underground + base_salary_amount + night_shifts_amount
+        + district_allowance + north_allowance + working_in_temperature
+    )
+
+
+@lru_cache(maxsize=None)
+def children_deduction_amount(children: tuple[int, ...]) -> Decimal:
+    """Уменьшение НДФЛ за месяц по вычету на детей без учета предельного дохода"""
+    if not children:
+        return Decimal("0.00")
+
+    deduction = Decimal("0")
+    if 1 in children:
+        deduction += Decimal("1400")
+    if 2 in children:
+        deduction += Decimal("2800")  # 2800 total for first two
+    if 3 in children:
+        deduction += Decimal("6000")  # 6000 total for first three
+
+    # Для 4го и последующих детей также +6000 каждый
+    extra_children = len([x for x in children if x >= 4])
+    deduction += extra_children * Decimal("6000")
+
+    return (deduction * RATES.tax_percent / 100).quantize(CENTS, rounding=ROUND_HALF_UP)
+
+
+def calculation_deduction_for_children(children: tuple[int, ...], total_accruals: Decimal, prior_income: Decimal) -> Decimal:
+    """Расчет налогового вычета на детей.
+
+    Вычет не предоставляется с месяца, в котором доход с начала года
+    (prior_income - начисления прошлых месяцев) превысил предельный.
+    """
+    if prior_income + total_accruals > RATES.deduction_income_limit:
+        return Decimal("0.00")
+    return children_deduction_amount(children)
+
+
+def calculation_withholding_tax(total_accruals: Decimal, deduction_for_children: Decimal) -> Decimal:
+    """Расчет подоходного налога"""
+    result = (total_accruals * RATES.tax_percent / 100).quantize(CENTS, rounding=ROUND_HALF_UP)
+    if deduction_for_children == Decimal("0.00"):
+        return result
+    return result - deduction_for_children
+
+
+@lru_cache(maxsize=None)
+def alimony_rate(alimony: tuple[int, ...]) -> Decimal:
+    """Общая доля алиментов по введенным процентам"""
+    total_deduction = Decimal('0.00')
+    for rate in alimony:
+        if rate in ALIMONY_RATES:
+            total_deduction += ALIMONY_RATES[rate]
+    return total_deduction
+
+
+def calculation_alimony(total_accruals: Decimal, withholding_tax: Decimal, alimony: tuple[int, ...], children: tuple[int, ...]) -> Decimal:
+    """Расчет алиментов на детей от суммы за вычетом НДФЛ"""
+    if not children:
+        return Decimal("0.00")
+
+    net_salary = total_accruals - withholding_tax
+    return (net_salary * alimony_rate(alimony)).quantize(CENTS, rounding=ROUND_HALF_UP)
+
+
+def calculation_answer(total_accruals: Decimal, withholding_tax: Decimal, alimony: Decimal) -> Decimal:
+    """Формирование итоговой суммы"""
+    return total_accruals - withholding_tax - alimony
+
+
+def calculation_base_month(base_salary_amount: Decimal, base_salary: Decimal) -> Decimal:
+    """Расчет квартальной доплаты за переработку"""
+    return (base_salary_amount - base_salary).quantize(CENTS, rounding=ROUND_HALF_UP)
+
+
+def month_quarter_payment_calculation(month: str) -> str:
+    """Определяет месяц выплаты за переработку (в конце квартала)"""
+    return QUARTER_TO_PAYMENT.get(month, "неизвестный месяц")
+
+
+class Node(NamedTuple):
+    """Шаг расчета: имя, функция, имена входов и ключ в итоговом словаре"""
+    name: str
+    function: Callable
+    inputs: tuple
+    key: str
+
+
+# Входные данные расчета (совпадают с ключами salary_inputs)
+INPUTS = (
+        "base_salary",
+        "month",
+        "sum_days",
+        "night_shifts",
+        "evening_shifts",
+        "temperature_work",
+        "children",
+        "alimony",
+        "prior_income",
+        "year",
+)
+
+# Граф расчета: каждый шаг объявляет, от каких входов и шагов он зависит
+GRAPH = (
+        Node("calculation_base_salary", calculation_base_salary,
+             ("base_salary", "month", "sum_days", "year"), "base_salary"),
+        Node("calculation_night_shifts", calculation_night_shifts,
+             ("base_salary", "month", "night_shifts", "evening_shifts", "year"), "night_shifts"),
+        Node("calculation_underground", calculation_underground,
+             ("calculation_base_salary",), "underground"),
+        Node("calculation_bonus", calculation_bonus,
+             ("calculation_base_salary", "calculation_underground", "calculation_night_shifts"), "bonus"),
+        Node("calculation_working_in_temperature", calculation_working_in_temperature,
+             ("base_salary", "month", "temperature_work", "year"), "working_in_temperature"),
+        Node("calculation_base", calculation_base,
+             ("calculation_base_salary", "calculation_bonus", "calculation_underground",
+              "calculation_night_shifts", "calculation_working_in_temperature"), "base"),
+        Node("calculation_district_allowance", calculation_district_allowance,
+             ("calculation_base",), "district_allowance"),
+        Node("calculation_north_allowance", calculation_north_allowance,
+             ("calculation_base",), "north_allowance"),
+        Node("calculation_total_accruals", calculation_total_accruals,
+             ("calculation_bonus", "calculation_underground", "calculation_base_salary",
+              "calculation_night_shifts", "calculation_district_allowance",
+              "calculation_north_allowance", "calculation_working_in_temperature"), "total_accruals"),
+        Node("calculation_deduction_for_children", calculation_deduction_for_children,
+             ("children", "calculation_total_accruals", "prior_income"), "deduction_for_children"),
+        Node("calculation_withholding_tax", calculation_withholding_tax,
+             ("calculation_total_accruals", "calculation_deduction_for_children"), "withholding_tax"),
+        Node("calculation_alimony", calculation_alimony,
+             ("calculation_total_accruals", "calculation_withholding_tax", "alimony", "children"), "alimony"),
+        Node("calculation_answer", calculation_answer,
+             ("calculation_total_accruals", "calculation_withholding_tax", "calculation_alimony"), "answer"),
+        Node("calculation_base_month", calculation_base_month,
+             ("calculation_base_salary", "base_salary"), "base_month"),
+        Node("month_quarter_payment_calculation", month_quarter_payment_calculation,
+             ("month",), "month_quarter_payment"),
+)
+
+NODES = {node.name: node for node in GRAPH}
+
+
+@lru_cache(maxsize=None)
+def compile_plan(outputs: tuple) -> tuple:
+    """Плоский порядок вычисления шагов, нужных для запрошенных результатов"""
+    plan = []
+    done = set(INPUTS)
+    visiting = set()
+
+    def visit(name):
+        if name in done:
+            return
+        if name not in NODES:
+            raise ValueError(f"Неизвестный шаг расчета ({name}).")
+        if name in visiting:
+            raise ValueError(f"Циклическая зависимость в шаге расчета ({name}).")
+        visiting.add(name)
+        node = NODES[name]
+        for dependency in node.inputs:
+            visit(dependency)
+        visiting.discard(name)
+        done.add(name)
+        plan.append(node)
+
+    for output in outputs:
+        visit(output)
+    return tuple(plan)
+
+
+FULL_PLAN = compile_plan(tuple(NODES))
+
+# Наблюдатель времени шагов (salary_dgs.metrics): observer(имя шага, секунды), None - без замеров
+step_observer = None
+
+
+def _run(plan: tuple, values: dict):
+    """Вычисление шагов плана в словаре значений"""
+    observer = step_observer
+    if observer is None:
+        for node in plan:
+            values[node.name] = node.function(*[values[name] for name in node.inputs])
+        return
+    for node in plan:
+        started = perf_counter()
+        values[node.name] = node.function(*[values[name] for name in node.inputs])
+        observer(node.name, perf_counter() - started)
+
+
+def evaluate(inputs: dict, outputs=None) -> dict:
+    """Вычисление запрошенных шагов графа, каждый шаг ровно один раз.
+
+    Без outputs считаются все шаги. Возвращает словарь по именам шагов.
+    """
+    plan = FULL_PLAN if outputs is None else compile_plan(tuple(outputs))
+    values = dict(inputs)
+    _run(plan, values)
+    names = NODES if outputs is None else outputs
+    return {name: values[name] for name in names}
+
+
+@lru_cache(maxsize=None)
+def compile_update_plan(changed: frozenset) -> tuple:
+    """Шаги, зависящие от измененных входов, в порядке вычисления"""
+    affected = set(changed)
+    plan = []
+    for node in FULL_PLAN:
+        if affected.intersection(node.inputs):
+            affected.add(node.name)
+            plan.append(node)
+    return tuple(plan)
+
+
+def reevaluate(values: dict, changes: dict) -> dict:
+    """Пересчет по готовым значениям (входы и шаги): заново считаются только шаги,
+    зависящие от измененных входов. Возвращает новый словарь значений.
+    """
+    values = dict(values)
+    values.update(changes)
+    _run(compile_update_plan(frozenset(changes)), values)
+    return values
+
+
+def calculate(
+        base_salary: Decimal,
+        month: str,
+        sum_days: Decimal,
+        night_shifts: Decimal,
+        evening_shifts: Decimal,
+        temperature_work: Decimal,
+        children: tuple[int, ...],
+        alimony: tuple[int, ...],
+        prior_income: Decimal = Decimal("0.00"),
+        year: int = None,
+) -> dict:
+    """Полный расчет зарплаты за один вызов без побочных эффектов.
+
+    prior_income - начисления с начала года до месяца расчета (для предельного дохода по вычету).
+    year - год производственного календаря (по умолчанию - текущий, если для него есть данные).
+    """
+    values = evaluate({
+            "base_salary": base_salary,
+            "month": month,
+            "sum_days": sum_days,
+            "night_shifts": night_shifts,
+            "evening_shifts": evening_shifts,
+            "temperature_work": temperature_work,
+            "children": children,
+            "alimony": alimony,
+            "prior_income": prior_income,
+            "year": year,
+    })
+    return {NODES[name].key: value for name, value in values.items()}
+
+
+def calculate_breakdown(salary_data, prior_income: Decimal = Decimal("0.00")) -> SalaryBreakdown:
+    """Полный расчет по введенным данным в виде неизменяемой записи"""
+    return SalaryBreakdown(**calculate(**dict(salary_inputs(salary_data), prior_income=prior_income)))
@@ -1,32 +1,28 @@
-MONTHS_IN_YEAR_DAYS = {
-    "январь": "17",
-    "февраль": "20",
-    "март": "21",
-    "апрель": "22",
-    "май": "18",
-    "июнь": "19",
-    "июль": "23",
-    "август": "21",
-    "сентябрь": "22",
-    "октябрь": "23",
-    "ноябрь": "19",
-    "декабрь": "22",
-}
+MONTHS_IN_YEAR = (
+    "январь",
+    "февраль",
+    "март",
+    "апрель",
+    "май",
+    "июнь",
+    "июль",
+    "август",
+    "сентябрь",
+    "октябрь",
+    "ноябрь",
+    "декабрь",
+)
 
-MONTHS_IN_YEAR_HOURS = {
-    "январь": "122.4",
-    "февраль": "144.0",
-    "март": "150.2",
-    "апрель": "157.4",
-    "май": "129.6",
-    "июнь": "135.8",
-    "июль": "165.6",
-    "август": "151.2",
-    "сентябрь": "158.4",
-    "октябрь": "165.6",
-    "ноябрь": "135.8",
-    "декабрь": "158.4",
-}
+# Наибольший оклад, руб.: промежуточные суммы пакетного расчета в копейках (int64)
+# остаются в пределах типа с запасом на всех допустимых сменах
+MAX_BASE_SALARY = 1_000_000_000
+
+# Продолжительность рабочей недели в часах (нормы месяцев считаются по производственному календарю)
+WORKING_HOURS_PER_WEEK = "36"
+
+# Версия таблиц норм и ставок: меняется при любом изменении значений ниже
+# или файлов производственного календаря
+RATE_TABLE_VERSION = "2025.3"
 
 FACTORS = {
     "Ночные 1 смена": "6",
@@ -38,6 +34,7 @@ FACTORS = {
     "Северная надбавка": "50",
     "Доплата за температуру": "10",
     "НДФЛ": "13",
+    "Предельный доход для вычета на детей": "450000",
 }
 
 EN_TO_RU_MONTHS = {
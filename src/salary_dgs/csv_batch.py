@@ -0,0 +1,133 @@
+import csv
+import json
+from concurrent.futures import ProcessPoolExecutor
+
+from salary_dgs import calculations
+from salary_dgs.batch import BATCH_COMPONENTS, BATCH_FIELDS, EmployeeBatch, calculate_batch
+from salary_dgs.bulk_validation import FieldError, ValidationReport, iter_validated
+from salary_dgs.parallel import calculate_parallel
+
+# Колонки результата: номер строки входа, проверенный ввод, составляющие расчета в рублях
+# (по именам методов CalculationBaseSalary) и месяц выплаты за переработку
+RESULT_FIELDS = tuple(f"calculation_{component}" for component in BATCH_COMPONENTS)
+OUTPUT_FIELDS = ("row", *BATCH_FIELDS, *RESULT_FIELDS, "month_quarter_payment")
+REJECT_FIELDS = ("row", "field", "value", "message")
+OUTPUT_FORMATS = ("csv", "jsonl")
+
+
+def amount_text(kopecks: int) -> str:
+    """Сумма в копейках строкой в рублях с двумя знаками (как str(Decimal) расчета)"""
+    sign = "-" if kopecks < 0 else ""
+    rubles, cents = divmod(abs(kopecks), 100)
+    return f"{sign}{rubles}.{cents:02d}"
+
+
+class _CsvOutput:
+    def __init__(self, file):
+        self.writer = csv.writer(file)
+        self.writer.writerow(OUTPUT_FIELDS)
+
+    def write(self, row: int, values: dict, amounts: list, payment: str):
+        self.writer.writerow((row, *values.values(), *amounts, payment))
+
+
+class _JsonlOutput:
+    """JSON Lines: суммы - числами в исходной записи (без перевода во float)"""
+
+    def __init__(self, file):
+        self.file = file
+
+    def write(self, row: int, values: dict, amounts: list, payment: str):
+        fields = [f'"row": {row}']
+        fields += [f"{json.dumps(name)}: {json.dumps(value, ensure_ascii=False)}" for name, value in values.items()]
+        fields += [f'"{name}": {amount}' for name, amount in zip(RESULT_FIELDS, amounts)]
+        fields.append(f'"month_quarter_payment": {json.dumps(payment, ensure_ascii=False)}')
+        self.file.write("{" + ", ".join(fields) + "}\n")
+
+
+def _calculate_chunk(output, rows: list, values: list, pool=None, workers: int = 1) -> list[FieldError]:
+    """Пакетный расчет накопленных строк (на пуле процессов, если он есть) и запись результата по строкам.
+
+    Ошибка расчета не прерывает поток: строки пакета не пишутся и возвращаются ошибками.
+    """
+    try:
+        batch = EmployeeBatch.from_rows(values)
+        result = calculate_batch(batch) if pool is None else calculate_parallel(batch, workers, executor=pool)
+    except Exception as e:
+        message = f"Ошибка расчета пакета: {e!r}"
+        return [FieldError(row, "", "", message) for row in rows]
+    columns = [result[component].tolist() for component in BATCH_COMPONENTS]
+    payments = {}
+    for index, (row, row_values) in enumerate(zip(rows, values)):
+        month = row_values["month"]
+        payment = payments.get(month)
+        if payment is None:
+            payment = payments[month] = calculations.month_quarter_payment_calculation(month)
+        output.write(row, row_values, [amount_text(column[index]) for column in columns], payment)
+    return []
+
+
+def stream_calculate(
+        rows,
+        output_file,
+        output_format: str = "csv",
+        rejects_file=None,
+        chunk_size: int = 10000,
+        max_errors: int = 100,
+        workers: int = 1,
+) -> ValidationReport:
+    """Потоковый расчет строк (словари полей BATCH_FIELDS, например csv.DictReader).
+
+    Строки проверяются теми же правилами, что и ввод в боте, корректные считаются
+    пакетами по chunk_size и сразу пишутся в output_file (csv или jsonl), ошибки
+    строк - в rejects_file (CSV: row, field, value, message). Если пакет не удалось
+    посчитать, его строки тоже уходят в rejects_file (с пустым field), а расчет
+    продолжается со следующего пакета. Память не зависит от размера входа.
+    Нумерация строк - с 1 без заголовка.
+    workers > 1 - каждый пакет делится между процессами пула (calculate_parallel).
+    """
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Некорректный формат ({output_format}), ожидается один из {OUTPUT_FORMATS}.")
+    output = _CsvOutput(output_file) if output_format == "csv" else _JsonlOutput(output_file)
+    rejects = None
+    if rejects_file is not None:
+        rejects = csv.writer(rejects_file)
+        rejects.writerow(REJECT_FIELDS)
+
+    report = ValidationReport(max_errors)
+
+    def failed(errors: list[FieldError]):
+        if errors:
+            report.add_failed(errors)
+            if rejects is not None:
+                rejects.writerows(errors)
+
+    pool = ProcessPoolExecutor(workers) if workers > 1 else None
+    try:
+        chunk_rows, chunk_values = [], []
+        for result in iter_validated(rows, start=1):
+            report.add(result)
+            if result.errors:
+                if rejects is not None:
+                    rejects.writerows(result.errors)
+                continue
+            chunk_rows.append(result.row)
+            chunk_values.append(result.values)
+            if len(chunk_values) >= chunk_size:
+                failed(_calculate_chunk(output, chunk_rows, chunk_values, pool, workers))
+                chunk_rows, chunk_values = [], []
+        if chunk_values:
+            failed(_calculate_chunk(output, chunk_rows, chunk_values, pool, workers))
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    return report
+
+
+def stream_csv(input_file, output_file, output_format: str = "csv", rejects_file=None,
+               chunk_size: int = 10000, delimiter: str = ",", workers: int = 1) -> ValidationReport:
+    """Потоковый расчет CSV с заголовком из имен полей BATCH_FIELDS"""
+    return stream_calculate(
+            csv.DictReader(input_file, delimiter=delimiter), output_file, output_format, rejects_file, chunk_size,
+            workers=workers,
+    )
@@ -0,0 +1,208 @@
+from decimal import Decimal, ROUND_HALF_UP
+from functools import lru_cache
+
+from salary_dgs import calculations, production_calendar
+from salary_dgs.models import SalaryBreakdown, SalaryRecord
+from salary_dgs.rates import RATES, year_rates
+
+
+def scaled(value: Decimal, scale: int = 1) -> int:
+    """Целое представление ставки value * scale (ставка должна быть точной)"""
+    result = value * scale
+    if result != result.to_integral_value():
+        raise ValueError(f"Ставка {value} не представима в целых долях 1/{scale}.")
+    return int(result)
+
+
+# Часы смен * 10 и проценты в целых числах
+NIGHT_HOURS_X10 = scaled(RATES.night_hours_per_shift, 10)
+EVENING_HOURS_X10 = scaled(RATES.evening_hours_per_shift, 10)
+TEMPERATURE_HOURS_X10 = scaled(RATES.temperature_hours_per_shift, 10)
+NIGHT_PAY_PERCENT = scaled(RATES.night_pay_percent)
+BONUS_PERCENT = scaled(RATES.bonus_percent)
+UNDERGROUND_PERCENT = scaled(RATES.underground_percent)
+DISTRICT_PERCENT = scaled(RATES.district_percent)
+NORTH_PERCENT = scaled(RATES.north_percent)
+TEMPERATURE_PERCENT = scaled(RATES.temperature_percent)
+TAX_PERCENT = scaled(RATES.tax_percent)
+DEDUCTION_INCOME_LIMIT = scaled(RATES.deduction_income_limit, 100)
+
+# Ставки алиментов в двенадцатых долях
+ALIMONY_TWELFTHS = {16: 2, 25: 3, 33: 4, 50: 6}
+# Ставки, которые Decimal представляет неточно (1/6 и 1/3)
+ALIMONY_INEXACT = {16, 33}
+
+# Составляющие расчета в копейках (ключи calculations.calculate без месяца выплаты)
+COMPONENTS = (
+    "base_salary",
+    "night_shifts",
+    "underground",
+    "bonus",
+    "working_in_temperature",
+    "base",
+    "district_allowance",
+    "north_allowance",
+    "total_accruals",
+    "deduction_for_children",
+    "withholding_tax",
+    "alimony",
+    "answer",
+    "base_month",
+)
+
+
+def round_half_up(numerator: int, denominator: int) -> int:
+    """Целочисленное деление с округлением ROUND_HALF_UP (знаменатель положительный)"""
+    if numerator >= 0:
+        return (2 * numerator + denominator) // (2 * denominator)
+    return -((denominator - 2 * numerator) // (2 * denominator))
+
+
+def is_tie(numerator: int, denominator: int) -> bool:
+    """Признак точной середины между копейками"""
+    return (2 * numerator) % (2 * denominator) == denominator
+
+
+def to_kopecks(amount: Decimal) -> int:
+    """Перевод суммы Decimal в копейки"""
+    return int(amount * 100)
+
+
+def to_amount(kopecks: int) -> Decimal:
+    """Перевод копеек в Decimal с двумя знаками"""
+    return Decimal(kopecks).scaleb(-2)
+
+
+@lru_cache(maxsize=None)
+def month_norms(year: int) -> tuple[tuple[int, ...], tuple[int, ...]]:
+    """Нормы выходов и нормы часов * 10 по номеру месяца года"""
+    rates = year_rates(year)
+    return tuple(scaled(month.days_norm) for month in rates), tuple(scaled(month.hours_norm, 10) for month in rates)
+
+
+@lru_cache(maxsize=None)
+def alimony_twelfths(alimony: tuple[int, ...]) -> tuple[int, bool]:
+    """Сумма ставок алиментов в двенадцатых и признак неточного Decimal-представления"""
+    twelfths = sum(ALIMONY_TWELFTHS.get(rate, 0) for rate in alimony)
+    return twelfths, any(rate in ALIMONY_INEXACT for rate in alimony)
+
+
+@lru_cache(maxsize=None)
+def children_deduction(children: tuple[int, ...]) -> int:
+    """Вычет на детей в копейках без учета предельного дохода"""
+    return to_kopecks(calculations.children_deduction_amount(children))
+
+
+def base_salary_kopecks(base_salary: int, month: int, sum_days: int, year: int) -> int:
+    """Оклад по рабочим дням"""
+    return round_half_up(base_salary * sum_days * 100, month_norms(year)[0][month])
+
+
+def night_shifts_kopecks(base_salary: int, month: int, night_shifts: int, evening_shifts: int, year: int) -> int:
+    """Доплата за ночное время: ночные часы округляются отдельно, вечерние входят без округления"""
+    hours = month_norms(year)[1][month]
+    night_numerator = base_salary * night_shifts * NIGHT_HOURS_X10 * 100
+    total = round_half_up(night_numerator, hours) * hours + base_salary * evening_shifts * EVENING_HOURS_X10 * 100
+    # Точная середина пересчитывается через Decimal: почасовая ставка в Decimal округлена до 28 знаков
+    if is_tie(night_numerator, hours) or is_tie(total * NIGHT_PAY_PERCENT, 100 * hours):
+        return to_kopecks(calculations.calculation_night_shifts(
+                Decimal(base_salary), RATES.months[month], Decimal(night_shifts), Decimal(evening_shifts), year,
+        ))
+    return round_half_up(total * NIGHT_PAY_PERCENT, 100 * hours)
+
+
+def temperature_kopecks(base_salary: int, month: int, temperature_work: int, year: int) -> int:
+    """Доплата за работу в температуре"""
+    hours = month_norms(year)[1][month]
+    numerator = base_salary * temperature_work * TEMPERATURE_HOURS_X10 * 100
+    if is_tie(numerator, hours):
+        return to_kopecks(calculations.calculation_working_in_temperature(
+                Decimal(base_salary), RATES.months[month], Decimal(temperature_work), year,
+        ))
+    return round_half_up(round_half_up(numerator, hours) * TEMPERATURE_PERCENT, 100)
+
+
+def alimony_kopecks(net_salary: int, alimony: tuple[int, ...], children: tuple[int, ...]) -> int:
+    """Алименты от суммы за вычетом НДФЛ"""
+    if not children:
+        return 0
+    twelfths, inexact = alimony_twelfths(alimony)
+    if inexact and is_tie(net_salary * twelfths, 12):
+        return to_kopecks((to_amount(net_salary) * calculations.alimony_rate(alimony)).quantize(
+                calculations.CENTS, rounding=ROUND_HALF_UP
+        ))
+    return round_half_up(net_salary * twelfths, 12)
+
+
+def calculate(
+        base_salary: int,
+        month: int,
+        sum_days: int,
+        night_shifts: int,
+        evening_shifts: int,
+        temperature_work: int,
+        children: tuple[int, ...],
+        alimony: tuple[int, ...],
+        prior_income: int = 0,
+        year: int = None,
+) -> dict:
+    """Полный расчет в целых копейках (оклад в рублях, month - номер месяца, 0 - январь).
+
+    Точки округления совпадают с ROUND_HALF_UP Decimal-расчета до копейки.
+    """
+    year = year or production_calendar.default_year()
+    base_salary_amount = base_salary_kopecks(base_salary, month, sum_days, year)
+    night = night_shifts_kopecks(base_salary, month, night_shifts, evening_shifts, year)
+    temperature = temperature_kopecks(base_salary, month, temperature_work, year)
+    underground = round_half_up(base_salary_amount * UNDERGROUND_PERCENT, 100)
+    bonus = round_half_up((base_salary_amount + underground + night) * BONUS_PERCENT, 100)
+    base = base_salary_amount + bonus + underground + night + temperature
+    district = round_half_up(base * DISTRICT_PERCENT, 100)
+    north = round_half_up(base * NORTH_PERCENT, 100)
+    total_accruals = bonus + underground + base_salary_amount + night + district + north + temperature
+    deduction = 0 if prior_income + total_accruals > DEDUCTION_INCOME_LIMIT else children_deduction(children)
+    withholding_tax = round_half_up(total_accruals * TAX_PERCENT, 100) - deduction
+    net_salary = total_accruals - withholding_tax
+    alimony_amount = alimony_kopecks(net_salary, alimony, children)
+    return {
+            "base_salary": base_salary_amount,
+            "night_shifts": night,
+            "underground": underground,
+            "bonus": bonus,
+            "working_in_temperature": temperature,
+            "base": base,
+            "district_allowance": district,
+            "north_allowance": north,
+            "total_accruals": total_accruals,
+            "deduction_for_children": deduction,
+            "withholding_tax": withholding_tax,
+            "alimony": alimony_amount,
+            "answer": net_salary - alimony_amount,
+            "base_month": base_salary_amount - base_salary * 100,
+    }
+
+
+def salary_inputs(salary_data) -> dict:
+    """Целые значения для calculate из записи с уже разобранным вводом"""
+    record = salary_data if isinstance(salary_data, SalaryRecord) else salary_data.to_record()
+    return {
+            "base_salary": record.base_salary,
+            "month": RATES.month_index[record.month],
+            "sum_days": record.sum_days,
+            "night_shifts": record.night_shifts,
+            "evening_shifts": record.evening_shifts,
+            "temperature_work": record.temperature_work,
+            "children": record.children,
+            "alimony": record.alimony,
+            "year": record.year,
+    }
+
+
+def calculate_breakdown(salary_data, prior_income: Decimal = Decimal("0.00")) -> SalaryBreakdown:
+    """Полный расчет в копейках с результатом в том же виде, что и calculations.calculate_breakdown"""
+    result = calculate(**salary_inputs(salary_data), prior_income=to_kopecks(prior_income))
+    return SalaryBreakdown(
+            **{key: to_amount(value) for key, value in result.items()},
+            month_quarter_payment=calculations.month_quarter_payment_calculation(salary_data.month),
+    )
+
@@ -0,0 +1,67 @@
+from decimal import Decimal
+
+import numpy as np
+
+from salary_dgs import calculations
+from salary_dgs.batch import calculate_batch
+from salary_dgs.models import SalaryBreakdown
+from salary_dgs.rates import RATES
+
+
+class YearToDateLedger:
+    """Нарастающий итог начислений сотрудника с начала года.
+
+    Начисления прошлых месяцев передаются в расчет, поэтому вычет на детей
+    прекращается с месяца, в котором доход превысил предельный. Добавление
+    месяца стоит O(1): хранится только текущая сумма, а не пересчет месяцев 1..N.
+    """
+
+    __slots__ = ("year", "income", "last_month", "breakdowns")
+
+    def __init__(self):
+        self.year = None  # Год учета (по первому месяцу)
+        self.income = Decimal("0.00")  # Начислено с начала года
+        self.last_month = None  # Последний учтенный месяц
+        self.breakdowns = {}  # Месяц -> SalaryBreakdown
+
+    def add_month(self, salary_data) -> SalaryBreakdown:
+        """Расчет очередного месяца с учетом дохода прошлых месяцев"""
+        month = salary_data.month
+        # Год - строка в BaseSalary и число в SalaryRecord
+        year = int(salary_data.year)
+        if self.year is not None and year != self.year:
+            raise ValueError(f"Год ({year}) не совпадает с годом учета ({self.year}).")
+        if self.last_month is not None and RATES.month_index[month] <= RATES.month_index[self.last_month]:
+            raise ValueError(
+                f"Месяц ({month}) должен идти после последнего учтенного ({self.last_month})."
+            )
+
+        breakdown = calculations.calculate_breakdown(salary_data, prior_income=self.income)
+        self.income += breakdown.total_accruals
+        self.year = year
+        self.last_month = month
+        self.breakdowns[month] = breakdown
+        return breakdown
+
+    @property
+    def deductions_total(self) -> Decimal:
+        """Сумма налоговых вычетов на детей с начала года"""
+        return sum((item.deduction_for_children for item in self.breakdowns.values()), Decimal("0.00"))
+
+
+def replay_year(months_columns) -> list[dict]:
+    """Пакетный пересчет года для многих сотрудников.
+
+    months_columns - пакеты EmployeeBatch (или колонки calculate_batch) по месяцам года в календарном порядке
+    (одинаковый порядок сотрудников в каждом месяце). Нарастающий итог начислений
+    хранится массивом, поэтому каждый месяц считается одним пакетным проходом.
+    """
+    results = []
+    prior_income = None
+    for columns in months_columns:
+        result = calculate_batch(columns, prior_income=prior_income)
+        if prior_income is None:
+            prior_income = np.zeros_like(result["total_accruals"])
+        prior_income = prior_income + result["total_accruals"]
+        results.append(result)
+    return results
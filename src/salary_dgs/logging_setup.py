@@ -0,0 +1,102 @@
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(funcName)s - %(message)s"
+
+LOG_MODES = ("queue", "sync", "quiet")
+# Логгеры пошаговых сообщений расчета, которые отключает тихий режим
+CALCULATION_LOGGERS = ("salary_dgs.services",)
+
+_listener = None
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """Передает запись в очередь без форматирования: сообщение собирается в потоке записи"""
+
+    def prepare(self, record):
+        return record
+
+
+def _file_handler(filename: str, rotation: str, max_bytes: int, backup_count: int) -> logging.Handler:
+    """Файловый обработчик с ротацией по размеру (size) или по времени (time)"""
+    if rotation == "time":
+        return logging.handlers.TimedRotatingFileHandler(
+            filename, when="midnight", backupCount=backup_count, encoding="utf-8"
+        )
+    if rotation == "size":
+        return logging.handlers.RotatingFileHandler(
+            filename, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8"
+        )
+    raise ValueError(f"Некорректный режим ротации ({rotation}), ожидается size или time.")
+
+
+def setup_logging(
+        mode: str = None,
+        filename: str = None,
+        rotation: str = None,
+        max_bytes: int = None,
+        backup_count: int = None,
+        level: int = logging.INFO,
+):
+    """Настройка логирования бота и расчетов.
+
+    Режимы (LOG_MODE):
+    - queue: записи уходят в очередь, форматирование и запись на диск в фоновом потоке
+    - sync: обработчики вызываются в текущем потоке
+    - quiet: как queue, но пошаговые INFO-сообщения расчета отключены
+    Параметры по умолчанию берутся из LOG_FILE, LOG_ROTATION, LOG_MAX_BYTES и LOG_BACKUP_COUNT.
+    """
+    global _listener
+
+    mode = mode or os.getenv("LOG_MODE", "queue")
+    if mode not in LOG_MODES:
+        raise ValueError(f"Некорректный режим логирования ({mode}), ожидается один из {LOG_MODES}.")
+    filename = filename or os.getenv("LOG_FILE", "bot.log")
+    rotation = rotation or os.getenv("LOG_ROTATION", "size")
+    max_bytes = max_bytes or int(os.getenv("LOG_MAX_BYTES", 10 * 1024 * 1024))
+    backup_count = backup_count or int(os.getenv("LOG_BACKUP_COUNT", 5))
+
+    formatter = logging.Formatter(LOG_FORMAT)
+    handlers = [
+        _file_handler(filename, rotation, max_bytes, backup_count),  # Логи в файл
+        logging.StreamHandler(),  # Логи в консоль
+    ]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    stop_logging()
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+        handler.close()
+    root.setLevel(level)
+
+    if mode == "sync":
+        for handler in handlers:
+            root.addHandler(handler)
+    else:
+        log_queue = queue.SimpleQueue()
+        root.addHandler(DeferredQueueHandler(log_queue))
+        _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+
+    # В тихом режиме пошаговые сообщения расчета не формируются вовсе, логи обработчиков бота остаются
+    for name in CALCULATION_LOGGERS:
+        logging.getLogger(name).setLevel(logging.WARNING if mode == "quiet" else logging.NOTSET)
+
+
+def stop_logging():
+    """Остановка фонового потока с дозаписью очереди"""
+    global _listener
+
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(stop_logging)
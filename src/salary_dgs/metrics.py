@@ -0,0 +1,183 @@
+import asyncio
+import logging
+import os
+from bisect import bisect_left
+
+from salary_dgs import calculations
+from salary_dgs.cache_decorator import result_cache
+
+logger = logging.getLogger(__name__)
+
+# Границы корзин гистограммы задержек в секундах
+LATENCY_BUCKETS = (
+        0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005,
+        0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5,
+)
+
+
+class Histogram:
+    """Гистограмма задержек с фиксированными корзинами"""
+
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)  # Последняя корзина - +Inf
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, seconds: float):
+        self.counts[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.total += seconds
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """Оценка квантиля по верхней границе корзины"""
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+
+class Registry:
+    """Счетчики и гистограммы по шагам расчета и обработчикам бота"""
+
+    def __init__(self):
+        self.steps = {}  # Имя шага расчета -> Histogram
+        self.handlers = {}  # Имя обработчика -> Histogram
+        self.handler_errors = {}  # Имя обработчика -> число исключений
+
+    def observe_step(self, name: str, seconds: float):
+        histogram = self.steps.get(name)
+        if histogram is None:
+            histogram = self.steps[name] = Histogram()
+        histogram.observe(seconds)
+
+    def observe_handler(self, name: str, seconds: float, failed: bool = False):
+        histogram = self.handlers.get(name)
+        if histogram is None:
+            histogram = self.handlers[name] = Histogram()
+        histogram.observe(seconds)
+        if failed:
+            self.handler_errors[name] = self.handler_errors.get(name, 0) + 1
+
+    def clear(self):
+        self.steps.clear()
+        self.handlers.clear()
+        self.handler_errors.clear()
+
+
+registry = Registry()
+_enabled = False
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def enable():
+    """Включение замеров: шаги графа расчета передают время в registry"""
+    global _enabled
+    _enabled = True
+    calculations.step_observer = registry.observe_step
+
+
+def disable():
+    """Выключение замеров: расчет снова идет без вызова таймера"""
+    global _enabled
+    _enabled = False
+    calculations.step_observer = None
+
+
+def _histogram_lines(metric: str, label: str, histograms: dict) -> list[str]:
+    lines = [f"# TYPE {metric} histogram"]
+    for name, histogram in sorted(histograms.items()):
+        cumulative = 0
+        for bound, count in zip(LATENCY_BUCKETS, histogram.counts):
+            cumulative += count
+            lines.append(f'{metric}_bucket{{{label}="{name}",le="{bound}"}} {cumulative}')
+        lines.append(f'{metric}_bucket{{{label}="{name}",le="+Inf"}} {histogram.count}')
+        lines.append(f'{metric}_sum{{{label}="{name}"}} {histogram.total:.9f}')
+        lines.append(f'{metric}_count{{{label}="{name}"}} {histogram.count}')
+    return lines
+
+
+def render() -> str:
+    """Метрики в текстовом формате Prometheus"""
+    cache = result_cache.stats()
+    lines = _histogram_lines("salary_step_duration_seconds", "step", registry.steps)
+    lines += _histogram_lines("salary_handler_duration_seconds", "handler", registry.handlers)
+    lines.append("# TYPE salary_handler_errors_total counter")
+    lines += [
+            f'salary_handler_errors_total{{handler="{name}"}} {count}'
+            for name, count in sorted(registry.handler_errors.items())
+    ]
+    for name in ("hits", "misses", "evictions"):
+        lines.append(f"# TYPE salary_cache_{name}_total counter")
+        lines.append(f"salary_cache_{name}_total {cache[name]}")
+    lines.append("# TYPE salary_cache_size gauge")
+    lines.append(f"salary_cache_size {cache['size']}")
+    return "\n".join(lines) + "\n"
+
+
+def summary(limit: int = 5) -> str:
+    """Краткая сводка для команды /stats"""
+    cache = result_cache.stats()
+    requests = cache["hits"] + cache["misses"]
+    hit_rate = cache["hits"] / requests * 100 if requests else 0.0
+    lines = [f"🗄 Кеш расчетов: {cache['hits']}/{requests} попаданий ({hit_rate:.0f}%), записей {cache['size']}"]
+
+    def top(title: str, histograms: dict):
+        busiest = sorted(histograms.items(), key=lambda item: item[1].total, reverse=True)[:limit]
+        if busiest:
+            lines.append(title)
+        for name, histogram in busiest:
+            average = histogram.total / histogram.count * 1000
+            lines.append(
+                    f"• {name}: {histogram.count} вызовов, среднее {average:.2f} мс, "
+                    f"p95 ≤ {histogram.quantile(0.95) * 1000:g} мс"
+            )
+
+    top("⏱ Обработчики:", registry.handlers)
+    top("🧮 Шаги расчета:", registry.steps)
+    return "\n".join(lines)
+
+
+async def _handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    """Ответ на любой HTTP-запрос текстом метрик"""
+    try:
+        request_line = await reader.readline()
+        while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+            pass
+        if request_line.split(b" ")[:1] == [b"GET"]:
+            body = render().encode()
+            status = b"200 OK"
+        else:
+            body = b"method not allowed\n"
+            status = b"405 Method Not Allowed"
+        writer.write(
+                b"HTTP/1.0 " + status + b"\r\n"
+                b"Content-Type: text/plain; version=0.0.4; charset=utf-8\r\n"
+                b"Content-Length: " + str(len(body)).encode() + b"\r\n\r\n" + body
+        )
+        await writer.drain()
+    finally:
+        writer.close()
+
+
+async def start_server(host: str = "127.0.0.1", port: int = 9108) -> asyncio.Server:
+    """Локальный HTTP-порт с метриками для Prometheus"""
+    server = await asyncio.start_server(_handle, host, port)
+    logger.info("Метрики доступны на http://%s:%s/metrics", host, port)
+    return server
+
+
+async def setup_from_env():
+    """Включение метрик по METRICS_PORT (и METRICS_HOST); без переменной метрики выключены"""
+    port = os.getenv("METRICS_PORT")
+    if not port:
+        return None
+    enable()
+    return await start_server(os.getenv("METRICS_HOST", "127.0.0.1"), int(port))
@@ -1,114 +1,196 @@
 from decimal import Decimal, ROUND_HALF_UP
 from dataclasses import dataclass, field
+from functools import lru_cache
 
-from salary_dgs.constant import MONTHS_IN_YEAR_DAYS
+from salary_dgs.constant import MONTHS_IN_YEAR
+from salary_dgs.production_calendar import default_year
 from salary_dgs.validate_dekarators import (
     validate_base_salary,
     validate_month,
     validate_evening_shifts,
     validate_days_night_evening_temperature,
     validate_days_temperature_work,
-    validate_children, validate_alimony, validate_night_shifts,
+    validate_children, validate_alimony, validate_night_shifts, validate_year,
 )
 
 
+@lru_cache(maxsize=4096)
+def parse_numbers(value: str) -> tuple[int, ...]:
+    """Числа из строки через запятую (номера детей, проценты алиментов).
+
+    Различных строк немного, поэтому разбор кешируется (результат - неизменяемый кортеж).
+    """
+    return tuple(int(part) for part in value.replace(".", ",").split(",") if part.strip().isdigit())
+
+
+CENTS = Decimal("0.01")
+
+# Разбор строковых полей в типизированные значения для расчета
+_PARSERS = {
+        "base_salary": int,
+        "month": str,
+        "sum_days": int,
+        "night_shifts": int,
+        "evening_shifts": int,
+        "temperature_work": int,
+        "children": parse_numbers,
+        "alimony": parse_numbers,
+        "year": int,
+}
+
+
+def _text(value) -> str | None:
+    """Строка поля в формате ввода (списки - числа через запятую)"""
+    if value is None or isinstance(value, str):
+        return value
+    return ",".join(map(str, value)) if isinstance(value, tuple) else str(value)
+
+
+@lru_cache(maxsize=64)
+def _shifts(value: int) -> Decimal:
+    """Количество смен в Decimal с двумя знаками (значений не больше 32, Decimal неизменяем)"""
+    return Decimal(value).quantize(CENTS)
+
+
 @dataclass
 class BaseSalary:
-    _base_salary: str = None
+    """Ввод пользователя.
+
+    Поля хранят только разобранные значения (числа, кортежи номеров детей и процентов
+    алиментов); строки при создании разбираются один раз. Свойства и to_dict
+    возвращают строки в формате ввода.
+    """
+    _base_salary: int = None
     _month: str = None
-    _sum_days: str = None
-    _night_shifts: str = None
-    _evening_shifts: str = None
-    _temperature_work: str = None
-    _children: str = None
-    _alimony: str = None
+    _sum_days: int = None
+    _night_shifts: int = None
+    _evening_shifts: int = None
+    _temperature_work: int = None
+    _children: tuple[int, ...] = None
+    _alimony: tuple[int, ...] = None
+    _year: int = None
     init_count: int = 0
 
+    def __post_init__(self):
+        for name, parse in _PARSERS.items():
+            value = getattr(self, f"_{name}")
+            if isinstance(value, str):
+                setattr(self, f"_{name}", parse(value))
+
     @property
     def base_salary(self):
-        return self._base_salary
+        return _text(self._base_salary)
 
     @base_salary.setter
     @validate_base_salary
     def base_salary(self, value):
-        self._base_salary = value.strip()
+        self._base_salary = int(value.strip())
 
     @property
     def month(self):
-        return self._month
+        return _text(self._month)
 
     @month.setter
-    @validate_month(MONTHS_IN_YEAR_DAYS)
+    @validate_month(MONTHS_IN_YEAR)
     def month(self, value):
         self._month = value.strip().lower()
 
     @property
     def sum_days(self):
-        return self._sum_days
+        return _text(self._sum_days)
 
     @sum_days.setter
     @validate_days_night_evening_temperature
     def sum_days(self, value):
-        self._sum_days = value.strip()
+        self._sum_days = int(value.strip())
 
     @property
     def night_shifts(self):
-        return self._night_shifts
+        return _text(self._night_shifts)
 
     @night_shifts.setter
     @validate_night_shifts
     def night_shifts(self, value):
-        self._night_shifts = value.strip()
+        self._night_shifts = int(value.strip())
 
     @property
     def evening_shifts(self):
-        return self._evening_shifts
+        return _text(self._evening_shifts)
 
     @evening_shifts.setter
     @validate_evening_shifts
     def evening_shifts(self, value):
-        self._evening_shifts = value.strip()
+        self._evening_shifts = int(value.strip())
 
     @property
     def temperature_work(self):
-        return self._temperature_work
+        return _text(self._temperature_work)
 
     @temperature_work.setter
     @validate_days_temperature_work
     def temperature_work(self, value):
-        self._temperature_work = value.strip()
+        self._temperature_work = int(value.strip())
 
     @property
     def children(self):
-        return self._children
+        return _text(self._children)
 
     @children.setter
     @validate_children
     def children(self, value):
-        self._children = value.strip().replace(".", ",")
+        self._children = parse_numbers(value.strip())
 
     @property
     def alimony(self):
-        return self._alimony
+        return _text(self._alimony)
 
     @alimony.setter
     @validate_alimony
     def alimony(self, value):
-        self._alimony = value.strip().replace(".", ",")
+        self._alimony = parse_numbers(value.strip())
+
+    @property
+    def year(self):
+        """Год производственного календаря (если не задан - год по умолчанию)"""
+        return str(default_year() if self._year is None else self._year)
+
+    @year.setter
+    @validate_year
+    def year(self, value):
+        self._year = int(value.strip())
+
+    def value(self, name: str):
+        """Разобранное значение поля (год без ввода - год по умолчанию календаря)"""
+        value = getattr(self, f"_{name}")
+        if name == "year" and value is None:
+            return default_year()
+        return value
 
     def to_dict(self):
-        """Преобразовать объект в словарь для сохранения состояния"""
+        """Преобразовать объект в словарь строк для сохранения состояния"""
         return {
-                "_base_salary": self._base_salary,
+                "_base_salary": _text(self._base_salary),
                 "_month": self._month,
-                "_sum_days": self._sum_days,
-                "_night_shifts": self._night_shifts,
-                "_evening_shifts": self._evening_shifts,
-                "_temperature_work": self._temperature_work,
-                "_children": self._children,
-                "_alimony": self._alimony,
+                "_sum_days": _text(self._sum_days),
+                "_night_shifts": _text(self._night_shifts),
+                "_evening_shifts": _text(self._evening_shifts),
+                "_temperature_work": _text(self._temperature_work),
+                "_children": _text(self._children),
+                "_alimony": _text(self._alimony),
+                "_year": self.year,
         }
 
+    def cache_key(self) -> tuple:
+        """Нормализованный кортеж входных данных для общего кеша расчетов"""
+        return (
+                self._base_salary, self._month, self._sum_days, self._night_shifts, self._evening_shifts,
+                self._temperature_work, self._children, self._alimony, self.value("year"),
+        )
+
+    def to_record(self) -> "SalaryRecord":
+        """Неизменяемая разобранная запись для расчета и кеша"""
+        return SalaryRecord.from_base_salary(self)
+
     @classmethod
     def from_dict(cls, data):
         """Создать объект из словаря состояния"""
@@ -121,6 +203,7 @@ class BaseSalary:
                 _temperature_work=data.get("_temperature_work"),
                 _children=data.get("_children"),
                 _alimony=data.get("_alimony"),
+                _year=data.get("_year"),
         )
 
 
@@ -132,39 +215,147 @@ class GetDataSalary(BaseSalary):
     @classmethod
     def from_base_salary(cls, base: BaseSalary):
         return cls(
-                _base_salary=base.base_salary,
-                _month=base.month,
-                _sum_days=base.sum_days,
-                _night_shifts=base.night_shifts,
-                _evening_shifts=base.evening_shifts,
-                _temperature_work=base.temperature_work,
-                _children=base.children,
-                _alimony=base.alimony,
+                _base_salary=base._base_salary,
+                _month=base._month,
+                _sum_days=base._sum_days,
+                _night_shifts=base._night_shifts,
+                _evening_shifts=base._evening_shifts,
+                _temperature_work=base._temperature_work,
+                _children=base._children,
+                _alimony=base._alimony,
+                _year=base._year,
         )
 
     async def get_base_salary(self):
-        return Decimal(self.base_salary)
+        return Decimal(self._base_salary)
 
     async def get_month(self):
-        return self.month
+        return self._month
 
     async def get_sum_days(self):
-        return Decimal(self.sum_days).quantize(Decimal("0.01"))
+        return _shifts(self._sum_days)
 
     async def get_night_shifts(self):
-        return Decimal(self.night_shifts).quantize(Decimal("0.01"))
+        return _shifts(self._night_shifts)
 
     async def get_evening_shifts(self):
-        return Decimal(self.evening_shifts).quantize(Decimal("0.01"))
+        return _shifts(self._evening_shifts)
 
     async def get_sum_evening_shifts(self):
-        return Decimal(self.evening_shifts).quantize(Decimal("0.01"))
+        return _shifts(self._evening_shifts)
 
     async def get_temperature_work(self):
-        return Decimal(self.temperature_work).quantize(Decimal("0.01"))
+        return _shifts(self._temperature_work)
 
     async def get_children(self):
-        return self.children.strip().replace(".", ",")
+        return self._children
 
     async def get_alimony(self):
-        return self.alimony.strip().replace(".", ",")
+        return self._alimony
+
+    async def get_year(self):
+        return self.value("year")
+
+
+@dataclass(frozen=True, slots=True)
+class SalaryRecord:
+    """Неизменяемые разобранные входные данные расчета.
+
+    Числа хранятся уже разобранными, хеш считается один раз при создании,
+    поэтому запись сама служит ключом общего кеша расчетов.
+    """
+    base_salary: int  # Оклад, руб.
+    month: str  # Месяц в нижнем регистре
+    sum_days: int  # Всего смен
+    night_shifts: int  # Ночные смены
+    evening_shifts: int  # Вечерние смены
+    temperature_work: int  # Смены в температуре
+    children: tuple[int, ...]  # Номера детей для вычета
+    alimony: tuple[int, ...]  # Проценты алиментов
+    year: int  # Год производственного календаря
+    _hash: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "_hash", hash((
+                self.base_salary, self.month, self.sum_days, self.night_shifts, self.evening_shifts,
+                self.temperature_work, self.children, self.alimony, self.year,
+        )))
+
+    def __hash__(self):
+        return self._hash
+
+    def cache_key(self) -> "SalaryRecord":
+        """Ключ общего кеша расчетов - сама запись"""
+        return self
+
+    @classmethod
+    def from_base_salary(cls, base: BaseSalary) -> "SalaryRecord":
+        """Запись из проверенного ввода BaseSalary (значения уже разобраны при вводе)"""
+        return cls(
+                base_salary=base._base_salary,
+                month=base._month,
+                sum_days=base._sum_days,
+                night_shifts=base._night_shifts,
+                evening_shifts=base._evening_shifts,
+                temperature_work=base._temperature_work,
+                children=base._children,
+                alimony=base._alimony,
+                year=base.value("year"),
+        )
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "SalaryRecord":
+        """Запись из словаря состояния BaseSalary.to_dict"""
+        return cls(
+                base_salary=int(data["_base_salary"]),
+                month=data["_month"],
+                sum_days=int(data["_sum_days"]),
+                night_shifts=int(data["_night_shifts"]),
+                evening_shifts=int(data["_evening_shifts"]),
+                temperature_work=int(data["_temperature_work"]),
+                children=parse_numbers(data["_children"]),
+                alimony=parse_numbers(data["_alimony"]),
+                year=int(data.get("_year") or default_year()),
+        )
+
+    def to_dict(self) -> dict:
+        """Словарь состояния в формате BaseSalary.to_dict"""
+        return {
+                "_base_salary": str(self.base_salary),
+                "_month": self.month,
+                "_sum_days": str(self.sum_days),
+                "_night_shifts": str(self.night_shifts),
+                "_evening_shifts": str(self.evening_shifts),
+                "_temperature_work": str(self.temperature_work),
+                "_children": ",".join(map(str, self.children)),
+                "_alimony": ",".join(map(str, self.alimony)),
+                "_year": str(self.year),
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class SalaryBreakdown:
+    """Неизменяемый результат полного расчета зарплаты"""
+    base_salary: Decimal  # Оклад за фактически отработанное время
+    night_shifts: Decimal  # Доплата за работу в ночное время
+    underground: Decimal  # Надбавка за вредные условия труда
+    bonus: Decimal  # Премия
+    working_in_temperature: Decimal  # Доплата за работу в температуре
+    base: Decimal  # Базовая сумма для районного коэффициента и северной надбавки
+    district_allowance: Decimal  # Районный коэффициент
+    north_allowance: Decimal  # Северная надбавка
+    total_accruals: Decimal  # Итого начислено
+    deduction_for_children: Decimal  # Налоговый вычет на детей
+    withholding_tax: Decimal  # НДФЛ
+    alimony: Decimal  # Алименты
+    answer: Decimal  # Итого к выплате
+    base_month: Decimal  # Квартальная доплата за переработку
+    month_quarter_payment: str  # Месяц выплаты доплаты за переработку
+
+    def to_tuple(self) -> tuple:
+        """Значения полей в порядке объявления (для сериализации)"""
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def to_dict(self) -> dict:
+        """Словарь значений по именам полей"""
+        return {name: getattr(self, name) for name in self.__slots__}
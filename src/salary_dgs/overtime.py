@@ -0,0 +1,86 @@
+from decimal import Decimal
+
+import numpy as np
+
+from salary_dgs.batch import EmployeeBatch, calculate_base_month, month_indexes, to_decimal, year_values
+from salary_dgs.rates import RATES
+
+
+def payment_month(year: int, quarter: int) -> tuple[int, str]:
+    """Год и месяц выплаты за квартал (0 - I квартал; за IV квартал - январь следующего года)"""
+    return year + (quarter == 3), RATES.months[(quarter + 1) * 3 % 12]
+
+
+class QuarterPayouts:
+    """Выплаты за переработку по сотрудникам и кварталам в копейках.
+
+    periods - кварталы (год, квартал) по порядку, встречающиеся во входе.
+    amounts - неотрицательные суммы: отрицательный итог квартала хранится как 0
+    (правило - в quarter_payouts).
+    """
+
+    def __init__(self, employees: np.ndarray, periods: tuple, amounts: np.ndarray):
+        self.employees = employees  # Идентификаторы сотрудников
+        self.periods = periods  # Кварталы (год, квартал с 0)
+        self.amounts = amounts  # Массив int64 [сотрудник, квартал из periods]
+
+    def _by_payment(self, amounts) -> dict:
+        return dict(zip((payment_month(*period) for period in self.periods), to_decimal(amounts)))
+
+    def employee(self, employee) -> dict:
+        """Выплаты сотрудника по (год, месяц) выплаты, KeyError для сотрудника не из входа"""
+        rows = np.flatnonzero(self.employees == employee)
+        if not len(rows):
+            raise KeyError(f"Нет данных сотрудника {employee!r}.")
+        return self._by_payment(self.amounts[int(rows[0])])
+
+    def totals(self) -> dict:
+        """Сумма выплат по всем сотрудникам по (год, месяц) выплаты"""
+        return self._by_payment(self.amounts.sum(axis=0))
+
+
+def quarter_payouts(columns, employees=None) -> QuarterPayouts:
+    """Выплаты за переработку за квартал одним пакетным проходом.
+
+    columns - EmployeeBatch или колонки calculate_batch (достаточно base_salary, month, sum_days и year)
+    за любые месяцы любых лет. employees - идентификатор сотрудника для каждой строки
+    (по умолчанию все строки - один сотрудник).
+
+    Правило расчета: доплаты (base_month со знаком) всех месяцев одного квартала одного
+    года у одного сотрудника суммируются, так что недоработка одного месяца покрывается
+    переработкой другого. Если итог квартала отрицательный, выплата за квартал - 0:
+    недоработка не удерживается и не переносится на следующий квартал или год.
+    """
+    if isinstance(columns, EmployeeBatch):
+        month_index = columns.month.astype(np.intp)
+        years = columns.year.astype(np.int64)
+    else:
+        month_index = month_indexes(columns["month"])
+        years = year_values(columns, len(month_index))
+    base_month = calculate_base_month(columns, month_index)
+    if employees is None:
+        employees = np.zeros(len(base_month), dtype=np.int64)
+    unique, employee_index = np.unique(np.asarray(employees), return_inverse=True)
+    # Квартал с годом одним числом: год * 4 + номер квартала
+    periods, period_index = np.unique(years * 4 + month_index // 3, return_inverse=True)
+
+    amounts = np.zeros((len(unique), len(periods)), dtype=np.int64)
+    np.add.at(amounts, (employee_index, period_index), base_month)
+    np.maximum(amounts, 0, out=amounts)
+    return QuarterPayouts(unique, tuple(divmod(int(period), 4) for period in periods), amounts)
+
+
+def salary_columns(salaries) -> dict:
+    """Колонки для quarter_payouts из последовательности BaseSalary"""
+    salaries = list(salaries)
+    return {
+        "base_salary": [salary.base_salary for salary in salaries],
+        "month": [salary.month for salary in salaries],
+        "sum_days": [salary.sum_days for salary in salaries],
+        "year": [salary.year for salary in salaries],
+    }
+
+
+def employee_payouts(salaries) -> dict[str, Decimal]:
+    """Выплаты за переработку одного сотрудника по месяцам выплаты"""
+    return quarter_payouts(salary_columns(salaries)).employee(0)
@@ -0,0 +1,71 @@
+import math
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+
+import numpy as np
+
+from salary_dgs.batch import BATCH_COMPONENTS, EmployeeBatch, as_batch, calculate_batch
+
+
+def default_workers() -> int:
+    """Число процессов: CALC_WORKERS или число доступных ядер"""
+    workers = os.getenv("CALC_WORKERS")
+    if workers:
+        return int(workers)
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def _calculate_shard(columns: tuple, children_table: tuple, alimony_table: tuple, prior_income: bytes = None) -> bytes:
+    """Расчет части пакета в процессе пула: на входе и выходе - байты массивов, а не объекты"""
+    batch = EmployeeBatch.from_buffers(columns, children_table, alimony_table)
+    income = None if prior_income is None else np.frombuffer(prior_income, np.int64)
+    result = calculate_batch(batch, income)
+    return np.stack([result[component] for component in BATCH_COMPONENTS]).astype(np.int64).tobytes()
+
+
+def _payloads(batch: EmployeeBatch, shard_size: int, prior_income):
+    for start in range(0, len(batch), shard_size):
+        columns, children_table, alimony_table = batch[start:start + shard_size].to_buffers()
+        income = None
+        if prior_income is not None:
+            income = np.ascontiguousarray(prior_income[start:start + shard_size], np.int64).tobytes()
+        yield columns, children_table, alimony_table, income
+
+
+def calculate_parallel(
+        batch,
+        workers: int = None,
+        shard_size: int = None,
+        prior_income=None,
+        executor: Executor = None,
+) -> dict:
+    """calculate_batch на пуле процессов с результатом в порядке строк входа.
+
+    Пакет делится на части по shard_size строк (по умолчанию - поровну на workers),
+    части передаются байтами колонок EmployeeBatch, результаты склеиваются по порядку.
+    executor - готовый пул (например, на весь потоковый расчет); без него пул
+    создается на время вызова. workers=1 без executor - расчет в текущем процессе.
+    """
+    batch = as_batch(batch)
+    if prior_income is not None:
+        prior_income = np.asarray(prior_income, dtype=np.int64)
+    workers = workers or default_workers()
+    if executor is None and workers == 1 or not len(batch):
+        return calculate_batch(batch, prior_income)
+    shard_size = shard_size or math.ceil(len(batch) / workers)
+
+    def run(pool: Executor) -> list[bytes]:
+        return list(pool.map(_calculate_shard, *zip(*_payloads(batch, shard_size, prior_income))))
+
+    if executor is not None:
+        shards = run(executor)
+    else:
+        with ProcessPoolExecutor(workers) as pool:
+            shards = run(pool)
+    merged = np.concatenate(
+        [np.frombuffer(shard, np.int64).reshape(len(BATCH_COMPONENTS), -1) for shard in shards], axis=1
+    )
+    return {component: merged[index] for index, component in enumerate(BATCH_COMPONENTS)}
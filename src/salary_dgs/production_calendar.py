@@ -0,0 +1,70 @@
+import calendar
+import json
+from datetime import date
+from decimal import Decimal
+from functools import lru_cache
+from pathlib import Path
+
+from salary_dgs.constant import MONTHS_IN_YEAR, WORKING_HOURS_PER_WEEK
+
+# Файлы производственного календаря: <год>.json
+CALENDAR_DIR = Path(__file__).parent / "calendar"
+
+# Длительность рабочего дня и сокращение предпраздничного дня в часах
+HOURS_PER_DAY = Decimal(WORKING_HOURS_PER_WEEK) / 5
+SHORTENED_DAY_HOURS = Decimal("1")
+
+
+@lru_cache(maxsize=None)
+def available_years() -> tuple[int, ...]:
+    """Годы, для которых есть файл календаря (файлы при этом не читаются)"""
+    return tuple(sorted(int(path.stem) for path in CALENDAR_DIR.glob("*.json") if path.stem.isdigit()))
+
+
+def default_year() -> int:
+    """Текущий год, если для него есть календарь, иначе последний доступный"""
+    years = available_years()
+    if not years:
+        raise ValueError(f"Нет файлов производственного календаря в {CALENDAR_DIR}.")
+    current = date.today().year
+    return current if current in years else years[-1]
+
+
+def _dates(data: dict, key: str, year: int) -> set[date]:
+    """Даты из списка календаря с проверкой года"""
+    dates = {date.fromisoformat(value) for value in data.get(key, ())}
+    wrong = sorted(value.isoformat() for value in dates if value.year != year)
+    if wrong:
+        raise ValueError(f"Даты {', '.join(wrong)} не относятся к {year} году.")
+    return dates
+
+
+@lru_cache(maxsize=None)
+def year_norms(year: int) -> tuple[tuple[int, Decimal], ...]:
+    """Нормы года: кортеж (норма выходов, норма часов) по номеру месяца (0 - январь).
+
+    Файл года читается при первом обращении, результат кешируется.
+    Рабочие дни - будни без праздников плюс рабочие выходные; предпраздничный
+    день короче на SHORTENED_DAY_HOURS.
+    """
+    path = CALENDAR_DIR / f"{year}.json"
+    if not path.exists():
+        raise ValueError(
+            f"Нет производственного календаря на {year} год, доступны: "
+            f"{', '.join(map(str, available_years()))}."
+        )
+    data = json.loads(path.read_text(encoding="utf-8"))
+    holidays = _dates(data, "holidays", year)
+    working_weekends = _dates(data, "working_weekends", year)
+    shortened = _dates(data, "shortened", year)
+
+    norms = []
+    for month in range(1, len(MONTHS_IN_YEAR) + 1):
+        days = shortened_days = 0
+        for day in range(1, calendar.monthrange(year, month)[1] + 1):
+            current = date(year, month, day)
+            if current in working_weekends or (current.weekday() < 5 and current not in holidays):
+                days += 1
+                shortened_days += current in shortened
+        norms.append((days, days * HOURS_PER_DAY - shortened_days * SHORTENED_DAY_HOURS))
+    return tuple(norms)
@@ -0,0 +1,69 @@
+from dataclasses import dataclass
+from decimal import Decimal
+from functools import lru_cache
+from types import MappingProxyType
+
+from salary_dgs import production_calendar
+from salary_dgs.constant import MONTHS_IN_YEAR, FACTORS, RATE_TABLE_VERSION
+
+
+@dataclass(frozen=True, slots=True)
+class MonthRates:
+    """Нормы месяца"""
+    days_norm: Decimal  # Норма выходов
+    hours_norm: Decimal  # Норма часов
+
+
+@lru_cache(maxsize=None)
+def year_rates(year: int) -> tuple[MonthRates, ...]:
+    """Нормы месяцев года по номеру месяца (0 - январь), календарь года читается один раз"""
+    return tuple(
+            MonthRates(Decimal(days), hours) for days, hours in production_calendar.year_norms(year)
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class RateTable:
+    """Неизменяемый снимок ставок, разобранных в Decimal один раз"""
+    version: str
+    months: tuple  # Названия месяцев по порядку
+    month_index: MappingProxyType  # Название месяца -> номер (0 - январь)
+    night_hours_per_shift: Decimal  # Часов в ночной смене
+    evening_hours_per_shift: Decimal  # Часов в вечерней смене
+    night_pay_percent: Decimal  # Процент оплаты за ночные смены
+    bonus_percent: Decimal  # Процент премии
+    underground_percent: Decimal  # Процент надбавки за подземные условия
+    district_percent: Decimal  # Районный коэффициент
+    north_percent: Decimal  # Северная надбавка
+    temperature_percent: Decimal  # Процент надбавки за температуру
+    temperature_hours_per_shift: Decimal  # Часов в температуре за смену
+    tax_percent: Decimal  # НДФЛ
+    deduction_income_limit: Decimal  # Предельный доход с начала года для вычета на детей
+
+    def month_rates(self, year, month: str) -> MonthRates:
+        """Нормы месяца года за O(1) (без года - год по умолчанию календаря)"""
+        return year_rates(year or production_calendar.default_year())[self.month_index[month]]
+
+    @classmethod
+    def from_tables(cls, version, months, factors, temperature_hours="5"):
+        """Разбор строковых таблиц коэффициентов"""
+        return cls(
+                version=version,
+                months=tuple(months),
+                month_index=MappingProxyType({month: index for index, month in enumerate(months)}),
+                night_hours_per_shift=Decimal(factors["Ночные 1 смена"]),
+                evening_hours_per_shift=Decimal(factors["Ночные 3 смена"]),
+                night_pay_percent=Decimal(factors["Процент оплаты ночных"]),
+                bonus_percent=Decimal(factors["Премия"]),
+                underground_percent=Decimal(factors["Подземные условия"]),
+                district_percent=Decimal(factors["Районный коэффициент"]),
+                north_percent=Decimal(factors["Северная надбавка"]),
+                temperature_percent=Decimal(factors["Доплата за температуру"]),
+                temperature_hours_per_shift=Decimal(temperature_hours),
+                tax_percent=Decimal(factors["НДФЛ"]),
+                deduction_income_limit=Decimal(factors["Предельный доход для вычета на детей"]),
+        )
+
+
+# Активная таблица ставок, собирается один раз при импорте
+RATES = RateTable.from_tables(RATE_TABLE_VERSION, MONTHS_IN_YEAR, FACTORS)
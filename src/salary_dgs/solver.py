@@ -0,0 +1,88 @@
+from decimal import Decimal
+
+from salary_dgs import calculations
+from salary_dgs.rates import RATES
+
+# Верхняя граница количества смен (как в валидаторах)
+MAX_DAYS = 31
+
+
+def net_amount(inputs: dict) -> Decimal:
+    """Сумма к выплате по входным данным (считаются только нужные шаги графа)"""
+    return calculations.evaluate(inputs, ("calculation_answer",))["calculation_answer"]
+
+
+def _input_value(field: str, value: int) -> Decimal:
+    """Значение поля в формате salary_inputs"""
+    if field == "base_salary":
+        return Decimal(value)
+    return Decimal(value).quantize(calculations.CENTS)
+
+
+def within_deduction_limit(inputs: dict) -> bool:
+    """Доход с начала года с начислениями месяца не выше предельного (вычет на детей предоставляется)"""
+    accruals = calculations.evaluate(inputs, ("calculation_total_accruals",))["calculation_total_accruals"]
+    return inputs["prior_income"] + accruals <= RATES.deduction_income_limit
+
+
+def _first(predicate, low: int, high: int):
+    """Минимальное целое из [low, high], для которого выполняется неубывающий predicate"""
+    if low > high or not predicate(high):
+        return None
+    while low < high:
+        middle = (low + high) // 2
+        if predicate(middle):
+            high = middle
+        else:
+            low = middle + 1
+    return low
+
+
+def _bisect(target: Decimal, inputs: dict, field: str, low: int, high: int):
+    """Минимальное целое значение поля из [low, high], при котором сумма к выплате >= target.
+
+    Начисления не убывают по количеству смен и окладу, но сумма к выплате падает
+    на границе предельного дохода: с нее вычет на детей не предоставляется.
+    Поэтому отрезок делится на две части по этой границе, в каждой сумма к выплате
+    не убывает, и в каждой идет двоичный поиск с точным расчетом.
+    """
+    values = dict(inputs)
+
+    def set_value(value: int) -> dict:
+        values[field] = _input_value(field, value)
+        return values
+
+    def reaches(value: int) -> bool:
+        return net_amount(set_value(value)) >= target
+
+    # Первое значение, при котором вычет уже не предоставляется (high + 1 - граница не достигается)
+    over_limit = _first(lambda value: not within_deduction_limit(set_value(value)), low, high)
+    if over_limit is None:
+        return _first(reaches, low, high)
+    found = _first(reaches, low, over_limit - 1)
+    return found if found is not None else _first(reaches, over_limit, high)
+
+
+def solve_sum_days(target: Decimal, inputs: dict):
+    """Минимальное количество смен для суммы к выплате target (None, если недостижимо)"""
+    low = max(int(inputs["night_shifts"] + inputs["evening_shifts"]), int(inputs["temperature_work"]))
+    return _bisect(target, inputs, "sum_days", low, MAX_DAYS)
+
+
+def solve_night_shifts(target: Decimal, inputs: dict):
+    """Минимальное количество ночных смен для суммы к выплате target (None, если недостижимо)"""
+    high = int(inputs["sum_days"] - inputs["evening_shifts"])
+    return _bisect(target, inputs, "night_shifts", 0, high)
+
+
+def solve_base_salary(target: Decimal, inputs: dict):
+    """Минимальный оклад в целых рублях для суммы к выплате target (None, если недостижимо)"""
+    high = 1
+    values = dict(inputs, base_salary=Decimal(high))
+    # Верхняя граница удвоением: сумма к выплате растет вместе с окладом
+    while net_amount(values) < target:
+        if high > target * 1000:
+            return None
+        high *= 2
+        values["base_salary"] = Decimal(high)
+    return _bisect(target, inputs, "base_salary", 0, high)
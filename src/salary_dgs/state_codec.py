@@ -0,0 +1,241 @@
+import json
+import struct
+from functools import lru_cache
+
+from salary_dgs.models import BaseSalary, SalaryRecord, parse_numbers
+from salary_dgs.rates import RATES
+
+# Версия двоичного формата: первый байт каждой записи
+FORMAT_VERSION = 1
+
+# Заголовок записи: версия и состав данных (флаги KIND_*)
+_HEADER = struct.Struct(">BB")
+# Заголовок блока полей: маска заданных полей и маска полей, записанных строкой
+_BLOCK = struct.Struct(">HH")
+_LENGTH = struct.Struct(">H")
+
+# Состав данных состояния FSM: блоки идут в порядке флагов
+KIND_SALARY = 1  # "salary": BaseSalary или BaseSalary.to_dict()
+KIND_RECORD = 2  # "record": SalaryRecord
+KIND_JSON = 128  # Прочие данные - JSON
+
+_UINT8 = struct.Struct(">B")
+_UINT16 = struct.Struct(">H")
+_UINT32 = struct.Struct(">I")
+_LIST = "list"
+_MONTH = "month"
+
+# Поля в порядке записи: имя и упаковка значения
+_FIELDS = (
+        ("base_salary", _UINT32),
+        ("month", _MONTH),
+        ("sum_days", _UINT8),
+        ("night_shifts", _UINT8),
+        ("evening_shifts", _UINT8),
+        ("temperature_work", _UINT8),
+        ("children", _LIST),
+        ("alimony", _LIST),
+        ("year", _UINT16),
+)
+_ALL_FIELDS = (1 << len(_FIELDS)) - 1
+# Блок со всеми полями в упакованном виде: маски, оклад, месяц, дни и смены; затем списки и год
+_FULL_BLOCK = struct.Struct(">HHIBBBBB")
+
+
+def _encode_full(base_salary, month, sum_days, night_shifts, evening_shifts, temperature_work,
+                 children, alimony, year) -> bytes:
+    """Быстрая запись блока, в котором все поля заданы и помещаются в формат
+    (struct.error, KeyError, ValueError - нет, нужна общая запись)
+    """
+    return (
+            _FULL_BLOCK.pack(_ALL_FIELDS, 0, base_salary, RATES.month_index[month],
+                             sum_days, night_shifts, evening_shifts, temperature_work)
+            + bytes((len(children), *children, len(alimony), *alimony))
+            + _UINT16.pack(year)
+    )
+
+
+def _decode_full(payload: bytes, offset: int) -> tuple[list, int]:
+    """Значения блока со всеми упакованными полями и смещение следующего блока"""
+    _, _, base_salary, month, *days = _FULL_BLOCK.unpack_from(payload, offset)
+    offset += _FULL_BLOCK.size
+    count = payload[offset]
+    children = tuple(payload[offset + 1:offset + 1 + count])
+    offset += 1 + count
+    count = payload[offset]
+    alimony = tuple(payload[offset + 1:offset + 1 + count])
+    offset += 1 + count
+    (year,) = _UINT16.unpack_from(payload, offset)
+    return [base_salary, RATES.months[month], *days, children, alimony, year], offset + _UINT16.size
+
+
+def _pack_value(packing, value) -> bytes | None:
+    """Упаковка разобранного значения поля (None - не помещается в формат)"""
+    if packing is _MONTH:
+        index = RATES.month_index.get(value)
+        return None if index is None else _UINT8.pack(index)
+    if packing is _LIST:
+        if len(value) > 255 or not all(0 <= number <= 255 for number in value):
+            return None
+        return _UINT8.pack(len(value)) + bytes(value)
+    if not 0 <= value < 1 << (packing.size * 8):
+        return None
+    return packing.pack(value)
+
+
+@lru_cache(maxsize=1024)
+def _list_numbers(text: str) -> tuple[int, ...] | None:
+    """Числа списка, если строка в точности их запись через запятую (None - нет)"""
+    numbers = parse_numbers(text)
+    return numbers if ",".join(map(str, numbers)) == text else None
+
+
+@lru_cache(maxsize=1024)
+def _list_text(numbers: tuple[int, ...]) -> str:
+    return ",".join(map(str, numbers))
+
+
+def _parse_text(packing, text: str):
+    """Разбор строки поля, если она однозначно восстанавливается из значения (None - нет)"""
+    if packing is _MONTH:
+        return text
+    if packing is _LIST:
+        return _list_numbers(text)
+    if text.isascii() and text.isdigit() and (text[0] != "0" or text == "0"):
+        return int(text)
+    return None
+
+
+def _to_text(packing, value) -> str:
+    """Строка поля в формате BaseSalary.to_dict"""
+    if packing is _MONTH:
+        return value
+    return _list_text(value) if packing is _LIST else str(value)
+
+
+def _encode_fields(kind: int, values) -> bytes:
+    """Запись полей: разобранные значения упакованы, остальные - строкой с длиной"""
+    present = raw = 0
+    body = []
+    for bit, ((name, packing), value) in enumerate(zip(_FIELDS, values)):
+        if value is None:
+            continue
+        present |= 1 << bit
+        if kind == KIND_SALARY:
+            parsed = _parse_text(packing, value)
+            packed = None if parsed is None else _pack_value(packing, parsed)
+        else:
+            packed = _pack_value(packing, value)
+        if packed is None:
+            if isinstance(value, str):
+                text = value
+            else:
+                text = ",".join(map(str, value)) if packing is _LIST else str(value)
+            encoded = text.encode()
+            packed = _LENGTH.pack(len(encoded)) + encoded
+            raw |= 1 << bit
+        body.append(packed)
+    return _BLOCK.pack(present, raw) + b"".join(body)
+
+
+def _decode_fields(kind: int, payload: bytes, offset: int) -> tuple[list, int]:
+    """Значения полей блока и смещение следующего блока"""
+    present, raw = _BLOCK.unpack_from(payload, offset)
+    if present == _ALL_FIELDS and not raw:
+        values, offset = _decode_full(payload, offset)
+        if kind == KIND_SALARY:
+            values = [_to_text(packing, value) for (_, packing), value in zip(_FIELDS, values)]
+        return values, offset
+    offset += _BLOCK.size
+    values = []
+    for bit, (name, packing) in enumerate(_FIELDS):
+        if not present >> bit & 1:
+            values.append(None)
+            continue
+        if raw >> bit & 1:
+            (length,) = _LENGTH.unpack_from(payload, offset)
+            offset += _LENGTH.size
+            text = payload[offset:offset + length].decode()
+            offset += length
+            if kind == KIND_SALARY:
+                values.append(text)
+            elif packing is _LIST:
+                values.append(parse_numbers(text))
+            else:
+                values.append(text if packing is _MONTH else int(text))
+            continue
+        if packing is _MONTH:
+            value = RATES.months[payload[offset]]
+            offset += 1
+        elif packing is _LIST:
+            count = payload[offset]
+            value = tuple(payload[offset + 1:offset + 1 + count])
+            offset += 1 + count
+        else:
+            (value,) = packing.unpack_from(payload, offset)
+            offset += packing.size
+        values.append(_to_text(packing, value) if kind == KIND_SALARY else value)
+    return values, offset
+
+
+def _encode_block(kind: int, values: list) -> bytes:
+    """Блок полей: быстрая запись, если все поля заданы и помещаются в формат, иначе общая"""
+    if kind == KIND_SALARY:
+        typed = [None if text is None else _parse_text(packing, text) for (_, packing), text in zip(_FIELDS, values)]
+    else:
+        typed = values
+    if None not in typed:
+        try:
+            return _encode_full(*typed)
+        except (struct.error, KeyError, ValueError):
+            pass
+    return _encode_fields(kind, values)
+
+
+def encode_state(data: dict) -> bytes:
+    """Данные состояния FSM в двоичную запись текущей версии"""
+    salary = data.get("salary")
+    if isinstance(salary, BaseSalary):
+        salary = salary.to_dict()
+        data = {**data, "salary": salary}
+    record = data.get("record")
+    # Двоичные блоки - только для ввода словарем и готовой записи; остальное (в том числе None) - JSON
+    if data.keys() - {"salary", "record"} or "salary" in data and not isinstance(salary, dict) \
+            or "record" in data and not isinstance(record, SalaryRecord):
+        payload = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode()
+        return _HEADER.pack(FORMAT_VERSION, KIND_JSON) + payload
+
+    kind = 0
+    blocks = []
+    if "salary" in data:
+        kind |= KIND_SALARY
+        blocks.append(_encode_block(KIND_SALARY, [salary.get(f"_{name}") for name, _ in _FIELDS]))
+    if "record" in data:
+        kind |= KIND_RECORD
+        blocks.append(_encode_block(KIND_RECORD, [getattr(record, name) for name, _ in _FIELDS]))
+    return _HEADER.pack(FORMAT_VERSION, kind) + b"".join(blocks)
+
+
+def decode_state(payload: bytes) -> dict:
+    """Данные состояния FSM из двоичной записи.
+
+    Ввод возвращается словарем BaseSalary.to_dict (восстанавливается через BaseSalary.from_dict),
+    готовая запись расчета - объектом SalaryRecord.
+    """
+    version, kind = _HEADER.unpack_from(payload)
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Неподдерживаемая версия состояния ({version}), ожидается {FORMAT_VERSION}.")
+    if kind == KIND_JSON:
+        return json.loads(payload[_HEADER.size:])
+    if kind & ~(KIND_SALARY | KIND_RECORD):
+        raise ValueError(f"Неизвестный состав состояния ({kind}).")
+
+    data = {}
+    offset = _HEADER.size
+    if kind & KIND_SALARY:
+        values, offset = _decode_fields(KIND_SALARY, payload, offset)
+        data["salary"] = {f"_{name}": value for (name, _), value in zip(_FIELDS, values)}
+    if kind & KIND_RECORD:
+        values, offset = _decode_fields(KIND_RECORD, payload, offset)
+        data["record"] = SalaryRecord(**{name: value for (name, _), value in zip(_FIELDS, values)})
+    return data
@@ -0,0 +1,93 @@
+from decimal import Decimal
+
+from salary_dgs import calculations
+from salary_dgs.models import parse_numbers
+
+# Поля с количеством смен (хранятся как Decimal с двумя знаками)
+_DAY_FIELDS = ("sum_days", "night_shifts", "evening_shifts", "temperature_work")
+
+
+def _input_value(field: str, value):
+    """Значение варианта в формате salary_inputs"""
+    if field == "base_salary":
+        return Decimal(int(value))
+    if field == "year":
+        return int(value)
+    if field in _DAY_FIELDS:
+        return Decimal(int(value)).quantize(calculations.CENTS)
+    if field == "month":
+        return str(value).strip().lower()
+    if field in ("children", "alimony"):
+        return tuple(map(int, value)) if isinstance(value, tuple) else parse_numbers(str(value))
+    raise ValueError(f"Неизвестное поле варианта ({field}).")
+
+
+def _is_valid(values: dict) -> bool:
+    """Перекрестные правила ввода: смены не превышают общего количества дней"""
+    return (
+        values["night_shifts"] + values["evening_shifts"] <= values["sum_days"]
+        and values["temperature_work"] <= values["sum_days"]
+    )
+
+
+class SweepResult:
+    """Сетка результатов по вариантам входных данных"""
+
+    def __init__(self, axes: tuple, axis_values: tuple, grid: dict):
+        self.axes = axes  # Имена изменяемых полей
+        self.axis_values = axis_values  # Значения по каждому полю
+        self.grid = grid  # Кортеж значений полей -> значения шагов расчета (None, если вариант недопустим)
+
+    def value(self, *point, output: str = "calculation_answer"):
+        values = self.grid[point]
+        return None if values is None else values[output]
+
+    def table(self, output: str = "calculation_answer", scale: Decimal = Decimal(1)) -> str:
+        """Компактная текстовая таблица: строки - первое поле, столбцы - второе"""
+        def cell(value):
+            if value is None:
+                return "-"
+            return str(value) if scale == 1 else str((value / scale).quantize(Decimal("0.1")))
+
+        rows_values = self.axis_values[0]
+        columns_values = self.axis_values[1] if len(self.axes) > 1 else (None,)
+        cells = [
+            [cell(self.value(*((row,) if column is None else (row, column)), output=output))
+             for column in columns_values]
+            for row in rows_values
+        ]
+        header = [f"{self.axes[0]}\\{self.axes[1]}" if len(self.axes) > 1 else self.axes[0]]
+        header += [str(column) for column in columns_values] if len(self.axes) > 1 else [output]
+        lines = [header] + [[str(row)] + row_cells for row, row_cells in zip(rows_values, cells)]
+        widths = [max(len(line[index]) for line in lines) for index in range(len(header))]
+        return "\n".join(
+            " ".join(text.rjust(width) for text, width in zip(line, widths)) for line in lines
+        )
+
+
+def sweep(salary_data, **axes) -> SweepResult:
+    """Расчет сетки вариантов по полям BaseSalary.
+
+    Пример: sweep(salary, sum_days=range(18, 24), night_shifts=range(0, 11)).
+    Варианты перебираются по порядку полей: при смене значения поля пересчитываются
+    только шаги графа, зависящие от этого поля, а результаты внешних полей переиспользуются.
+    """
+    inputs = calculations.salary_inputs(salary_data)
+    base_values = dict(inputs)
+    base_values.update(calculations.evaluate(inputs))
+
+    names = tuple(axes)
+    axis_values = tuple(tuple(values) for values in axes.values())
+    parsed = [[_input_value(name, value) for value in values] for name, values in zip(names, axis_values)]
+
+    grid = {}
+
+    def walk(level: int, values: dict, point: tuple):
+        if level == len(names):
+            grid[point] = values if _is_valid(values) else None
+            return
+        for raw, value in zip(axis_values[level], parsed[level]):
+            walk(level + 1, calculations.reevaluate(values, {names[level]: value}), point + (raw,))
+
+    walk(0, base_values, ())
+    return SweepResult(names, axis_values, grid)
@@ -1,15 +1,215 @@
 from functools import wraps
 
+from salary_dgs.constant import MAX_BASE_SALARY
+from salary_dgs.production_calendar import available_years
+
+# Проверки отдельных значений без состояния объекта: возвращают значение для сеттера
+# или поднимают ValueError. Используются декораторами сеттеров BaseSalary и пакетной проверкой.
+
+
+def check_base_salary(value: str) -> str:
+    """Проверка базового оклада"""
+    if value == "":
+        raise ValueError("Значение не может быть пустым.")
+    if not value.isdigit():
+        raise ValueError(f"Некорректное значение ({value}), ожидается число.")
+    if int(value) > MAX_BASE_SALARY:
+        raise ValueError(f"Оклад не может быть больше {MAX_BASE_SALARY}.")
+    return value
+
+
+def check_month(value: str, month_in_year) -> str:
+    """Проверка месяца"""
+    if value == "":
+        raise ValueError("Значение не может быть пустым.")
+    if not value.lower().strip() in month_in_year:
+        raise ValueError(f"Некорректное значение ({value}), ожидается месяц года.")
+    return value
+
+
+def check_sum_days(value: str) -> str:
+    """Проверка количества дней"""
+    if value == "":
+        raise ValueError("Значение не может быть пустым.")
+    if not value.isdigit():
+        raise ValueError(f"Некорректное значение ({value}), ожидается число.")
+    if not int(value) <= 31:
+        raise ValueError("Значение должно быть не больше - 31.")
+    return value
+
+
+def check_night_shifts(value: str, sum_days: int = None) -> str:
+    """Проверка ночных смен (sum_days=None - без сравнения с общим количеством дней)"""
+    # Конвертируем в числа и проверяем
+    if value == "":
+        raise ValueError("Значение не может быть пустым.")
+    if not value.isdigit():
+        raise ValueError(f"Некорректное значение ({value}), ожидается число.")
+
+    night_shifts = int(value)
+
+    # Основная валидация
+    if sum_days is not None and night_shifts > sum_days:
+        raise ValueError(
+                f"Количество ночных смен ({night_shifts})\n"
+                f"не может превышать общее количество дней ({sum_days})"
+        )
+    return value
+
+
+def check_evening_shifts(value: str, sum_days: int = None, night_shifts: int = None) -> str:
+    """Проверка вечерних смен (без sum_days или night_shifts - без сравнения сумм)"""
+    # Конвертируем в числа и проверяем
+    if value == "":
+        raise ValueError("Значение не может быть пустым.")
+    if not value.isdigit():
+        raise ValueError(f"Некорректное значение ({value}), ожидается число.")
+
+    evening_shifts = int(value)
+
+    # Основная валидация
+    if sum_days is not None and night_shifts is not None and night_shifts + evening_shifts > sum_days:
+        raise ValueError(
+                f"Сумма ночных ({night_shifts}) и вечерних ({evening_shifts}) смен "
+                f"не может превышать общее количество дней ({sum_days})"
+        )
+    return value
+
+
+def check_temperature_work(value: str, sum_days: int = None) -> str:
+    """Проверка количества дней работы в температуре"""
+    if value == "":
+        raise ValueError("Значение не может быть пустым.")
+    if not value.isdigit():
+        raise ValueError(f"Некорректное значение ({value}), ожидается число.")
+    if not int(value) <= 31:
+        raise ValueError("Значение должно быть не больше 31.")
+
+    # Конвертируем в числа и проверяем
+    temperature_work = int(value)
+
+    if sum_days is not None and temperature_work > sum_days:
+        raise ValueError(
+                f"Количество дней ({temperature_work}) "
+                f"работы в температуре не должно превышать общее количество дней ({sum_days})"
+        )
+    return value
+
+
+def check_children(value: str) -> str:
+    """Проверка ввода количества детей.
+
+    Проверяет:
+    - что значение не пустое
+    - что ввод состоит из чисел, разделенных запятыми
+    - что числа находятся в допустимом диапазоне (1-10)
+    - что нет повторяющихся номеров
+    - что номера идут последовательно без пропусков
+
+    Возвращает номера по возрастанию через запятую.
+    """
+    if not value.strip():
+        raise ValueError("Значение не может быть пустым.")
+
+    value_repl = value.strip().replace(".", ",")
+
+    children = []
+    for part in value_repl.split(","):
+        part = part.strip()
+        if not part.isdigit():
+            raise ValueError(
+                    f"Некорректное значение ({part}). Должно быть целое число."
+            )
+
+        child_num = int(part)
+        # if child_num < 1:
+        #     raise ValueError(f"Номер ребенка не может быть меньше 1 (получено {child_num}).")
+        if child_num > 10:
+            raise ValueError(
+                    f"Расчет позволяет ввести не более 10 детей. Получено: ({len(children) + 1})."
+            )
+
+        if child_num in children:
+            raise ValueError(f"Последовательность детей ({child_num}) указано повторно.")
+
+        children.append(child_num)
+
+    # Проверка последовательности
+    if len(children) > 1:
+        sorted_children = sorted(children)
+        for i in range(1, len(sorted_children)):
+            if sorted_children[i] != sorted_children[i - 1] + 1:
+                raise ValueError(
+                        f"Не соблюдается последовательность детей. "
+                        f"Обнаружен пропуск между ({sorted_children[i - 1]}) и ({sorted_children[i]})"
+                )
+
+    return ",".join(map(str, sorted(children)))
+
+
+def check_alimony(value: str) -> str:
+    """Проверка ввода количества алиментов.
+
+    Проверяет:
+    - что значение не пустое
+    - что ввод состоит из чисел, разделенных запятыми
+    - что числа находятся в допустимом диапазоне (16-70)
+
+    Возвращает проценты по возрастанию через запятую.
+    """
+    if not value.strip():
+        raise ValueError("Значение не может быть пустым.")
+
+    value_repl = value.strip().replace(".", ",")
+    alimony_options = [16, 25, 33, 70]
+
+    alimony_list = []
+    for part in value_repl.split(","):
+        part = part.strip()
+        if not part.isdigit():
+            raise ValueError(
+                    f"Некорректное значение ({part}). Должно быть число."
+            )
+
+        alimony_num = int(part)
+        if alimony_num != 0:
+            if alimony_num < 16:
+                raise ValueError(f"Слишком маленький процент: ({alimony_num}). Минимум 16.")
+            if alimony_num > 70:
+                raise ValueError(
+                        f"Слишком большой процент: ({alimony_num}). Максимум 70."
+                )
+            if alimony_num not in alimony_options:
+                raise ValueError(
+                        f"Некорректный процент ({alimony_num}). "
+                        f"Допустимые значения: {alimony_options}."
+                )
+
+        alimony_list.append(alimony_num)
+
+    return ",".join(map(str, sorted(alimony_list)))
+
+
+def check_year(value: str) -> str:
+    """Проверка года: должен быть файл производственного календаря"""
+    if value == "":
+        raise ValueError("Значение не может быть пустым.")
+    if not value.strip().isdigit():
+        raise ValueError(f"Некорректное значение ({value}), ожидается год.")
+    years = available_years()
+    if int(value) not in years:
+        raise ValueError(
+                f"Нет производственного календаря на {value.strip()} год, "
+                f"доступны: {', '.join(map(str, years))}."
+        )
+    return value
+
 
 def validate_base_salary(func):
     """Валидация базового оклада"""
 
     def wrapper(self, value):
-        if value == "":
-            raise ValueError("Значение не может быть пустым.")
-        if not value.isdigit():
-            raise ValueError(f"Некорректное значение ({value}), ожидается число.")
-        return func(self, value)
+        return func(self, check_base_salary(value))
 
     return wrapper
 
@@ -19,11 +219,7 @@ def validate_month(month_in_year):  # декоратор с параметром
 
     def decorator(func):
         def wrapper(self, value):
-            if value == "":
-                raise ValueError("Значение не может быть пустым.")
-            if not value.lower().strip() in month_in_year:
-                raise ValueError(f"Некорректное значение ({value}), ожидается месяц года.")
-            return func(self, value)
+            return func(self, check_month(value, month_in_year))
 
         return wrapper
 
@@ -34,13 +230,7 @@ def validate_days_night_evening_temperature(func):
     """Валидация количества дней"""
 
     def wrapper(self, value):
-        if value == "":
-            raise ValueError("Значение не может быть пустым.")
-        if not value.isdigit():
-            raise ValueError(f"Некорректное значение ({value}), ожидается число.")
-        if not int(value) <= 31:
-            raise ValueError("Значение должно быть не больше - 31.")
-        return func(self, value)
+        return func(self, check_sum_days(value))
 
     return wrapper
 
@@ -49,23 +239,7 @@ def validate_night_shifts(func):  # декоратор с параметром
     """Валидация ночных смен"""
 
     def wrapper(self, value):
-        # Конвертируем в числа и проверяем
-        if value == "":
-            raise ValueError("Значение не может быть пустым.")
-        if not value.isdigit():
-            raise ValueError(f"Некорректное значение ({value}), ожидается число.")
-
-        sum_days = int(self._sum_days)
-        night_shifts = int(value)
-
-        # Основная валидация
-        if night_shifts > sum_days:
-            raise ValueError(
-                    f"Количество ночных смен ({night_shifts})\n"
-                    f"не может превышать общее количество дней ({sum_days})"
-            )
-
-        return func(self, value)
+        return func(self, check_night_shifts(value, self._sum_days))
 
     return wrapper
 
@@ -74,24 +248,7 @@ def validate_evening_shifts(func):  # декоратор с параметром
     """Валидация вечерних смен"""
 
     def wrapper(self, value):
-        # Конвертируем в числа и проверяем
-        if value == "":
-            raise ValueError("Значение не может быть пустым.")
-        if not value.isdigit():
-            raise ValueError(f"Некорректное значение ({value}), ожидается число.")
-
-        sum_days = int(self._sum_days)
-        night_shifts = int(self._night_shifts)
-        evening_shifts = int(value)
-
-        # Основная валидация
-        if night_shifts + evening_shifts > sum_days:
-            raise ValueError(
-                    f"Сумма ночных ({night_shifts}) и вечерних ({evening_shifts}) смен "
-                    f"не может превышать общее количество дней ({sum_days})"
-            )
-
-        return func(self, value)
+        return func(self, check_evening_shifts(value, self._sum_days, self._night_shifts))
 
     return wrapper
 
@@ -100,123 +257,35 @@ def validate_days_temperature_work(func):
     """Валидация количества дней работы в температуре"""
 
     def wrapper(self, value):
-        if value == "":
-            raise ValueError("Значение не может быть пустым.")
-        if not value.isdigit():
-            raise ValueError(f"Некорректное значение ({value}), ожидается число.")
-        if not int(value) <= 31:
-            raise ValueError("Значение должно быть не больше 31.")
-
-        # Конвертируем в числа и проверяем
-        sum_days = int(self._sum_days)
-        temperature_work = int(value)
-
-        if temperature_work > sum_days:
-            raise ValueError(
-                    f"Количество дней ({temperature_work}) "
-                    f"работы в температуре не должно превышать общее количество дней ({sum_days})"
-            )
-
-        return func(self, value)
+        return func(self, check_temperature_work(value, self._sum_days))
 
     return wrapper
 
 
 def validate_children(func):
-    """Декоратор для валидации ввода количества детей.
-
-    Проверяет:
-    - что значение не пустое
-    - что ввод состоит из чисел, разделенных запятыми
-    - что числа находятся в допустимом диапазоне (1-10)
-    - что нет повторяющихся номеров
-    - что номера идут последовательно без пропусков
-    """
+    """Декоратор для валидации ввода количества детей (см. check_children)"""
 
     @wraps(func)
     def wrapper(self, value):
-        if not value.strip():
-            raise ValueError("Значение не может быть пустым.")
-
-        value_repl = value.strip().replace(".", ",")
-
-        children = []
-        for part in value_repl.split(","):
-            part = part.strip()
-            if not part.isdigit():
-                raise ValueError(
-                        f"Некорректное значение ({part}). Должно быть целое число."
-                )
-
-            child_num = int(part)
-            # if child_num < 1:
-            #     raise ValueError(f"Номер ребенка не может быть меньше 1 (получено {child_num}).")
-            if child_num > 10:
-                raise ValueError(
-                        f"Расчет позволяет ввести не более 10 детей. Получено: ({len(children) + 1})."
-                )
-
-            if child_num in children:
-                raise ValueError(f"Последовательность детей ({child_num}) указано повторно.")
-
-            children.append(child_num)
-
-        # Проверка последовательности
-        if len(children) > 1:
-            sorted_children = sorted(children)
-            for i in range(1, len(sorted_children)):
-                if sorted_children[i] != sorted_children[i - 1] + 1:
-                    raise ValueError(
-                            f"Не соблюдается последовательность детей. "
-                            f"Обнаружен пропуск между ({sorted_children[i - 1]}) и ({sorted_children[i]})"
-                    )
-
-        return func(self, ",".join(map(str, sorted(children))))
+        return func(self, check_children(value))
 
     return wrapper
 
 
 def validate_alimony(func):
-    """Декоратор для валидации ввода количества алиментов.
-
-    Проверяет:
-    - что значение не пустое
-    - что ввод состоит из чисел, разделенных запятыми
-    - что числа находятся в допустимом диапазоне (16-70)
-    """
+    """Декоратор для валидации ввода количества алиментов (см. check_alimony)"""
 
     @wraps(func)
     def wrapper(self, value):
-        if not value.strip():
-            raise ValueError("Значение не может быть пустым.")
+        return func(self, check_alimony(value))
 
-        value_repl = value.strip().replace(".", ",")
-        alimony_options = [16, 25, 33, 70]
+    return wrapper
 
-        alimony_list = []
-        for part in value_repl.split(","):
-            part = part.strip()
-            if not part.isdigit():
-                raise ValueError(
-                        f"Некорректное значение ({part}). Должно быть число."
-                )
 
-            alimony_num = int(part)
-            if alimony_num != 0:
-                if alimony_num < 16:
-                    raise ValueError(f"Слишком маленький процент: ({alimony_num}). Минимум 16.")
-                if alimony_num > 70:
-                    raise ValueError(
-                            f"Слишком большой процент: ({alimony_num}). Максимум 70."
-                    )
-                if alimony_num not in alimony_options:
-                    raise ValueError(
-                            f"Некорректный процент ({alimony_num}). "
-                            f"Допустимые значения: {alimony_options}."
-                    )
-
-            alimony_list.append(alimony_num)
-
-        return func(self, ",".join(map(str, sorted(alimony_list))))
+def validate_year(func):
+    """Валидация года: должен быть файл производственного календаря"""
+
+    def wrapper(self, value):
+        return func(self, check_year(value))
 
     return wrapper
@@ -0,0 +1,80 @@
+"""Сверка с расчетом исходной версии бота (нормы месяцев 2025 года).
+
+tests/data/baseline_2025.csv - результаты исходной версии на сетке входных данных:
+12 месяцев, два оклада, три набора смен, с детьми и без, с алиментами и без.
+Начисления месяца на сетке ниже предельного дохода для вычета на детей
+(в исходной версии предела не было).
+"""
+import asyncio
+import csv
+from decimal import Decimal
+from pathlib import Path
+
+from aiogram import Dispatcher
+from aiogram.fsm.storage.memory import MemoryStorage
+
+from benchmarks.fake_bot import FakeSession, UserScript, make_bot, run_flow
+from salary_dgs import calculations
+from salary_dgs.constant import EN_TO_RU_MONTHS
+from salary_dgs.models import BaseSalary
+
+BASELINE = Path(__file__).parent / "data" / "baseline_2025.csv"
+INPUT_FIELDS = ("base_salary", "month", "sum_days", "night_shifts", "evening_shifts", "temperature_work",
+                "children", "alimony")
+
+
+def baseline_rows() -> list[dict]:
+    with open(BASELINE, encoding="utf-8", newline="") as file:
+        return list(csv.DictReader(file))
+
+
+def test_year_2025_matches_baseline():
+    mismatches = []
+    for row in baseline_rows():
+        salary = BaseSalary()
+        for field in INPUT_FIELDS:
+            setattr(salary, field, row[field])
+        salary.year = "2025"
+        breakdown = calculations.calculate_breakdown(salary)
+        for column, expected in row.items():
+            if column.startswith("calculation_"):
+                actual = getattr(breakdown, column.removeprefix("calculation_"))
+                if actual != Decimal(expected):
+                    mismatches.append((row["month"], row["base_salary"], column, expected, actual))
+    assert mismatches == []
+
+
+class RecordingSession(FakeSession):
+    """Сессия офлайн-бота, запоминающая тексты отправленных сообщений"""
+
+    def __init__(self):
+        super().__init__()
+        self.texts = []
+
+    async def make_request(self, bot, method, timeout=None):
+        text = getattr(method, "text", None)
+        if text:
+            self.texts.append(text)
+        return await super().make_request(bot, method, timeout)
+
+
+def test_bot_flow_with_selected_year():
+    """Год выбирается на шаге месяца и не зависит от текущей даты"""
+    import main_bot
+
+    row = next(row for row in baseline_rows() if row["month"] == "декабрь" and row["children"] == "1,2")
+    month = next(en for en, ru in EN_TO_RU_MONTHS.items() if ru == row["month"])
+    dispatcher = Dispatcher(storage=MemoryStorage())
+    dispatcher.include_router(main_bot.router)
+    bot = make_bot()
+    bot.session = RecordingSession()
+    flow = (
+        ("text", "/start"),
+        ("callback", "start"),
+        ("text", row["base_salary"]),
+        ("callback", "year_2025"),
+        ("callback", f"month_{month}"),
+        *(("text", row[field]) for field in INPUT_FIELDS[2:]),
+    )
+    asyncio.run(run_flow(dispatcher, bot, UserScript(777), flow))
+    assert any(f"*{row['calculation_answer']} ₽*" in text for text in bot.session.texts)
@@ -0,0 +1,147 @@
+import csv
+import io
+import random
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from salary_dgs import calculations
+from salary_dgs.batch import BATCH_COMPONENTS, BATCH_FIELDS, EmployeeBatch, calculate_batch
+from salary_dgs.constant import MAX_BASE_SALARY
+from salary_dgs.csv_batch import RESULT_FIELDS, stream_calculate
+from salary_dgs.kopecks import to_amount, to_kopecks
+from salary_dgs.parallel import calculate_parallel
+from salary_dgs.production_calendar import available_years
+from salary_dgs.rates import RATES
+
+CHILDREN = ((), (0,), (1,), (1, 2), (2, 3), (1, 2, 3), (1, 2, 3, 4))
+ALIMONY = ((0,), (16,), (25,), (33,), (70,), (25, 25), (16, 33), (25, 33))
+
+
+def random_columns(rows: int, seed: int = 1) -> dict:
+    """Случайные допустимые колонки пакета (дети и алименты - строками, как в BaseSalary)"""
+    rnd = random.Random(seed)
+    columns = {field: [] for field in (
+        "base_salary", "month", "sum_days", "night_shifts",
+        "evening_shifts", "temperature_work", "children", "alimony", "year",
+    )}
+    years = available_years()
+    for _ in range(rows):
+        sum_days = rnd.randint(0, 31)
+        night_shifts = rnd.randint(0, sum_days)
+        columns["base_salary"].append(str(rnd.randint(1, 1_000_000)))
+        columns["month"].append(rnd.choice(RATES.months))
+        columns["sum_days"].append(str(sum_days))
+        columns["night_shifts"].append(str(night_shifts))
+        columns["evening_shifts"].append(str(rnd.randint(0, sum_days - night_shifts)))
+        columns["temperature_work"].append(str(rnd.randint(0, sum_days)))
+        columns["children"].append(",".join(map(str, rnd.choice(CHILDREN))))
+        columns["alimony"].append(",".join(map(str, rnd.choice(ALIMONY))))
+        columns["year"].append(str(rnd.choice(years)))
+    return columns
+
+
+def row_result(record, prior_income: int) -> dict:
+    result = calculations.calculate(
+        Decimal(record.base_salary),
+        record.month,
+        Decimal(record.sum_days).quantize(calculations.CENTS),
+        Decimal(record.night_shifts).quantize(calculations.CENTS),
+        Decimal(record.evening_shifts).quantize(calculations.CENTS),
+        Decimal(record.temperature_work).quantize(calculations.CENTS),
+        record.children,
+        record.alimony,
+        to_amount(prior_income),
+        record.year,
+    )
+    return {component: to_kopecks(result[component]) for component in BATCH_COMPONENTS}
+
+
+def test_batch_matches_calculate_row_by_row():
+    batch = EmployeeBatch.from_columns(random_columns(3000))
+    # Половина строк с доходом с начала года (в том числе выше предела вычета на детей)
+    rng = np.random.default_rng(1)
+    prior_income = np.where(np.arange(len(batch)) % 2, rng.integers(0, 60_000_000, len(batch)), 0)
+    result = calculate_batch(batch, prior_income)
+    mismatches = [
+        (row, component)
+        for row, record in enumerate(batch.to_records())
+        for component, expected in row_result(record, int(prior_income[row])).items()
+        if int(result[component][row]) != expected
+    ]
+    assert mismatches == []
+
+
+def test_no_alimony_without_children():
+    columns = random_columns(1)
+    columns["children"], columns["alimony"] = [""], ["25"]
+    assert calculate_batch(columns)["alimony"].tolist() == [0]
+
+
+def random_rows(rows: int, seed: int) -> list[dict]:
+    """Строки-словари как из csv.DictReader, каждая пятая - без детей (children="") с алиментами"""
+    columns = random_columns(rows, seed)
+    for row in range(0, rows, 5):
+        columns["children"][row], columns["alimony"][row] = "", "25"
+    return [{field: columns[field][row] for field in BATCH_FIELDS} for row in range(rows)]
+
+
+def test_batch_paths_match_calculate():
+    """EmployeeBatch.from_rows, calculate_parallel и stream_calculate совпадают с построчным расчетом"""
+    rows = random_rows(600, seed=2)
+    batch = EmployeeBatch.from_rows(rows)
+    expected = [row_result(record, 0) for record in batch.to_records()]
+
+    def mismatches(result: dict, indexes) -> list:
+        return [
+            (row, component)
+            for position, row in enumerate(indexes)
+            for component in BATCH_COMPONENTS
+            if int(result[component][position]) != expected[row][component]
+        ]
+
+    assert mismatches(calculate_batch(batch), range(len(rows))) == []
+    assert mismatches(calculate_parallel(batch, workers=2, shard_size=150), range(len(rows))) == []
+
+    # Строки с пустым children не проходят проверку ввода, остальные считаются пакетами
+    output, rejects = io.StringIO(), io.StringIO()
+    stream_calculate(rows, output, rejects_file=rejects, chunk_size=250, workers=2)
+    written = list(csv.DictReader(io.StringIO(output.getvalue())))
+    indexes = [int(line["row"]) - 1 for line in written]
+    assert indexes and not set(indexes) & set(range(0, len(rows), 5))
+    streamed = {
+        component: [to_kopecks(Decimal(line[field])) for line in written]
+        for component, field in zip(BATCH_COMPONENTS, RESULT_FIELDS)
+    }
+    assert mismatches(streamed, indexes) == []
+
+
+def test_max_base_salary_matches_calculate():
+    """На границе MAX_BASE_SALARY с наибольшими сменами в месяцах с самой малой нормой часов нет переполнения"""
+    columns = {field: [] for field in BATCH_FIELDS}
+    for year in available_years():
+        for month in RATES.months:
+            for night_shifts, evening_shifts, temperature_work in ((31, 0, 31), (0, 31, 31), (16, 15, 0)):
+                for field, value in zip(BATCH_FIELDS, (
+                    MAX_BASE_SALARY, month, 31, night_shifts, evening_shifts, temperature_work,
+                    "1,2", "16,33", year,
+                )):
+                    columns[field].append(str(value))
+    batch = EmployeeBatch.from_columns(columns)
+    result = calculate_batch(batch)
+    mismatches = [
+        (row, component)
+        for row, record in enumerate(batch.to_records())
+        for component, expected in row_result(record, 0).items()
+        if int(result[component][row]) != expected
+    ]
+    assert mismatches == []
+
+
+@pytest.mark.parametrize("base_salary", [str(MAX_BASE_SALARY + 1), "50000000000000", "99999999999999999999", "-1"])
+def test_base_salary_above_limit_is_rejected(base_salary):
+    columns = random_columns(2)
+    columns["base_salary"][1] = base_salary
+    with pytest.raises(ValueError, match=str(MAX_BASE_SALARY)):
+        EmployeeBatch.from_columns(columns)
@@ -0,0 +1,89 @@
+import pytest
+
+from salary_dgs.batch import BATCH_FIELDS
+from salary_dgs.bulk_validation import (
+    FieldError, ValidationReport, iter_validated, valid_rows, validate_row, validate_rows,
+)
+from salary_dgs.production_calendar import default_year
+
+ROW = {
+    "base_salary": "85000", "month": "Март", "sum_days": "22", "night_shifts": "7",
+    "evening_shifts": "6", "temperature_work": "3", "children": "2.1", "alimony": "25", "year": "2025",
+}
+
+
+def test_valid_row_is_normalised():
+    result = validate_row(ROW, 7)
+    assert result.errors == []
+    assert result.row == 7
+    assert result.values == dict(ROW, month="март", children="1,2")
+
+
+def test_missing_year_is_default():
+    assert validate_row(dict(ROW, year=" ")).values["year"] == str(default_year())
+    row = dict(ROW)
+    del row["year"]
+    assert validate_row(row).values["year"] == str(default_year())
+
+
+@pytest.mark.parametrize("field, value", [
+    ("base_salary", ""),
+    ("base_salary", "85 000"),
+    ("base_salary", "1000000001"),
+    ("month", "мартобрь"),
+    ("sum_days", "32"),
+    ("night_shifts", "23"),
+    ("evening_shifts", "16"),
+    ("temperature_work", "23"),
+    ("children", "1,3"),
+    ("alimony", "20"),
+    ("year", "1999"),
+])
+def test_error_in_each_field(field, value):
+    result = validate_row(dict(ROW, **{field: value}), 3)
+    assert [(error.row, error.field, error.value) for error in result.errors] == [(3, field, value)]
+    assert result.values[field] is None
+
+
+def test_cross_rules_skip_invalid_base_field():
+    """Смены не сравниваются с некорректным общим количеством дней"""
+    result = validate_row(dict(ROW, sum_days="x", night_shifts="40"))
+    assert [error.field for error in result.errors] == ["sum_days"]
+    # Вечерние смены без корректных ночных не сравниваются с общим количеством дней
+    result = validate_row(dict(ROW, night_shifts="x", evening_shifts="30"))
+    assert [error.field for error in result.errors] == ["night_shifts"]
+
+
+def test_all_errors_of_row_are_collected():
+    result = validate_row(dict(ROW, base_salary="", month="", children="", alimony="abc"))
+    assert [error.field for error in result.errors] == ["base_salary", "month", "children", "alimony"]
+
+
+def test_report_counts():
+    rows = [ROW, dict(ROW, month="x"), ROW, dict(ROW, sum_days="40", children=""), dict(ROW, alimony="99")]
+    report = validate_rows(rows, max_errors=2, start=1)
+    assert (report.rows, report.valid_rows, report.invalid_rows) == (5, 2, 3)
+    assert {field: count for field, count in report.field_errors.items() if count} == {
+        "month": 1, "sum_days": 1, "children": 1, "alimony": 1,
+    }
+    # Хранятся только первые max_errors ошибок
+    assert [(error.row, error.field) for error in report.errors] == [(2, "month"), (4, "sum_days")]
+    lines = report.summary().splitlines()
+    assert lines[0] == "Проверено строк: 5, без ошибок: 2, с ошибками: 3"
+    assert lines[1:5] == ["month: 1", "sum_days: 1", "children: 1", "alimony: 1"]
+    assert lines[5].startswith("строка 2, month (x):")
+
+
+def test_iter_and_valid_rows():
+    rows = [ROW, dict(ROW, base_salary="-1"), ROW]
+    assert [result.row for result in iter_validated(rows, start=1)] == [1, 2, 3]
+    report = ValidationReport()
+    assert len(list(valid_rows(rows, report, start=1))) == 2
+    assert report.errors[0].row == 2 and report.field_errors["base_salary"] == 1
+
+
+def test_add_failed_rows():
+    report = validate_rows([ROW, ROW])
+    report.add_failed([FieldError(1, "", "", "Ошибка расчета пакета")])
+    assert (report.valid_rows, report.invalid_rows) == (1, 1)
+    assert set(report.field_errors) == set(BATCH_FIELDS)
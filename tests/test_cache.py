@@ -0,0 +1,85 @@
+from salary_dgs import cache_decorator
+from salary_dgs.cache_decorator import ResultCache
+from salary_dgs.models import BaseSalary, GetDataSalary
+from salary_dgs.services import CalculationBaseSalary
+
+INPUT = {
+    "base_salary": "85000", "month": "Март", "sum_days": "22", "night_shifts": "7",
+    "evening_shifts": "6", "temperature_work": "3", "children": "2.1", "alimony": "25", "year": "2025",
+}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_salary() -> GetDataSalary:
+    salary = BaseSalary()
+    for field, value in INPUT.items():
+        setattr(salary, field, value)
+    return GetDataSalary.from_base_salary(salary)
+
+
+def test_hit_and_miss_counters():
+    cache = ResultCache()
+    assert cache.get("a") is None
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    assert cache.get("a") == 1
+    assert cache.get("b", "default") == "default"
+    assert cache.stats() == {"hits": 2, "misses": 2, "evictions": 0, "size": 1, "maxsize": 4096}
+
+
+def test_lru_eviction_drops_least_recently_used():
+    cache = ResultCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" становится самым старым
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["size"] == 2
+
+
+def test_ttl_expiry():
+    clock = FakeClock()
+    cache = ResultCache(ttl=10.0, clock=clock)
+    cache.set("a", 1)
+    clock.now = 10.0
+    assert cache.get("a") == 1
+    clock.now = 10.5
+    assert cache.get("a") is None
+    assert cache.stats() == {"hits": 1, "misses": 1, "evictions": 1, "size": 0, "maxsize": 4096}
+
+
+def test_set_refreshes_ttl():
+    clock = FakeClock()
+    cache = ResultCache(ttl=10.0, clock=clock)
+    cache.set("a", 1)
+    clock.now = 8.0
+    cache.set("a", 2)
+    clock.now = 15.0
+    assert cache.get("a") == 2
+
+
+def test_key_includes_backend(monkeypatch):
+    """Один и тот же ввод с разными способами расчета не делит запись кеша"""
+    cache = ResultCache()
+    monkeypatch.setattr(cache_decorator, "result_cache", cache)
+    salary = make_salary()
+    decimal_result = CalculationBaseSalary(salary, "decimal").calculate()
+    kopecks_result = CalculationBaseSalary(salary, "kopecks").calculate()
+    assert cache.stats()["misses"] == 2 and cache.stats()["size"] == 2
+    assert kopecks_result == decimal_result
+    assert CalculationBaseSalary(salary, "kopecks").calculate() is kopecks_result
+    assert cache.stats()["hits"] == 1
+
+
+def test_default_backend_from_environment(monkeypatch):
+    monkeypatch.setenv("CALC_BACKEND", "kopecks")
+    assert CalculationBaseSalary(make_salary()).backend_name == "kopecks"
@@ -0,0 +1,51 @@
+import csv
+import io
+
+from salary_dgs import csv_batch
+from salary_dgs.constant import MAX_BASE_SALARY
+from salary_dgs.csv_batch import stream_calculate
+
+ROW = {
+    "base_salary": "85000", "month": "март", "sum_days": "22", "night_shifts": "7",
+    "evening_shifts": "6", "temperature_work": "3", "children": "1,2", "alimony": "25", "year": "2025",
+}
+
+
+def run(rows: list[dict], **kwargs) -> tuple[list[dict], list[dict], object]:
+    output, rejects = io.StringIO(), io.StringIO()
+    report = stream_calculate(rows, output, rejects_file=rejects, **kwargs)
+    written = list(csv.DictReader(io.StringIO(output.getvalue())))
+    rejected = list(csv.DictReader(io.StringIO(rejects.getvalue())))
+    return written, rejected, report
+
+
+def test_salary_above_limit_is_rejected():
+    """Оклад больше MAX_BASE_SALARY (в том числе больше int64) - ошибка строки, а не всего расчета"""
+    rows = [
+        ROW,
+        dict(ROW, base_salary="99999999999999999999"),
+        dict(ROW, base_salary=str(MAX_BASE_SALARY + 1)),
+        dict(ROW, base_salary=str(MAX_BASE_SALARY)),
+    ]
+    written, rejected, report = run(rows)
+    assert [line["row"] for line in written] == ["1", "4"]
+    assert [(line["row"], line["field"]) for line in rejected] == [("2", "base_salary"), ("3", "base_salary")]
+    assert report.invalid_rows == 2
+
+
+def test_failed_chunk_goes_to_rejects(monkeypatch):
+    """Ошибка расчета пакета отправляет его строки в rejects, следующие пакеты считаются"""
+    calculate_batch = csv_batch.calculate_batch
+
+    def failing(batch):
+        if 777 in batch.base_salary:
+            raise OverflowError("тест")
+        return calculate_batch(batch)
+
+    monkeypatch.setattr(csv_batch, "calculate_batch", failing)
+    rows = [ROW, ROW, dict(ROW, base_salary="777"), ROW, ROW]
+    written, rejected, report = run(rows, chunk_size=2)
+    assert [line["row"] for line in written] == ["1", "2", "5"]
+    assert [line["row"] for line in rejected] == ["3", "4"]
+    assert all("OverflowError" in line["message"] and line["field"] == "" for line in rejected)
+    assert (report.rows, report.invalid_rows) == (5, 2)
@@ -0,0 +1,60 @@
+import asyncio
+
+from bot.history import HistoryStore
+from salary_dgs import calculations
+from salary_dgs.models import BaseSalary
+
+
+def make_record():
+    salary = BaseSalary(_year="2025")
+    for field, value in (
+        ("base_salary", "45000"), ("month", "март"), ("sum_days", "20"), ("night_shifts", "5"),
+        ("evening_shifts", "5"), ("temperature_work", "3"), ("children", "1"), ("alimony", "25"),
+    ):
+        setattr(salary, field, value)
+    return salary.to_record(), calculations.calculate_breakdown(salary)
+
+
+def test_write_loop_survives_bad_item(tmp_path):
+    """Ошибка записи не из SQLite (испорченный расчет) не останавливает запись следующих"""
+    path = str(tmp_path / "history.db")
+    record, breakdown = make_record()
+
+    async def run():
+        store = HistoryStore(path, batch_size=1)
+        await store.start()
+        store.record(1, record, None)
+        store.record(1, record, breakdown)
+        await store.close()
+        reopened = HistoryStore(path)
+        await reopened.start()
+        entries = await reopened.last(1)
+        await reopened.close()
+        return store.written, entries
+
+    written, entries = asyncio.run(run())
+    assert written == 1
+    assert [entry.breakdown["answer"] for entry in entries] == [breakdown.answer]
+
+
+def test_bad_item_does_not_drop_its_batch(tmp_path):
+    """Испорченный расчет в одной пачке с корректными (batch_size по умолчанию): теряется только он"""
+    path = str(tmp_path / "history.db")
+    record, breakdown = make_record()
+
+    async def run():
+        store = HistoryStore(path)
+        await store.start()
+        # Очередь заполняется до первого переключения, поэтому все записи уходят одной пачкой
+        for user_id in range(1, 6):
+            store.record(user_id, record, breakdown)
+            if user_id == 3:
+                store.record(user_id, record, None)
+        await store.close()
+        reopened = HistoryStore(path)
+        await reopened.start()
+        users = [len(await reopened.last(user_id)) for user_id in range(1, 6)]
+        await reopened.close()
+        return store.written, users
+
+    assert asyncio.run(run()) == (5, [1, 1, 1, 1, 1])
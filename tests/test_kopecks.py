@@ -0,0 +1,92 @@
+"""Совпадение копеечного расчета (salary_dgs.kopecks) с Decimal-расчетом до копейки"""
+import random
+from decimal import Decimal
+
+from salary_dgs import calculations, kopecks
+from salary_dgs.production_calendar import available_years
+from salary_dgs.rates import RATES
+
+# Оклады для полного перебора шагов с нормами месяца (шаг - простое число, чтобы попадать на разные остатки)
+SALARIES = range(10000, 300001, 9973)
+MAX_DAYS = 31
+
+CHILDREN = ((), (0,), (1,), (1, 2), (2, 3), (1, 2, 3), (1, 2, 3, 4), (1, 2, 3, 4, 5))
+ALIMONY = ((0,), (16,), (25,), (33,), (70,), (25, 25), (16, 33), (25, 33), (16, 16, 33))
+
+
+def test_steps_with_month_norms():
+    """Полный перебор шагов с делением на нормы месяца: оклад по дням, ночные/вечерние смены и температура.
+
+    Шаги после них считаются от целых копеек без деления на нормы и проверяются полным расчетом ниже.
+    """
+    mismatches = []
+    for year in available_years():
+        for month, month_name in enumerate(RATES.months):
+            for salary in SALARIES:
+                amount = Decimal(salary)
+                for days in range(MAX_DAYS + 1):
+                    expected = kopecks.to_kopecks(
+                        calculations.calculation_base_salary(amount, month_name, Decimal(days), year)
+                    )
+                    if kopecks.base_salary_kopecks(salary, month, days, year) != expected:
+                        mismatches.append(("base_salary", year, month_name, salary, days))
+                    expected = kopecks.to_kopecks(
+                        calculations.calculation_working_in_temperature(amount, month_name, Decimal(days), year)
+                    )
+                    if kopecks.temperature_kopecks(salary, month, days, year) != expected:
+                        mismatches.append(("working_in_temperature", year, month_name, salary, days))
+                    for evening in range(MAX_DAYS + 1 - days):
+                        expected = kopecks.to_kopecks(calculations.calculation_night_shifts(
+                            amount, month_name, Decimal(days), Decimal(evening), year
+                        ))
+                        if kopecks.night_shifts_kopecks(salary, month, days, evening, year) != expected:
+                            mismatches.append(("night_shifts", year, month_name, salary, days, evening))
+    assert mismatches == []
+
+
+def random_rows(count: int, seed: int = 1) -> list[dict]:
+    """Случайные допустимые входные данные полного расчета"""
+    rnd = random.Random(seed)
+    years = available_years()
+    rows = []
+    for _ in range(count):
+        sum_days = rnd.randint(0, 31)
+        night_shifts = rnd.randint(0, sum_days)
+        rows.append({
+            "base_salary": rnd.randint(1, 1_000_000),
+            "month": rnd.randrange(len(RATES.months)),
+            "sum_days": sum_days,
+            "night_shifts": night_shifts,
+            "evening_shifts": rnd.randint(0, sum_days - night_shifts),
+            "temperature_work": rnd.randint(0, sum_days),
+            "children": rnd.choice(CHILDREN),
+            "alimony": rnd.choice(ALIMONY),
+            "prior_income": rnd.choice((0, rnd.randint(0, 60_000_000))),
+            "year": rnd.choice(years),
+        })
+    return rows
+
+
+def decimal_result(row: dict) -> dict:
+    """Расчет строки через Decimal-путь в копейках"""
+    result = calculations.calculate(
+        Decimal(row["base_salary"]),
+        RATES.months[row["month"]],
+        Decimal(row["sum_days"]).quantize(calculations.CENTS),
+        Decimal(row["night_shifts"]).quantize(calculations.CENTS),
+        Decimal(row["evening_shifts"]).quantize(calculations.CENTS),
+        Decimal(row["temperature_work"]).quantize(calculations.CENTS),
+        row["children"],
+        row["alimony"],
+        kopecks.to_amount(row["prior_income"]),
+        row["year"],
+    )
+    return {key: kopecks.to_kopecks(result[key]) for key in kopecks.COMPONENTS}
+
+
+def test_full_calculation_on_random_rows():
+    mismatches = []
+    for row in random_rows(5000):
+        expected, actual = decimal_result(row), kopecks.calculate(**row)
+        mismatches += [(row, key) for key in kopecks.COMPONENTS if actual[key] != expected[key]]
+    assert mismatches == []
@@ -0,0 +1,75 @@
+from decimal import Decimal
+
+import pytest
+
+from salary_dgs import calculations
+from salary_dgs.batch import EmployeeBatch, calculate_batch
+from salary_dgs.kopecks import to_amount
+from salary_dgs.ledger import YearToDateLedger, replay_year
+from salary_dgs.models import BaseSalary
+from salary_dgs.rates import RATES
+
+
+def make_salary(month: str, year: str = "2025", base_salary: str = "85000") -> BaseSalary:
+    salary = BaseSalary(_year=year)
+    for field, value in (
+        ("base_salary", base_salary), ("month", month), ("sum_days", "22"), ("night_shifts", "7"),
+        ("evening_shifts", "6"), ("temperature_work", "3"), ("children", "1,2"), ("alimony", "25"),
+    ):
+        setattr(salary, field, value)
+    return salary
+
+
+def test_deduction_stops_after_income_limit():
+    """Вычет на детей есть, пока доход с начала года не больше предельного, и прекращается после"""
+    ledger = YearToDateLedger()
+    income = Decimal("0.00")
+    deductions = []
+    for month in RATES.months[:6]:
+        salary = make_salary(month)
+        breakdown = ledger.add_month(salary)
+        assert breakdown == calculations.calculate_breakdown(salary, prior_income=income)
+        income += breakdown.total_accruals
+        deductions.append((income <= RATES.deduction_income_limit, breakdown.deduction_for_children > 0))
+    assert all(within == deducted for within, deducted in deductions)
+    # Предел пересекается внутри полугодия
+    assert deductions[0] == (True, True) and deductions[-1] == (False, False)
+    assert ledger.income == income
+    assert ledger.deductions_total == sum(
+        (item.deduction_for_children for item in ledger.breakdowns.values()), Decimal("0.00")
+    )
+
+
+@pytest.mark.parametrize("months", [("март", "февраль"), ("март", "март")])
+def test_months_out_of_order(months):
+    ledger = YearToDateLedger()
+    ledger.add_month(make_salary(months[0]))
+    with pytest.raises(ValueError, match="должен идти после"):
+        ledger.add_month(make_salary(months[1]))
+
+
+def test_year_of_input_and_record_match():
+    """Год BaseSalary (строка) и SalaryRecord (число) сравниваются как числа"""
+    ledger = YearToDateLedger()
+    ledger.add_month(make_salary("январь"))
+    ledger.add_month(make_salary("февраль").to_record())
+    assert ledger.year == 2025
+    with pytest.raises(ValueError, match=r"Год \(2026\) не совпадает с годом учета \(2025\)"):
+        ledger.add_month(make_salary("март", year="2026"))
+
+
+def test_replay_year_matches_ledger():
+    salaries = ("30000", "85000", "150000")
+    months = [
+        EmployeeBatch.from_salaries(make_salary(month, base_salary=base_salary) for base_salary in salaries)
+        for month in RATES.months
+    ]
+    results = replay_year(months)
+    for employee, base_salary in enumerate(salaries):
+        ledger = YearToDateLedger()
+        for month, result in zip(RATES.months, results):
+            breakdown = ledger.add_month(make_salary(month, base_salary=base_salary))
+            assert to_amount(int(result["deduction_for_children"][employee])) == breakdown.deduction_for_children
+            assert to_amount(int(result["answer"][employee])) == breakdown.answer
+    # Без дохода прошлых месяцев пакет дал бы вычет и в последнем месяце
+    assert calculate_batch(months[-1])["deduction_for_children"][0] > 0 == results[-1]["deduction_for_children"][0]
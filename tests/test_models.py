@@ -0,0 +1,51 @@
+import asyncio
+from decimal import Decimal
+
+from salary_dgs.models import BaseSalary, GetDataSalary
+
+INPUT = {
+    "base_salary": "85000", "month": "Март", "sum_days": "22", "night_shifts": "7",
+    "evening_shifts": "6", "temperature_work": "3", "children": "2.1", "alimony": "25", "year": "2025",
+}
+
+
+def make_salary() -> BaseSalary:
+    salary = BaseSalary()
+    for field, value in INPUT.items():
+        setattr(salary, field, value)
+    return salary
+
+
+def test_values_are_parsed_once_and_stored_typed():
+    """В объекте - только разобранные значения, строки формата ввода строятся в to_dict"""
+    salary = make_salary()
+    assert {name: value for name, value in vars(salary).items() if name.startswith("_")} == {
+        "_base_salary": 85000, "_month": "март", "_sum_days": 22, "_night_shifts": 7, "_evening_shifts": 6,
+        "_temperature_work": 3, "_children": (1, 2), "_alimony": (25,), "_year": 2025,
+    }
+    assert salary.to_dict() == {
+        "_base_salary": "85000", "_month": "март", "_sum_days": "22", "_night_shifts": "7",
+        "_evening_shifts": "6", "_temperature_work": "3", "_children": "1,2", "_alimony": "25", "_year": "2025",
+    }
+    assert salary.children == "1,2" and salary.year == "2025"
+
+
+def test_dict_round_trip():
+    salary = make_salary()
+    restored = BaseSalary.from_dict(salary.to_dict())
+    assert restored == salary
+    assert restored.to_record() == salary.to_record()
+    assert restored.cache_key() == salary.cache_key()
+
+
+def test_get_data_salary_getters():
+    salary = GetDataSalary.from_base_salary(make_salary())
+
+    async def run():
+        return [
+            await salary.get_base_salary(), await salary.get_month(), await salary.get_sum_days(),
+            await salary.get_children(), await salary.get_year(),
+        ]
+
+    values = asyncio.run(run())
+    assert values == [Decimal("85000"), "март", Decimal("22.00"), (1, 2), 2025]
@@ -0,0 +1,69 @@
+from decimal import Decimal
+
+import pytest
+
+from salary_dgs.batch import calculate_base_month
+from salary_dgs.kopecks import to_amount
+from salary_dgs.overtime import quarter_payouts
+
+COLUMNS = {
+    "base_salary": ["85000", "85000", "85000", "85000"],
+    "month": ["март", "март", "декабрь", "январь"],
+    "sum_days": ["23", "15", "25", "20"],
+    "year": ["2025", "2026", "2025", "2026"],
+}
+
+
+def test_quarters_of_different_years_are_not_merged():
+    payouts = quarter_payouts(COLUMNS)
+    base_month = [to_amount(int(value)) for value in calculate_base_month(COLUMNS)]
+    assert base_month[0] > 0 > base_month[1]
+
+    assert payouts.periods == ((2025, 0), (2025, 3), (2026, 0))
+    assert payouts.employee(0) == {
+        (2025, "апрель"): base_month[0],
+        # За IV квартал - январь следующего года
+        (2026, "январь"): base_month[2],
+        # Недоработка марта 2026 покрывается только январем 2026, а не мартом 2025
+        (2026, "апрель"): max(base_month[1] + base_month[3], Decimal("0.00")),
+    }
+
+
+def test_employees_are_separate():
+    payouts = quarter_payouts(COLUMNS, employees=[1, 2, 1, 2])
+    totals = payouts.totals()
+    assert sum(payouts.employee(1).values()) + sum(payouts.employee(2).values()) == sum(totals.values())
+
+
+def test_negative_quarter_is_paid_as_zero_and_not_carried_over():
+    """Недоработка квартала не выплачивается отрицательной суммой и не уменьшает следующий квартал"""
+    columns = {
+        "base_salary": ["85000", "85000", "85000"],
+        "month": ["январь", "февраль", "апрель"],
+        "sum_days": ["10", "25", "25"],
+        "year": ["2025", "2025", "2025"],
+    }
+    base_month = [to_amount(int(value)) for value in calculate_base_month(columns)]
+    assert base_month[0] + base_month[1] < 0 < base_month[2]
+
+    payouts = quarter_payouts(columns)
+    assert payouts.employee(0) == {(2025, "апрель"): Decimal("0.00"), (2025, "июль"): base_month[2]}
+    assert (payouts.amounts >= 0).all()
+
+
+def test_negative_month_is_covered_within_quarter():
+    columns = {
+        "base_salary": ["85000", "85000"],
+        "month": ["январь", "март"],
+        "sum_days": ["15", "25"],
+        "year": ["2025", "2025"],
+    }
+    base_month = [to_amount(int(value)) for value in calculate_base_month(columns)]
+    assert base_month[0] < 0 < base_month[0] + base_month[1]
+    assert quarter_payouts(columns).employee(0) == {(2025, "апрель"): base_month[0] + base_month[1]}
+
+
+def test_unknown_employee():
+    payouts = quarter_payouts(COLUMNS, employees=[1, 2, 1, 2])
+    with pytest.raises(KeyError, match="3"):
+        payouts.employee(3)
@@ -0,0 +1,45 @@
+from decimal import Decimal
+
+from salary_dgs import calculations, solver
+from salary_dgs.rates import RATES
+
+
+def make_inputs(base_salary: int, sum_days: int, prior_income: Decimal = Decimal("0.00")) -> dict:
+    return {
+        "base_salary": Decimal(base_salary),
+        "month": "март",
+        "sum_days": Decimal(sum_days).quantize(calculations.CENTS),
+        "night_shifts": Decimal("4.00"),
+        "evening_shifts": Decimal("2.00"),
+        "temperature_work": Decimal("0.00"),
+        "children": (1, 2, 3, 4),
+        "alimony": (0,),
+        "prior_income": prior_income,
+        "year": 2025,
+    }
+
+
+def brute_force(target: Decimal, inputs: dict, low: int) -> int | None:
+    for days in range(low, solver.MAX_DAYS + 1):
+        if solver.net_amount(dict(inputs, sum_days=Decimal(days).quantize(calculations.CENTS))) >= target:
+            return days
+    return None
+
+
+def test_solve_sum_days_across_deduction_limit():
+    """Сумма к выплате падает на границе предельного дохода, поиск все равно находит минимум"""
+    # Доход с начала года подобран так, чтобы граница пришлась на 20-ю смену
+    accruals = calculations.evaluate(make_inputs(15000, 20), ("calculation_total_accruals",))
+    prior_income = RATES.deduction_income_limit - accruals["calculation_total_accruals"] + Decimal("0.01")
+    inputs = make_inputs(15000, 0, prior_income)
+    assert solver.within_deduction_limit(dict(inputs, sum_days=Decimal("19.00")))
+    assert not solver.within_deduction_limit(dict(inputs, sum_days=Decimal("20.00")))
+
+    nets = [
+        solver.net_amount(dict(inputs, sum_days=Decimal(days).quantize(calculations.CENTS)))
+        for days in range(solver.MAX_DAYS + 1)
+    ]
+    assert nets[20] < nets[19]  # Ступенька: без вычета на детей
+    for net in nets:
+        for target in (net, net + Decimal("0.01")):
+            assert solver.solve_sum_days(target, inputs) == brute_force(target, inputs, 6)
@@ -0,0 +1,35 @@
+import pytest
+
+from salary_dgs.models import BaseSalary
+from salary_dgs.state_codec import decode_state, encode_state
+
+
+def make_salary() -> BaseSalary:
+    salary = BaseSalary(_year="2025")
+    for field, value in (
+        ("base_salary", "85000"), ("month", "март"), ("sum_days", "22"), ("night_shifts", "7"),
+        ("evening_shifts", "6"), ("temperature_work", "3"), ("children", "1,2"), ("alimony", "25"),
+    ):
+        setattr(salary, field, value)
+    return salary
+
+
+@pytest.mark.parametrize("data", [
+    {"salary": make_salary().to_dict()},
+    {"salary": BaseSalary(_year="2026").to_dict()},
+    {"record": make_salary().to_record()},
+    {"salary": make_salary().to_dict(), "record": make_salary().to_record()},
+    {"salary": None},
+    {"record": None},
+    {"salary": make_salary().to_dict(), "step": 3},
+    {"step": 3, "comment": "без ввода"},
+])
+def test_round_trip(data):
+    assert decode_state(encode_state(data)) == data
+
+
+def test_salary_object_is_stored_as_dict():
+    """BaseSalary сохраняется словарем to_dict, в том числе вместе с прочими данными (запись JSON)"""
+    salary = make_salary()
+    assert decode_state(encode_state({"salary": salary})) == {"salary": salary.to_dict()}
+    assert decode_state(encode_state({"salary": salary, "step": 3})) == {"salary": salary.to_dict(), "step": 3}
@@ -0,0 +1,113 @@
+import asyncio
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from bot.stats import HLL_REGISTERS, KEEP_DAYS, UniqueCounter, UserStats
+
+
+def user_ids(count: int, seed: int = 1) -> list[int]:
+    # id как у Telegram: разреженные большие числа
+    return random.Random(seed).sample(range(10 ** 10), count)
+
+
+def test_exact_until_limit_then_hyperloglog():
+    counter = UniqueCounter(exact_limit=100)
+    ids = user_ids(101)
+    for user_id in ids[:100]:
+        counter.add(user_id)
+        counter.add(user_id)
+    assert counter.exact and len(counter) == 100
+    counter.add(ids[100])
+    assert not counter.exact and counter.ids == set()
+    assert len(counter.registers) == HLL_REGISTERS
+    assert abs(len(counter) - 101) <= 2
+
+
+@pytest.mark.parametrize("users", [1000, 20000, 200000])
+def test_estimate_error_bound(users):
+    """Ошибка оценки в пределах трех стандартных ошибок (~0.8% для 2^14 регистров)"""
+    counter = UniqueCounter(exact_limit=10)
+    for user_id in user_ids(users):
+        counter.add(user_id)
+    assert abs(len(counter) / users - 1) < 0.025
+
+
+def test_repeated_users_do_not_change_estimate():
+    counter = UniqueCounter(exact_limit=10)
+    ids = user_ids(5000)
+    for user_id in ids:
+        counter.add(user_id)
+    estimate = len(counter)
+    for user_id in ids[::3]:
+        counter.add(user_id)
+    assert len(counter) == estimate
+
+
+@pytest.mark.parametrize("users", [50, 5000])
+def test_dict_round_trip(users):
+    """После загрузки сумма 2^-регистр и число нулевых регистров пересчитываются из регистров"""
+    counter = UniqueCounter(exact_limit=100)
+    ids = user_ids(users + 1000)
+    for user_id in ids[:users]:
+        counter.add(user_id)
+    restored = UniqueCounter.from_dict(counter.to_dict(), exact_limit=100)
+    assert restored.exact == counter.exact
+    assert len(restored) == len(counter)
+    if not counter.exact:
+        assert restored.registers == counter.registers
+        assert restored._zeros == counter._zeros
+        assert restored._inverse_sum == pytest.approx(counter._inverse_sum, rel=1e-12)
+    # Дальнейший учет идет одинаково
+    for user_id in ids[users:]:
+        counter.add(user_id)
+        restored.add(user_id)
+    assert len(restored) == len(counter)
+
+
+def test_day_and_month_roll_over(tmp_path):
+    day = datetime(2026, 1, 30, 12)
+    stats = UserStats(str(tmp_path / "stats.json"), exact_limit=10)
+    stats.day_key, stats.month_key, stats._date = "2026-01-30", "2026-01", day.date()
+    for user_id in (1, 2, 3):
+        stats.seen(user_id, day)
+    stats.calculation(day)
+    stats.seen(1, day + timedelta(days=1))  # 31 января
+    stats.seen(4, day + timedelta(days=2))  # 1 февраля
+    stats.calculation(day + timedelta(days=2))
+
+    assert stats.daily == {"2026-01-30": 3, "2026-01-31": 1}
+    assert stats.monthly == {"2026-01": 3}
+    assert stats.calculations == {"2026-01": 1, "2026-02": 1}
+    assert (stats.day_key, len(stats.day)) == ("2026-02-01", 1)
+    assert (stats.month_key, len(stats.month)) == ("2026-02", 1)
+    assert len(stats.users) == 4
+    # Повторное обращение в тот же день не закрывает день
+    stats.seen(2, day + timedelta(days=2, hours=5))
+    assert len(stats.daily) == 2 and len(stats.day) == 2
+
+
+def test_old_days_are_dropped(tmp_path):
+    stats = UserStats(str(tmp_path / "stats.json"))
+    start = datetime(2026, 3, 1)
+    stats.day_key, stats.month_key, stats._date = "2026-03-01", "2026-03", start.date()
+    for offset in range(KEEP_DAYS + 10):
+        stats.seen(offset, start + timedelta(days=offset))
+    # Закрыто 40 дней (последний день еще идет), хранятся последние KEEP_DAYS из них
+    assert len(stats.daily) == KEEP_DAYS
+    assert next(iter(stats.daily)) == (start + timedelta(days=40 - KEEP_DAYS)).strftime("%Y-%m-%d")
+
+
+def test_flush_and_load(tmp_path):
+    path = str(tmp_path / "stats.json")
+    stats = UserStats(path, exact_limit=10)
+    for user_id in user_ids(500):
+        stats.seen(user_id)
+    stats.calculation()
+    asyncio.run(stats.flush())
+    loaded = UserStats(path, exact_limit=10)
+    loaded.load()
+    assert len(loaded.users) == len(stats.users)
+    assert loaded.calculations == stats.calculations
+    assert loaded.summary() == stats.summary()
@@ -0,0 +1,67 @@
+import asyncio
+
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.storage.base import StorageKey
+
+from bot.storage import FlushStorageMiddleware, SqliteBackend, WriteBackStorage
+
+KEY = StorageKey(bot_id=1, chat_id=2, user_id=2)
+
+
+def test_invalidate_reads_changes_of_other_instance(tmp_path):
+    """Два процесса с одним файлом SQLite: после invalidate чтение видит чужую запись"""
+    path = str(tmp_path / "fsm.db")
+
+    async def run():
+        first, second = WriteBackStorage(SqliteBackend(path)), WriteBackStorage(SqliteBackend(path))
+        await first.set_data(KEY, {"step": 1})
+        await first.flush()
+        seen = [await second.get_data(KEY)]
+        await first.set_data(KEY, {"step": 2})
+        await first.set_state(KEY, "SalaryInput:month")
+        await first.flush()
+        seen.append(await second.get_data(KEY))  # Из кэша
+        second.invalidate(KEY)
+        seen.append(await second.get_data(KEY))
+        seen.append(await second.get_state(KEY))
+        await first.close()
+        await second.close()
+        return seen
+
+    assert asyncio.run(run()) == [{"step": 1}, {"step": 1}, {"step": 2}, "SalaryInput:month"]
+
+
+def test_middleware_reads_fresh_state(tmp_path):
+    """FlushStorageMiddleware перед обработчиком перечитывает состояние, записанное другим процессом"""
+    path = str(tmp_path / "fsm.db")
+
+    async def run():
+        first, second = WriteBackStorage(SqliteBackend(path)), WriteBackStorage(SqliteBackend(path))
+        await second.set_state(KEY, "SalaryInput:base_salary")
+        await second.flush()
+        await first.set_state(KEY, "SalaryInput:month")
+        await first.set_data(KEY, {"salary": "85000"})
+        await first.flush()
+
+        context = FSMContext(second, KEY)
+        # Как после FSMContextMiddleware: состояние прочитано из кэша второго экземпляра
+        data = {"fsm_storage": second, "state": context, "raw_state": await context.get_state()}
+
+        async def handler(event, data):
+            await context.update_data(month="март")
+            return data["raw_state"], await context.get_data()
+
+        seen = await FlushStorageMiddleware()(handler, None, data)
+        await second.close()
+        seen += (await first.get_data(KEY),)  # Кэш первого экземпляра не сброшен
+        first.invalidate(KEY)
+        seen += (await first.get_data(KEY),)
+        await first.close()
+        return seen
+
+    assert asyncio.run(run()) == (
+        "SalaryInput:month",
+        {"salary": "85000", "month": "март"},
+        {"salary": "85000"},
+        {"salary": "85000", "month": "март"},
+    )
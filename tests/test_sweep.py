@@ -0,0 +1,43 @@
+import dataclasses
+
+from salary_dgs import calculations
+from salary_dgs.models import BaseSalary
+from salary_dgs.sweep import sweep
+
+OUTPUTS = ("base_salary", "night_shifts", "total_accruals", "deduction_for_children", "alimony", "answer")
+
+
+def make_record():
+    salary = BaseSalary(_year="2025")
+    for field, value in (
+        ("base_salary", "85000"), ("month", "март"), ("sum_days", "20"), ("night_shifts", "7"),
+        ("evening_shifts", "6"), ("temperature_work", "3"), ("children", "1,2"), ("alimony", "25"),
+    ):
+        setattr(salary, field, value)
+    return salary.to_record()
+
+
+def test_sweep_cells_match_full_calculation():
+    """Каждая клетка сетки совпадает с полным пересчетом записи с теми же значениями полей"""
+    record = make_record()
+    axes = {"sum_days": range(18, 23), "night_shifts": range(5, 10), "children": ("", "1", "1,2,3")}
+    result = sweep(record, **axes)
+    for point, values in result.grid.items():
+        changed = dict(zip(axes, point))
+        changed["children"] = tuple(map(int, filter(None, changed["children"].split(","))))
+        varied = dataclasses.replace(record, **changed)
+        if varied.night_shifts + varied.evening_shifts > varied.sum_days:
+            assert values is None, point
+            continue
+        expected = calculations.calculate_breakdown(varied)
+        for output in OUTPUTS:
+            assert result.value(*point, output=f"calculation_{output}") == getattr(expected, output), (point, output)
+
+
+def test_sweep_table_layout():
+    result = sweep(make_record(), sum_days=range(12, 14), night_shifts=range(6, 8))
+    lines = result.table().splitlines()
+    assert lines[0].split() == ["sum_days\\night_shifts", "6", "7"]
+    # 12 смен: 7 ночных и 6 вечерних больше общего количества - недопустимый вариант
+    assert lines[1].split()[0] == "12" and lines[1].split()[2] == "-"
+    assert "-" not in lines[2].split()